@@ -0,0 +1,252 @@
+#!/usr/bin/env python3
+"""
+Offline throughput benchmark for the agent workflow.
+
+Runs without OpenRouter, Pinecone, Slack or Jira: the LLM, vector store and
+tools are replaced by the deterministic fakes in benchmarks/fakes.py with
+fixed latencies. Drives the compiled graph directly and the FastAPI /run
+route in-process, under concurrent load, and reports p50/p95/p99 latency,
+requests per second and memory per request (tracemalloc, measured in a
+separate pass so tracing does not skew latency).
+
+    python benchmarks/bench_agent.py --requests 200 --concurrency 16 --output before.json
+    python benchmarks/bench_agent.py --requests 200 --concurrency 16 --compare before.json
+
+Results carry the git commit and the benchmark settings, so runs with the
+same arguments are comparable across commits.
+"""
+
+import argparse
+import asyncio
+import contextlib
+import gc
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def _configure_environment(args):
+    # Settings are read at import time, so this must run before importing the app
+    os.environ["AGENT_EXECUTION_MODE"] = args.execution_mode
+    os.environ["PARALLEL_EXECUTION"] = "true" if args.parallel else "false"
+    os.environ["PLAN_CACHE_BACKEND"] = "memory" if args.plan_cache else "none"
+    # Every request has the same plan and results, so a response cache would skip the LLM
+    os.environ["RESPONSE_CACHE_MAX_ENTRIES"] = "512" if args.response_cache else "0"
+    os.environ["IDEMPOTENCY_AUTO_KEY"] = "false"
+    # Measure the workflow itself: no SQLite writes per node, no background
+    # job workers and no cache state persisted between runs
+    os.environ["CHECKPOINT_ENABLED"] = "false"
+    os.environ["JOB_QUEUE_ENABLED"] = "false"
+    os.environ["EMBEDDING_CACHE_PERSIST"] = "false"
+    os.environ["LANGCHAIN_TRACING_V2"] = "false"
+    os.environ.setdefault("MODEL_NAME", "fake-model")
+
+    sys.path[:0] = [str(ROOT), str(ROOT / "services"), str(ROOT / "benchmarks")]
+
+
+def _git_commit():
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "HEAD"], cwd=ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+        dirty = bool(subprocess.run(
+            ["git", "status", "--porcelain", "--untracked-files=no"],
+            cwd=ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip())
+        return commit, dirty
+    except (OSError, subprocess.CalledProcessError):
+        return None, None
+
+
+def _initial_state(index):
+    # Unique inputs so no request is served from a cache keyed by input
+    return {
+        "user_input": f"Read my email, file Jira tickets and tell the team #{index}",
+        "plan": [],
+        "current_step": 0,
+        "tool_result": None,
+        "history": [],
+    }
+
+
+def summarize(latencies, failures, elapsed):
+    latencies = sorted(latencies)
+    percentiles = statistics.quantiles(latencies, n=100, method="inclusive") if len(latencies) > 1 else latencies * 99
+    return {
+        "requests": len(latencies) + failures,
+        "failures": failures,
+        "elapsed_seconds": round(elapsed, 3),
+        "throughput_rps": round(len(latencies) / elapsed, 2) if elapsed else 0.0,
+        "latency_p50_ms": round(percentiles[49] * 1000, 2) if latencies else None,
+        "latency_p95_ms": round(percentiles[94] * 1000, 2) if latencies else None,
+        "latency_p99_ms": round(percentiles[98] * 1000, 2) if latencies else None,
+        "latency_max_ms": round(latencies[-1] * 1000, 2) if latencies else None,
+    }
+
+
+async def run_load(call, requests_total, concurrency, offset=0):
+    """Run call(index) requests_total times with at most concurrency in flight."""
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+    failures = 0
+
+    async def one(index):
+        nonlocal failures
+        async with semaphore:
+            started = time.perf_counter()
+            try:
+                ok = await call(offset + index)
+            except Exception:
+                ok = False
+            if ok:
+                latencies.append(time.perf_counter() - started)
+            else:
+                failures += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one(index) for index in range(requests_total)))
+    return latencies, failures, time.perf_counter() - started
+
+
+async def measure_memory(call, requests_total, concurrency):
+    """Allocation per request under tracemalloc: peak during the run and retained after it."""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        baseline = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        await run_load(call, requests_total, concurrency, offset=1_000_000)
+        gc.collect()
+        current, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {
+        "memory_requests": requests_total,
+        "memory_peak_kib": round((peak - baseline) / 1024, 1),
+        "memory_peak_kib_per_request": round((peak - baseline) / 1024 / requests_total, 2),
+        "memory_retained_kib_per_request": round((current - baseline) / 1024 / requests_total, 2),
+    }
+
+
+async def bench(call, args):
+    await run_load(call, args.warmup, args.concurrency, offset=-args.warmup)
+    result = summarize(*await run_load(call, args.requests, args.concurrency))
+    if args.memory_requests:
+        result.update(await measure_memory(call, args.memory_requests, args.concurrency))
+    return result
+
+
+async def bench_graph(args):
+    from agent.graph import get_graph
+    from core.memory_writer import close_memory_writer
+
+    graph = get_graph()
+
+    async def call(index):
+        if args.execution_mode == "sync":
+            state = await asyncio.to_thread(graph.invoke, _initial_state(index))
+        else:
+            state = await graph.ainvoke(_initial_state(index))
+        return bool(state.get("final_response"))
+
+    try:
+        return await bench(call, args)
+    finally:
+        await asyncio.to_thread(close_memory_writer)
+
+
+async def bench_api(args):
+    import httpx
+    import main
+
+    async with main.app.router.lifespan_context(main.app):
+        transport = httpx.ASGITransport(app=main.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+            async def call(index):
+                response = await client.post("/run", json={"task": _initial_state(index)["user_input"]})
+                return response.status_code == 200 and response.json().get("status") == "success"
+
+            return await bench(call, args)
+
+
+def compare(current, baseline):
+    """Print the change in throughput and latency percentiles against a previous run."""
+    keys = ("throughput_rps", "latency_p50_ms", "latency_p95_ms", "latency_p99_ms",
+            "memory_peak_kib_per_request")
+    print(f"Compared with {baseline.get('commit')}:")
+    if baseline.get("settings") != current["settings"]:
+        print("  warning: benchmark settings differ, results are not directly comparable")
+    for target, result in current["results"].items():
+        before = baseline.get("results", {}).get(target)
+        if not before:
+            continue
+        for key in keys:
+            if result.get(key) is None or not before.get(key):
+                continue
+            change = (result[key] - before[key]) / before[key] * 100
+            print(f"  {target:<5} {key:<30} {before[key]:>10} -> {result[key]:>10} ({change:+.1f}%)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--target", choices=["graph", "api", "both"], default="both")
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--warmup", type=int, default=10)
+    parser.add_argument("--memory-requests", type=int, default=50,
+                        help="Requests in the tracemalloc pass; 0 skips it")
+    parser.add_argument("--llm-latency", type=float, default=0.05, help="Seconds per fake LLM call")
+    parser.add_argument("--tool-latency", type=float, default=0.01, help="Seconds per stub tool call")
+    parser.add_argument("--memory-latency", type=float, default=0.005, help="Seconds per fake vector store call")
+    parser.add_argument("--execution-mode", choices=["async", "sync"], default="async")
+    parser.add_argument("--parallel", action="store_true", help="Enable PARALLEL_EXECUTION")
+    parser.add_argument("--plan-cache", action="store_true", help="Keep the in-memory plan cache enabled")
+    parser.add_argument("--response-cache", action="store_true", help="Keep the responder response cache enabled")
+    parser.add_argument("--output", help="Write the JSON result to this file")
+    parser.add_argument("--compare", help="Previous JSON result to compare against")
+    args = parser.parse_args()
+
+    _configure_environment(args)
+
+    import logging
+    logging.disable(logging.INFO)
+
+    from fakes import FakeChatModel, FakeVectorStore, install_fakes
+    install_fakes(
+        FakeChatModel(latency=args.llm_latency),
+        FakeVectorStore(latency=args.memory_latency),
+        tool_latency=args.tool_latency
+    )
+
+    commit, dirty = _git_commit()
+    report = {
+        "commit": commit,
+        "dirty": dirty,
+        "python": platform.python_version(),
+        "settings": {key: value for key, value in vars(args).items() if key not in ("output", "compare")},
+        "results": {},
+    }
+    targets = ["graph", "api"] if args.target == "both" else [args.target]
+    for target in targets:
+        runner = bench_graph if target == "graph" else bench_api
+        # The planner prints its raw responses; keep stdout for the report
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+            report["results"][target] = asyncio.run(runner(args))
+
+    print(json.dumps(report, indent=2))
+    if args.output:
+        Path(args.output).write_text(json.dumps(report, indent=2) + "\n")
+    if args.compare:
+        compare(report, json.loads(Path(args.compare).read_text()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Cold-start import benchmark for the two entry points.
+
+Imports main.py (the FastAPI app) and services/main.py (the core service) in
+fresh interpreters with -X importtime, repeats each a few times and reports
+the median wall time, the median total import time and the slowest
+imports made by main in the last run.
+
+    python benchmarks/bench_import.py --runs 5 --output imports.json
+
+Only the standard library is used; nothing is imported in this process.
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# Entry point name -> directory to import "main" from
+ENTRY_POINTS = {
+    "main.py": ROOT,
+    "services/main.py": ROOT / "services",
+}
+
+
+def parse_importtime(stderr):
+    """Return [(module, self_us, cumulative_us, depth)] from -X importtime output."""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        # One space before top-level modules, two more per nesting level
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        rows.append((name.strip(), int(self_us), int(cumulative_us), depth))
+    return rows
+
+
+def direct_imports(rows, module):
+    """Rows for the modules imported directly by a top-level module."""
+    # importtime prints children before their parent
+    children = []
+    for row in rows:
+        if row[3] == 1:
+            children.append(row)
+        elif row[3] == 0:
+            if row[0] == module:
+                return children
+            children = []
+    return []
+
+
+def import_once(directory):
+    started = time.perf_counter()
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import main"],
+        cwd=directory, capture_output=True, text=True
+    )
+    wall = time.perf_counter() - started
+    if completed.returncode != 0:
+        raise RuntimeError(f"Importing main from {directory} failed:\n{completed.stderr[-2000:]}")
+    return wall, parse_importtime(completed.stderr)
+
+
+def bench_entry_point(directory, runs, top):
+    walls = []
+    totals = []
+    rows = []
+    for _ in range(runs):
+        wall, rows = import_once(directory)
+        walls.append(wall)
+        # Cumulative times of the top-level imports (interpreter startup and main) sum to the total
+        totals.append(sum(cumulative for _, _, cumulative, depth in rows if depth == 0))
+
+    slowest = sorted(direct_imports(rows, "main"), key=lambda row: row[2], reverse=True)[:top]
+    return {
+        "runs": runs,
+        "wall_ms_median": round(statistics.median(walls) * 1000, 1),
+        "import_ms_median": round(statistics.median(totals) / 1000, 1),
+        "modules_imported": len(rows),
+        "slowest_imports_ms": {name: round(cumulative / 1000, 1) for name, _, cumulative, _ in slowest},
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=10, help="Number of slowest imports made by main to list")
+    parser.add_argument("--output", help="Write the JSON result to this file")
+    args = parser.parse_args()
+
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "HEAD"], cwd=ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+
+    report = {
+        "commit": commit,
+        "python": sys.version.split()[0],
+        "results": {
+            name: bench_entry_point(directory, args.runs, args.top)
+            for name, directory in ENTRY_POINTS.items()
+        },
+    }
+    print(json.dumps(report, indent=2))
+    if args.output:
+        Path(args.output).write_text(json.dumps(report, indent=2) + "\n")
+
+
+if __name__ == "__main__":
+    main()
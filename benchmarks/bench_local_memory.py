@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Benchmark LocalVectorStore search against a brute-force baseline.
+
+Compares, on random unit vectors:
+  - brute force: a pure-Python cosine loop over every stored vector
+  - vectorized:  LocalVectorStore with the IVF index disabled
+  - ivf:         LocalVectorStore with the IVF index enabled (with recall@k)
+
+    python benchmarks/bench_local_memory.py --vectors 50000 --dimension 256
+"""
+
+import argparse
+import json
+import math
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "services"))
+
+from core.local_memory import LocalVectorStore
+
+
+def brute_force(vectors, query, k):
+    scored = []
+    for row, vector in enumerate(vectors):
+        dot = sum(a * b for a, b in zip(vector, query))
+        norm = math.sqrt(sum(a * a for a in vector)) * math.sqrt(sum(b * b for b in query))
+        scored.append((dot / norm if norm else 0.0, row))
+    scored.sort(reverse=True)
+    return [row for _, row in scored[:k]]
+
+
+def time_queries(search, queries):
+    started = time.perf_counter()
+    results = [search(query) for query in queries]
+    return (time.perf_counter() - started) / len(queries) * 1000, results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--vectors", type=int, default=20000)
+    parser.add_argument("--dimension", type=int, default=256)
+    parser.add_argument("--queries", type=int, default=50)
+    parser.add_argument("--k", type=int, default=3)
+    parser.add_argument("--nprobe", type=int, default=8)
+    parser.add_argument("--brute-force-queries", type=int, default=3,
+                        help="Pure-Python baseline is slow, so it runs on fewer queries")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(42)
+    vectors = rng.standard_normal((args.vectors, args.dimension)).astype(np.float32)
+    queries = rng.standard_normal((args.queries, args.dimension)).astype(np.float32)
+    texts = [f"memory {i}" for i in range(args.vectors)]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        flat = LocalVectorStore(None, Path(tmp) / "flat", ivf_threshold=0)
+        flat.add_embeddings(texts, vectors)
+        ivf = LocalVectorStore(None, Path(tmp) / "ivf", ivf_threshold=1, nprobe=args.nprobe)
+        ivf.add_embeddings(texts, vectors)
+
+        started = time.perf_counter()
+        ivf.search_vector(queries[0], args.k)
+        index_build_ms = (time.perf_counter() - started) * 1000
+
+        python_vectors = vectors.tolist()
+        brute_ms, _ = time_queries(
+            lambda q: brute_force(python_vectors, q.tolist(), args.k),
+            queries[:args.brute_force_queries]
+        )
+        flat_ms, exact = time_queries(lambda q: [r for r, _ in flat.search_vector(q, args.k)], queries)
+        ivf_ms, approx = time_queries(lambda q: [r for r, _ in ivf.search_vector(q, args.k)], queries)
+
+    recall = sum(len(set(a) & set(e)) for a, e in zip(approx, exact)) / (args.k * len(queries))
+    print(json.dumps({
+        "vectors": args.vectors,
+        "dimension": args.dimension,
+        "k": args.k,
+        "brute_force_ms_per_query": round(brute_ms, 3),
+        "vectorized_ms_per_query": round(flat_ms, 3),
+        "ivf_ms_per_query": round(ivf_ms, 3),
+        "ivf_index_build_ms": round(index_build_ms, 1),
+        "ivf_recall_at_k": round(recall, 3),
+        "speedup_vectorized": round(brute_ms / flat_ms, 1) if flat_ms else None,
+        "speedup_ivf": round(brute_ms / ivf_ms, 1) if ivf_ms else None,
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+"""
+Deterministic offline stand-ins for the agent's external services.
+
+- FakeChatModel: answers planner prompts with a fixed plan and everything
+  else with a fixed summary, after a configurable latency
+- FakeVectorStore: bounded in-memory store with a fixed search latency
+- Stub tools: same names and signatures as the real integrations, so
+  TOOL_REGISTRY specs can be re-pointed at this module (see install_fakes)
+"""
+
+import asyncio
+import json
+import time
+from collections import deque
+
+from langchain_core.documents import Document
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+from langchain_core.vectorstores import VectorStore
+
+# Seconds each stub tool call takes; set by the benchmark before running
+TOOL_LATENCY = 0.0
+
+DEFAULT_PLAN = [
+    {"tool": "email.read", "params": {"folder": "inbox"}},
+    {"tool": "jira.create", "params": {"summary": "Follow up", "description": "From email"}},
+    {"tool": "jira.create", "params": {"summary": "Review", "description": "From email"}},
+    {"tool": "slack.post", "params": {"channel": "agent_channal", "text": "Tickets created"}},
+]
+
+DEFAULT_ANSWER = "Read the latest email, created two Jira tickets and posted a Slack update."
+
+
+class FakeChatModel(BaseChatModel):
+    """Chat model returning canned responses with simulated latency and token usage."""
+
+    latency: float = 0.0
+    plan: str = json.dumps(DEFAULT_PLAN)
+    answer: str = DEFAULT_ANSWER
+
+    @property
+    def _llm_type(self):
+        return "fake-chat"
+
+    def _respond(self, messages):
+        prompt = messages[-1].content
+        content = self.plan if "workflow planner" in prompt else self.answer
+        usage = {
+            "input_tokens": len(prompt) // 4,
+            "output_tokens": len(content) // 4,
+            "total_tokens": (len(prompt) + len(content)) // 4,
+        }
+        message = AIMessage(content=content, usage_metadata=usage)
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs):
+        if self.latency:
+            time.sleep(self.latency)
+        return self._respond(messages)
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs):
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        return self._respond(messages)
+
+
+class FakeVectorStore(VectorStore):
+    """In-memory vector store keeping the most recent max_texts texts."""
+
+    def __init__(self, latency=0.0, max_texts=1000):
+        self.latency = latency
+        self.texts = deque(maxlen=max_texts)
+
+    @property
+    def embeddings(self):
+        return None
+
+    def add_texts(self, texts, metadatas=None, **kwargs):
+        if self.latency:
+            time.sleep(self.latency)
+        texts = list(texts)
+        self.texts.extend(texts)
+        return [str(len(self.texts) - len(texts) + i) for i in range(len(texts))]
+
+    def similarity_search(self, query, k=4, **kwargs):
+        if self.latency:
+            time.sleep(self.latency)
+        return [Document(page_content=text) for text in list(self.texts)[-k:]]
+
+    @classmethod
+    def from_texts(cls, texts, embedding=None, metadatas=None, **kwargs):
+        store = cls()
+        store.add_texts(texts, metadatas)
+        return store
+
+
+def _tool_call(result):
+    if TOOL_LATENCY:
+        time.sleep(TOOL_LATENCY)
+    return result
+
+
+def create_jira_ticket(summary, description, project_key="PROJ"):
+    return _tool_call({"key": f"{project_key}-1", "summary": summary})
+
+
+def create_jira_tickets_bulk(issues):
+    # One round trip for the whole batch, like the real bulk endpoint
+    return _tool_call([
+        {"key": f"{issue.get('project_key', 'PROJ')}-{i + 1}", "summary": issue["summary"]}
+        for i, issue in enumerate(issues)
+    ])
+
+
+def post_slack_message(channel="#general", text=""):
+    return _tool_call({"ok": True, "channel": channel})
+
+
+def read_email(folder="inbox"):
+    return _tool_call("Subject: Quarterly report is due on Friday")
+
+
+def create_calendar_event(title="Meeting", start_time=None, end_time=None):
+    return _tool_call(f"Calendar event created: {title}")
+
+
+def install_fakes(llm, store, tool_latency=0.0):
+    """
+    Route the agent's LLM, memory and tool calls to the fakes.
+
+    The planner and responder get llm, the memory store singleton is replaced
+    by store and every registered tool is re-resolved against this module.
+    """
+    global TOOL_LATENCY
+    TOOL_LATENCY = tool_latency
+
+    import core.memory
+    import agent.nodes.planner as planner
+    import agent.nodes.responder as responder
+    from agent.tools import TOOL_REGISTRY
+
+    core.memory._store = store
+    planner.get_llm = responder.get_llm = lambda *args, **kwargs: llm
+
+    for name in TOOL_REGISTRY:
+        spec = TOOL_REGISTRY.get(name)
+        spec.module = __name__
+        spec.resolve()
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Concurrent load benchmark for the /run endpoint.
+
+Start the server in each execution mode and point this script at it:
+
+    AGENT_EXECUTION_MODE=sync  uvicorn main:app --port 8000
+    python benchmarks/load_run.py --label sync
+
+    AGENT_EXECUTION_MODE=async uvicorn main:app --port 8000
+    python benchmarks/load_run.py --label async
+
+Only the standard library is used so the client does not compete with the
+server for the same event loop.
+"""
+
+import argparse
+import json
+import statistics
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+
+def _post(url, payload, timeout):
+    data = json.dumps(payload).encode("utf-8")
+    request = urllib.request.Request(
+        url, data=data, headers={"Content-Type": "application/json"}, method="POST"
+    )
+    started = time.perf_counter()
+    with urllib.request.urlopen(request, timeout=timeout) as response:
+        body = json.loads(response.read())
+    return time.perf_counter() - started, body.get("status") == "success"
+
+
+def run_load(url, task, requests_total, concurrency, timeout):
+    latencies = []
+    failures = 0
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        futures = [
+            pool.submit(_post, url, {"task": task}, timeout)
+            for _ in range(requests_total)
+        ]
+        for future in futures:
+            try:
+                latency, ok = future.result()
+                latencies.append(latency)
+                if not ok:
+                    failures += 1
+            except Exception:
+                failures += 1
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "requests": requests_total,
+        "concurrency": concurrency,
+        "failures": failures,
+        "elapsed_seconds": round(elapsed, 3),
+        "throughput_rps": round(requests_total / elapsed, 2) if elapsed else 0.0,
+        "latency_p50_ms": round(statistics.median(latencies) * 1000, 1) if latencies else None,
+        "latency_max_ms": round(latencies[-1] * 1000, 1) if latencies else None,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default="http://127.0.0.1:8000/run")
+    parser.add_argument("--task", default="Slack pe hello bhejo")
+    parser.add_argument("--requests", type=int, default=50)
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--timeout", type=float, default=120)
+    parser.add_argument("--label", default="", help="Tag for the result, e.g. sync or async")
+    args = parser.parse_args()
+
+    result = run_load(args.url, args.task, args.requests, args.concurrency, args.timeout)
+    result["label"] = args.label
+    print(json.dumps(result, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,7 @@
+import asyncio
 import sys
 import os
+import uuid
 from pathlib import Path
 
 # Add services directory to Python path
@@ -7,14 +9,16 @@ services_path = Path(__file__).parent / "services"
 sys.path.insert(0, str(services_path))
 sys.path.insert(0, str(Path(__file__).parent))
 
-from fastapi import FastAPI
+from typing import Optional
+
+from fastapi import FastAPI, Header, HTTPException, Response
+from fastapi.responses import StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
 import uvicorn
 
 from core.logger import get_logger
 from core.config import settings
 from core.langsmith import setup_langsmith
-from core.llm import get_llm
 
 # Initialize FastAPI app
 app = FastAPI(
@@ -50,17 +54,138 @@ async def startup_event():
     # Test LLM connection
     try:
         # Lazy load LLM to avoid startup issues
+        from core.llm import warm_up_llm_pool
         logger.info(f"LLM model from settings: {settings.MODEL_NAME}")
         if settings.MODEL_NAME:
-            llm = get_llm()
-            logger.info(f"LLM initialized with model: {settings.MODEL_NAME}")
+            warm_up_llm_pool()
+            logger.info(f"LLM client pool warmed up with model: {settings.MODEL_NAME}")
         else:
             logger.warning("MODEL_NAME not set, skipping LLM initialization")
     except Exception as e:
         logger.error(f"Failed to initialize LLM: {e}")
+
+    # Initialize the memory store once (verifies the Pinecone index)
+    from core.memory import verify_memory_store
+    if await asyncio.to_thread(verify_memory_store):
+        logger.info(f"Memory store verified ({settings.MEMORY_BACKEND} backend)")
+    else:
+        logger.warning("Memory store unavailable, requests will run without memory")
+
+    # Resolve and validate every registered tool before the first request
+    try:
+        from agent.tools import TOOL_REGISTRY
+        tools = TOOL_REGISTRY.resolve_all()
+        logger.info(f"Tools ready: {', '.join(tools)}")
+    except Exception as e:
+        logger.error(f"Failed to resolve tools: {e}")
+
+    # Compile the agent workflow once so requests reuse the same graph
+    try:
+        from agent.graph import warm_up_graph
+        stats = warm_up_graph()
+        logger.info(f"Agent graph ready (build: {stats['build_seconds'] * 1000:.1f} ms, "
+                    f"warm-up: {stats['warmup_seconds'] * 1000:.1f} ms)")
+    except Exception as e:
+        logger.error(f"Failed to build agent graph: {e}")
+
+    # Load the prompt tokenizer now rather than in the first request
+    from agent.prompt_builder import count_tokens
+    await asyncio.to_thread(count_tokens, "warm up")
+
+    # Drop old run checkpoints; runs left running by a crash stay resumable
+    from core.checkpoints import get_checkpoint_store
+    checkpoints = get_checkpoint_store()
+    if checkpoints is not None:
+        pruned = await asyncio.to_thread(checkpoints.prune, settings.CHECKPOINT_RETENTION_SECONDS)
+        logger.info(f"Checkpoint store ready ({pruned} expired runs pruned)")
+
+    # Start the background job workers (re-queues jobs interrupted by a restart)
+    if settings.JOB_QUEUE_ENABLED:
+        from core.jobs import start_job_queue
+        start_job_queue(_run_job, settings.JOB_DB_PATH, workers=settings.JOB_WORKERS)
+        logger.info(f"Job queue started with {settings.JOB_WORKERS} workers")
     
+    _register_metrics_collectors()
+
     logger.info("Task Automation Agent started successfully!")
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Release shared resources on shutdown"""
+    # Let running jobs finish before their tools lose their clients
+    from core.jobs import stop_job_queue
+    await asyncio.to_thread(stop_job_queue)
+
+    from core.checkpoints import close_checkpoint_store
+    await asyncio.to_thread(close_checkpoint_store)
+
+    # Flush queued memory writes before the process exits
+    from core.memory_writer import close_memory_writer
+    await asyncio.to_thread(close_memory_writer)
+
+    from integrations.slack.slack_tools import close_dispatcher
+    await asyncio.to_thread(close_dispatcher)
+
+    from core.http import close_http_clients
+    close_http_clients()
+
+    from core.llm import log_llm_pool_stats, close_llm_pool
+    log_llm_pool_stats()
+    await close_llm_pool()
+    logger.info("Task Automation Agent stopped")
+
+def _register_metrics_collectors():
+    """Export the stats() counters components already keep on /metrics."""
+    from core.metrics import REGISTRY, stats_collector
+    from core.llm import get_llm_pool_stats
+    from core.embeddings import get_embeddings_stats
+    from core.memory import memory_breaker
+    from core.memory_writer import get_memory_writer_stats
+    from core.idempotency import get_idempotency_store
+    from core.jobs import get_job_queue
+    from core.checkpoints import get_checkpoint_store
+    from agent.plan_cache import get_plan_cache
+    from agent.intent_router import get_intent_router
+    from agent.response_cache import get_response_cache
+    from agent.nodes.responder import get_responder_stats
+    from integrations.slack.slack_tools import get_dispatcher_stats
+
+    def plan_cache_stats():
+        plan_cache = get_plan_cache()
+        return plan_cache.stats() if plan_cache is not None else None
+
+    def intent_router_stats():
+        router = get_intent_router()
+        return router.stats() if router is not None else None
+
+    def response_cache_stats():
+        response_cache = get_response_cache()
+        return response_cache.stats() if response_cache is not None else None
+
+    def job_stats():
+        jobs = get_job_queue()
+        return jobs.stats() if jobs is not None else None
+
+    def checkpoint_stats():
+        store = get_checkpoint_store()
+        return {"runs": store.counts()} if store is not None else None
+
+    for collector in (
+        stats_collector("agent_llm_client", lambda: {"reuses": get_llm_pool_stats()}, {"reuses": "client"}),
+        stats_collector("agent_embeddings", get_embeddings_stats),
+        stats_collector("agent_plan_cache", plan_cache_stats),
+        stats_collector("agent_intent_router", intent_router_stats, {"hits": "rule"}),
+        stats_collector("agent_responder", get_responder_stats, {"responses": "mode"}),
+        stats_collector("agent_response_cache", response_cache_stats),
+        stats_collector("agent_memory_circuit", memory_breaker.stats),
+        stats_collector("agent_memory_writer", get_memory_writer_stats),
+        stats_collector("agent_slack_dispatcher", get_dispatcher_stats, {"queue_depth_by_channel": "channel"}),
+        stats_collector("agent_idempotency", lambda: get_idempotency_store().stats()),
+        stats_collector("agent_jobs", job_stats, {"jobs": "status"}),
+        stats_collector("agent_checkpoints", checkpoint_stats, {"runs": "status"}),
+    ):
+        REGISTRY.register_collector(collector)
+
 @app.get("/")
 async def root():
     """Root endpoint"""
@@ -69,11 +194,31 @@ async def root():
 @app.get("/health")
 async def health_check():
     """Health check endpoint"""
-    return {"status": "healthy", "service": "task-automation-agent"}
+    from agent.graph import graph_stats
+    from core.memory_writer import get_memory_writer_stats
+    from core.memory import memory_breaker
+    from integrations.slack.slack_tools import get_dispatcher_stats
+    from core.idempotency import get_idempotency_store
+    from core.jobs import get_job_queue
+    jobs = get_job_queue()
+    return {
+        "status": "healthy",
+        "service": "task-automation-agent",
+        "graph": graph_stats,
+        "memory_writer": get_memory_writer_stats(),
+        "memory_circuit": memory_breaker.stats(),
+        "slack_dispatcher": get_dispatcher_stats(),
+        "idempotency": get_idempotency_store().stats(),
+        "jobs": jobs.stats() if jobs else None
+    }
 
-@app.post("/execute")
-async def execute_task(task: dict):
-    """Execute a task"""
+@app.get("/metrics")
+async def metrics():
+    """Node, tool, LLM and memory latency histograms plus component stats in Prometheus text format"""
+    from core.metrics import render_metrics
+    return Response(render_metrics(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
+async def _execute(task):
     try:
         logger.info(f"Executing task: {task}")
         # TODO: Implement task execution logic
@@ -82,37 +227,274 @@ async def execute_task(task: dict):
         logger.error(f"Task execution failed: {e}")
         return {"status": "error", "message": str(e)}
 
-@app.post("/run")
-async def run_task(task_request: dict):
-    """Run a task through the agent workflow"""
+def _is_success(result):
+    # Failed runs are not replayed, so a retry gets a fresh attempt
+    return result.get("status") == "success"
+
+async def _deduplicated(scope, payload, idempotency_key, response, func):
+    from core.idempotency import (
+        get_idempotency_store, request_key, request_fingerprint, IdempotencyKeyReused
+    )
+
+    key = request_key(scope, payload, idempotency_key)
+    try:
+        result, outcome = await get_idempotency_store().run(
+            key, func, should_cache=_is_success, fingerprint=request_fingerprint(payload)
+        )
+    except IdempotencyKeyReused as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    response.headers["Idempotency-Status"] = outcome
+    return result
+
+@app.post("/execute")
+async def execute_task(task: dict, response: Response, idempotency_key: Optional[str] = Header(None)):
+    """Execute a task"""
+    return await _deduplicated("execute", task, idempotency_key, response, lambda: _execute(task))
+
+def _initial_state(user_input, run_id=None):
+    state = {
+        "user_input": user_input,
+        "plan": [],
+        "current_step": 0,
+        "tool_result": None,
+        "history": []
+    }
+    if run_id:
+        state["run_id"] = run_id
+    return state
+
+def _run_state(user_input, run_id=None):
+    """
+    Initial state of a checkpointed run.
+
+    A new run gets a fresh run id. A run that already has checkpoints resumes
+    from them: the state is rebuilt and "resume_from" names the next node, or
+    is None if every node already ran.
+    """
+    from core.checkpoints import get_checkpoint_store
+    from agent.graph import resume_node
+    from agent.steps import load_history
+
+    store = get_checkpoint_store()
+    if store is None:
+        return _initial_state(user_input)
+
+    run_id = run_id or uuid.uuid4().hex
+    run = store.get(run_id)
+    state = _initial_state(run["user_input"] if run else user_input, run_id)
+    if run is not None and run["checkpoints"]:
+        state, last_node = store.load(run_id, state)
+        state["history"] = load_history(state["history"])
+        state["resume_from"] = resume_node(state, last_node)
+        logger.info(f"Resuming run {run_id} after {last_node} at {state['resume_from']}")
+    store.start(run_id, state["user_input"])
+    return state
+
+def _finish_run(state, status):
+    from core.checkpoints import get_checkpoint_store
+
+    store = get_checkpoint_store()
+    if store is not None and state.get("run_id"):
+        store.finish(state["run_id"], status)
+
+async def _invoke(initial_state):
+    """Run the workflow from initial_state, honoring a resume point."""
+    from agent.graph import get_graph
+    from agent.steps import history_text
+
+    if "resume_from" in initial_state and initial_state["resume_from"] is None:
+        # Every node completed before the process stopped
+        result = initial_state
+    elif settings.AGENT_EXECUTION_MODE == "sync":
+        result = get_graph().invoke(initial_state)
+    else:
+        result = await get_graph().ainvoke(initial_state)
+    result.pop("resume_from", None)
+    # Step records are returned in their "tool → result" form
+    result["history"] = history_text(result.get("history", []))
+    return result
+
+async def _run_workflow(task_request, run_id=None):
+    from core.checkpoints import RunActive
+
+    initial_state = None
     try:
         logger.info(f"Running task: {task_request}")
         
-        # Import and run the agent graph
-        from agent.graph import create_graph
-        
-        # Create the workflow graph
-        graph = create_graph()
-        
-        # Process the task through the agent workflow
+        # Process the task through the agent workflow (reusing the graph compiled at startup)
         # Accept both "task" and "input" as the user input field
         user_input = task_request.get("task") or task_request.get("input", "")
-        result = graph.invoke({
-            "user_input": user_input,
-            "plan": [],
-            "current_step": 0,
-            "tool_result": None,
-            "history": []
-        })
+        initial_state = await asyncio.to_thread(_run_state, user_input, run_id)
+        result = await _invoke(initial_state)
+        await asyncio.to_thread(_finish_run, initial_state, "completed")
         
         return {
             "status": "success", 
             "result": result,
+            "run_id": initial_state.get("run_id"),
             "message": "Task completed successfully"
         }
+    except RunActive as e:
+        raise HTTPException(status_code=409, detail=str(e))
     except Exception as e:
         logger.error(f"Task run failed: {e}")
+        if initial_state is not None:
+            # Failed runs keep their checkpoints and can be resumed
+            await asyncio.to_thread(_finish_run, initial_state, "failed")
+            return {"status": "error", "run_id": initial_state.get("run_id"), "message": str(e)}
         return {"status": "error", "message": str(e)}
 
+@app.post("/run")
+async def run_task(task_request: dict, response: Response, idempotency_key: Optional[str] = Header(None)):
+    """
+    Run a task through the agent workflow.
+
+    Retries carrying the same Idempotency-Key header (or, with
+    IDEMPOTENCY_AUTO_KEY, the same body) join the in-flight run or replay its
+    result instead of re-running side-effecting tools. Reusing a key with a
+    different body is rejected with 422.
+    """
+    return await _deduplicated("run", task_request, idempotency_key, response,
+                               lambda: _run_workflow(task_request))
+
+@app.post("/run/stream")
+async def run_task_stream(task_request: dict):
+    """Run a task through the agent workflow, streaming progress as Server-Sent Events"""
+    from agent.graph import get_graph
+    from agent.streaming import stream_run_events
+
+    logger.info(f"Streaming task: {task_request}")
+    user_input = task_request.get("task") or task_request.get("input", "")
+    return StreamingResponse(
+        stream_run_events(get_graph(), _initial_state(user_input)),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+def _run_job(payload, is_cancelled):
+    """Run a queued task through the agent workflow on a job worker thread."""
+    from agent.graph import get_graph
+    from core.jobs import JobCancelled
+
+    # A job re-queued after a restart resumes from its run's checkpoints
+    initial_state = _run_state(payload["task"], payload.get("run_id"))
+    if "resume_from" in initial_state and initial_state["resume_from"] is None:
+        _finish_run(initial_state, "completed")
+        return initial_state
+
+    state = None
+    try:
+        # Check for cancellation between graph steps; a running tool call is not interrupted
+        for state in get_graph().stream(initial_state, stream_mode="values"):
+            if is_cancelled():
+                raise JobCancelled()
+    except BaseException:
+        _finish_run(initial_state, "failed")
+        raise
+    _finish_run(initial_state, "completed")
+    return state
+
+def _get_jobs():
+    from core.jobs import get_job_queue
+
+    queue = get_job_queue()
+    if queue is None:
+        raise HTTPException(status_code=503, detail="Job queue is disabled")
+    return queue
+
+def _get_job(job_id):
+    job = _get_jobs().store.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job not found: {job_id}")
+    return job
+
+def _job_status(job):
+    return {
+        "job_id": job["id"],
+        "status": job["status"],
+        "priority": job["priority"],
+        "cancel_requested": job["cancel_requested"],
+        "created_at": job["created_at"],
+        "started_at": job["started_at"],
+        "finished_at": job["finished_at"],
+        "error": job["error"]
+    }
+
+@app.post("/jobs", status_code=202)
+async def submit_job(task_request: dict):
+    """
+    Queue a task to run in the background.
+
+    Returns a job id immediately; poll GET /jobs/{job_id} and fetch the final
+    state from GET /jobs/{job_id}/result. Higher "priority" values run first.
+    """
+    user_input = task_request.get("task") or task_request.get("input", "")
+    try:
+        priority = int(task_request.get("priority", 0))
+    except (TypeError, ValueError):
+        raise HTTPException(status_code=422, detail="priority must be an integer")
+
+    payload = {"task": user_input, "run_id": uuid.uuid4().hex}
+    job_id = await asyncio.to_thread(_get_jobs().submit, payload, priority)
+    logger.info(f"Queued job {job_id} (priority {priority}): {user_input}")
+    return {"job_id": job_id, "status": "pending"}
+
+@app.get("/jobs/{job_id}")
+async def get_job_status(job_id: str):
+    """Status of a background job"""
+    return _job_status(await asyncio.to_thread(_get_job, job_id))
+
+@app.get("/jobs/{job_id}/result")
+async def get_job_result(job_id: str):
+    """Final workflow state of a finished job; 409 while it is still pending or running"""
+    job = await asyncio.to_thread(_get_job, job_id)
+    if job["status"] in ("pending", "running"):
+        raise HTTPException(status_code=409, detail=f"Job {job_id} is {job['status']}")
+    return {**_job_status(job), "result": job["result"]}
+
+@app.delete("/jobs/{job_id}")
+async def cancel_job(job_id: str):
+    """Cancel a pending job, or ask a running one to stop after its current step"""
+    status = await asyncio.to_thread(_get_jobs().cancel, job_id)
+    if status is None:
+        raise HTTPException(status_code=404, detail=f"Job not found: {job_id}")
+    return {"job_id": job_id, "status": status}
+
+def _get_run(run_id):
+    from core.checkpoints import get_checkpoint_store
+
+    store = get_checkpoint_store()
+    if store is None:
+        raise HTTPException(status_code=503, detail="Checkpointing is disabled")
+    run = store.get(run_id)
+    if run is None:
+        raise HTTPException(status_code=404, detail=f"Run not found: {run_id}")
+    return run
+
+@app.get("/runs/{run_id}")
+async def get_run(run_id: str):
+    """Status of a checkpointed run and the last node it completed"""
+    return await asyncio.to_thread(_get_run, run_id)
+
+@app.post("/runs/{run_id}/resume")
+async def resume_run(run_id: str, response: Response, idempotency_key: Optional[str] = Header(None)):
+    """
+    Resume an interrupted or failed run from its last checkpoint.
+
+    Completed nodes are not re-run, so the planner LLM is not called again and
+    executed plan steps are not repeated; a step that was running when the
+    process died is. Concurrent resumes of the same run join one execution.
+    """
+    run = await asyncio.to_thread(_get_run, run_id)
+    if run["status"] == "completed":
+        raise HTTPException(status_code=409, detail=f"Run {run_id} already completed")
+    if run["active"]:
+        # Still executing in a /run request or a job; resuming would repeat its steps
+        raise HTTPException(status_code=409, detail=f"Run {run_id} is still running")
+
+    task_request = {"task": run["user_input"]}
+    return await _deduplicated("resume", {"run_id": run_id}, idempotency_key or run_id, response,
+                               lambda: _run_workflow(task_request, run_id))
+
 if __name__ == "__main__":
     uvicorn.run(app, host="0.0.0.0", port=8000)
\ No newline at end of file
@@ -1,26 +1,108 @@
+import asyncio
 import logging
+import threading
+import time
 
+from langchain_core.runnables import RunnableLambda
 from langgraph.graph import StateGraph, END
 from agent.state import AgentState
-from agent.nodes.planner import planner_node
-from agent.nodes.executor import executor_node
-from agent.nodes.responder import responder_node
+from agent.nodes.router import router_node, arouter_node, route_after_router
+from agent.nodes.planner import planner_node, aplanner_node
+from agent.nodes.executor import executor_node, aexecutor_node
+from agent.nodes.responder import responder_node, aresponder_node
+from core.checkpoints import get_checkpoint_store, checkpoint_diff
+from core.metrics import NODE_SECONDS
 
 logger = logging.getLogger(__name__)
 
+# Compiled graph shared by every request. LangGraph compiled graphs are
+# stateless between invocations, so one instance is safe to reuse concurrently.
+_compiled_graph = None
+_graph_lock = threading.Lock()
+
+graph_stats = {
+    "build_seconds": None,
+    "warmup_seconds": None,
+}
+
 def has_more_steps(state: AgentState):
     return state["current_step"] < len(state["plan"])
 
+def resume_node(state, last_node):
+    """Node a run continues from after last_node completed; None if the run is finished."""
+    if last_node is None:
+        return "router"
+    if last_node == "router":
+        return route_after_router(state)
+    if last_node in ("planner", "executor"):
+        return "executor" if has_more_steps(state) else "responder"
+    return None
+
+def route_entry(state: AgentState):
+    # Resumed runs start at the node after their last checkpoint
+    return state.get("resume_from") or "router"
+
+def _checkpoint(name, state, update, history_start):
+    run_id = state.get("run_id")
+    if not run_id or not update:
+        return
+    store = get_checkpoint_store()
+    if store is None:
+        return
+    try:
+        store.append(run_id, name, checkpoint_diff(update, history_start))
+    except Exception as e:
+        # A lost checkpoint only costs a re-run of this node on resume
+        logger.warning(f"Failed to checkpoint {name} for run {run_id}: {e}")
+
+def _node(name, func, afunc):
+    # Each node carries a sync and an async implementation, so the same
+    # compiled graph serves both graph.invoke and graph.ainvoke.
+    # The node's update is checkpointed before the graph moves on.
+    def timed(state):
+        history_start = len(state.get("history") or [])
+        with NODE_SECONDS.time(node=name):
+            update = func(state)
+        _checkpoint(name, state, update, history_start)
+        return update
+
+    async def atimed(state):
+        history_start = len(state.get("history") or [])
+        with NODE_SECONDS.time(node=name):
+            update = await afunc(state)
+        if state.get("run_id"):
+            # SQLite write under a lock shared with job threads; keep it off the event loop
+            await asyncio.to_thread(_checkpoint, name, state, update, history_start)
+        return update
+
+    return RunnableLambda(timed, afunc=atimed, name=name)
+
 def create_graph():
     logger.info("Building graph")
     graph = StateGraph(AgentState)
 
-    graph.add_node("planner", planner_node)
-    graph.add_node("executor", executor_node)
-    graph.add_node("responder", responder_node)
+    graph.add_node("router", _node("router", router_node, arouter_node))
+    graph.add_node("planner", _node("planner", planner_node, aplanner_node))
+    graph.add_node("executor", _node("executor", executor_node, aexecutor_node))
+    graph.add_node("responder", _node("responder", responder_node, aresponder_node))
+
+    graph.set_conditional_entry_point(
+        route_entry,
+        {"router": "router", "planner": "planner", "executor": "executor", "responder": "responder"}
+    )
+    # Requests matched by an intent rule skip the planner LLM
+    graph.add_conditional_edges(
+        "router",
+        route_after_router,
+        {"planner": "planner", "executor": "executor"}
+    )
 
-    graph.set_entry_point("planner")
-    graph.add_edge("planner", "executor")
+    # A streaming planner may already have executed every step
+    graph.add_conditional_edges(
+        "planner",
+        has_more_steps,
+        {True: "executor", False: "responder"}
+    )
 
     graph.add_conditional_edges(
         "executor",
@@ -32,3 +114,34 @@ def create_graph():
 
     logger.info("Graph built")
     return graph.compile()
+
+def get_graph():
+    """Return the process-wide compiled graph, building it on first use."""
+    global _compiled_graph
+
+    if _compiled_graph is not None:
+        return _compiled_graph
+
+    with _graph_lock:
+        if _compiled_graph is None:
+            started = time.perf_counter()
+            _compiled_graph = create_graph()
+            graph_stats["build_seconds"] = time.perf_counter() - started
+            logger.info(f"Graph compiled in {graph_stats['build_seconds'] * 1000:.1f} ms")
+
+    return _compiled_graph
+
+def warm_up_graph():
+    """
+    Build the compiled graph and touch its lazily computed structures so the
+    first request does not pay for them.
+
+    Returns:
+        dict: Build and warm-up timings in seconds
+    """
+    started = time.perf_counter()
+    compiled = get_graph()
+    compiled.get_graph()
+    graph_stats["warmup_seconds"] = time.perf_counter() - started
+    logger.info(f"Graph warm-up finished in {graph_stats['warmup_seconds'] * 1000:.1f} ms")
+    return dict(graph_stats)
@@ -0,0 +1,219 @@
+import json
+import logging
+import re
+import threading
+
+from agent.tools import TOOL_REGISTRY, StepValidationError
+from core.config import settings
+
+logger = logging.getLogger(__name__)
+
+_router = None
+_router_lock = threading.Lock()
+
+# Words that usually mean more than one step; such requests go to the planner
+COMPOUND_PATTERN = r"\b(?:and then|then|also|after that|afterwards)\b|;|\band\s+(?:post|send|read|check|create|file|open|schedule|tell|notify|email)\b"
+
+# Signals that text captured by a rule is more than a literal value: it names
+# another tool, refers to data a previous step would have to fetch, or holds
+# a date, time or assignee the rule's params have no place for. Each one
+# found multiplies the match confidence by its factor.
+CAPTURE_SIGNALS = [
+    ("tool", r"\b(?:slack|e-?mails?|inbox|mail|jira|tickets?|issues?|calendar|meetings?|events?)\b", 0.5),
+    ("data", r"\b(?:latest|last|recent|previous|newest|summary|summari[sz]e|contents?|results?|output|attachments?)\b", 0.5),
+    ("datetime", r"\b(?:today|tonight|tomorrow|yesterday|next|this\s+(?:morning|afternoon|evening|week)"
+                 r"|(?:mon|tues|wednes|thurs|fri|satur|sun)day|noon|midnight"
+                 r"|\d{1,2}(?::\d{2})?\s*(?:am|pm)|at\s+\d{1,2}(?::\d{2})?|\d{4}-\d{2}-\d{2})\b", 0.5),
+    ("assignment", r"\b(?:assign(?:ed|ee)?|owner|priority|due|cc)\b", 0.5),
+]
+
+DEFAULT_RULES = [
+    {
+        "name": "slack.post.prefix",
+        "tool": "slack.post",
+        "pattern": r"^(?:please\s+)?(?:post|send|say|write)\s+(?:(?:a\s+)?message\s+)?(?:to|on|in)\s+slack\s*(?:saying|that|:|-)?\s*(?P<text>.+)$",
+        "params": {"channel": "agent_channal", "text": "{text}"},
+    },
+    {
+        "name": "slack.post.quoted",
+        "tool": "slack.post",
+        "pattern": r"^(?:please\s+)?(?:post|send|say|write)\s+[\"'“](?P<text>.+)[\"'”]\s+(?:to|on|in)\s+slack$",
+        "params": {"channel": "agent_channal", "text": "{text}"},
+    },
+    {
+        "name": "email.read",
+        "tool": "email.read",
+        "pattern": r"^(?:please\s+)?(?:read|check|show|get|fetch)\s+(?:me\s+)?(?:my\s+|the\s+)?(?:e-?mails?|inbox|mail)(?:\s+inbox)?$",
+        "params": {"folder": "inbox"},
+    },
+    {
+        "name": "jira.create",
+        "tool": "jira.create",
+        "pattern": r"^(?:please\s+)?(?:create|file|open)\s+(?:a\s+)?(?:new\s+)?jira\s+(?:ticket|issue)\s*(?:called|titled|for|about|:|-)\s*(?P<summary>.+)$",
+        "params": {"project": "KAN", "summary": "{summary}", "description": "{summary}"},
+    },
+    {
+        "name": "calendar.create",
+        "tool": "calendar.create",
+        "pattern": r"^(?:please\s+)?(?:create|schedule|add)\s+(?:a\s+)?(?:calendar\s+)?(?:event|meeting)\s*(?:called|titled|named|:|-)\s*(?P<title>.+)$",
+        "params": {"title": "{title}"},
+    },
+]
+
+class IntentRule:
+    """
+    Regex rule mapping a whole request onto a single plan step.
+
+    Params values may reference named groups of the pattern as "{group}".
+    Rules are matched case-insensitively against the stripped input.
+
+    Args:
+        name (str): Rule name used in metrics and logs
+        tool (str): Tool the step calls
+        pattern (str): Regular expression that must match the whole input
+        params (dict): Step params, with "{group}" placeholders
+        confidence (float): Confidence of a match before the ambiguity penalties
+    """
+
+    def __init__(self, name, tool, pattern, params=None, confidence=1.0):
+        self.name = name
+        self.tool = tool
+        self.pattern = re.compile(pattern, re.IGNORECASE | re.DOTALL)
+        self.params = params or {}
+        self.confidence = confidence
+
+    def match(self, user_input):
+        """
+        Match the rule against user_input.
+
+        Returns:
+            tuple: (plan step, captured texts by group), or (None, None) if the rule does not match
+        """
+        match = self.pattern.match(user_input)
+        if match is None:
+            return None, None
+        groups = {key: value.strip() for key, value in match.groupdict().items() if value}
+        params = {}
+        for key, value in self.params.items():
+            if isinstance(value, str):
+                value = re.sub(r"\{(\w+)\}", lambda m: groups.get(m.group(1), ""), value)
+            params[key] = value
+        return {"tool": self.tool, "params": params}, groups
+
+class IntentRouter:
+    """
+    Deterministic fast path that turns simple requests into a plan without the planner LLM.
+
+    A rule match is only used if its confidence reaches the threshold. The
+    rule's confidence is halved for requests that look like several steps
+    ("... and then ...") and for each CAPTURE_SIGNALS entry found in the
+    text the rule captured, so with the default threshold any such request
+    goes to the planner. The emitted step is validated against the tool's
+    schema like any planner step.
+
+    Args:
+        rules (list): IntentRule instances, tried in order
+        threshold (float): Minimum confidence to skip the planner
+    """
+
+    def __init__(self, rules, threshold=0.9):
+        self.rules = list(rules)
+        self.threshold = threshold
+        self._compound = re.compile(COMPOUND_PATTERN, re.IGNORECASE)
+        self._signals = [(name, re.compile(pattern, re.IGNORECASE), factor) for name, pattern, factor in CAPTURE_SIGNALS]
+        self._lock = threading.Lock()
+        self.hits = {}
+        self.misses = 0
+
+    def route(self, user_input):
+        """
+        Match user_input against the rules.
+
+        Returns:
+            tuple: (plan, rule name) on a confident match, otherwise (None, None)
+        """
+        text = (user_input or "").strip()
+        if text:
+            penalty = 0.5 if self._compound.search(text) else 1.0
+            for rule in self.rules:
+                if rule.confidence * penalty < self.threshold:
+                    continue
+                step, captures = rule.match(text)
+                if step is None:
+                    continue
+                confidence = self.confidence(rule, captures) * penalty
+                if confidence < self.threshold:
+                    logger.debug(f"Intent rule {rule.name} matched with low confidence {confidence:.2f}")
+                    continue
+                try:
+                    TOOL_REGISTRY.prepare(step)
+                except StepValidationError as e:
+                    logger.warning(f"Intent rule {rule.name} produced an invalid step: {e}")
+                    continue
+                self._record(rule.name)
+                return [step], rule.name
+
+        self._record(None)
+        return None, None
+
+    def confidence(self, rule, captures):
+        """Confidence of a rule match given its captured texts, before the compound-request penalty."""
+        confidence = rule.confidence
+        for capture in captures.values():
+            for name, pattern, factor in self._signals:
+                if pattern.search(capture):
+                    confidence *= factor
+        return confidence
+
+    def _record(self, rule_name):
+        with self._lock:
+            if rule_name is None:
+                self.misses += 1
+            else:
+                self.hits[rule_name] = self.hits.get(rule_name, 0) + 1
+
+    def stats(self):
+        with self._lock:
+            hits = dict(self.hits)
+            misses = self.misses
+        total = sum(hits.values()) + misses
+        return {
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": sum(hits.values()) / total if total else 0.0,
+        }
+
+def load_rules(path=None):
+    """
+    Built-in rules, preceded by the rules in the JSON file at path, if any.
+
+    The file holds a list of objects with the IntentRule arguments. Invalid
+    files are logged and ignored.
+    """
+    rules = []
+    if path:
+        try:
+            with open(path, encoding="utf-8") as f:
+                rules.extend(IntentRule(**rule) for rule in json.load(f))
+        except (OSError, ValueError, TypeError, re.error) as e:
+            logger.warning(f"Ignoring intent rules in {path}: {e}")
+    rules.extend(IntentRule(**rule) for rule in DEFAULT_RULES)
+    return rules
+
+def get_intent_router():
+    """Return the process-wide intent router, or None if INTENT_ROUTER_ENABLED is off."""
+    global _router
+
+    if not settings.INTENT_ROUTER_ENABLED:
+        return None
+
+    if _router is None:
+        with _router_lock:
+            if _router is None:
+                _router = IntentRouter(
+                    load_rules(settings.INTENT_RULES_PATH),
+                    threshold=settings.INTENT_ROUTER_THRESHOLD
+                )
+                logger.info(f"Intent router enabled with {len(_router.rules)} rules")
+
+    return _router
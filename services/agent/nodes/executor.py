@@ -1,67 +1,315 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
 from agent.state import AgentState
+from agent.scheduler import build_waves, step_dependencies
+from agent.steps import StepRecord
+from agent.tools import TOOL_REGISTRY, StepValidationError
 from core.logger import get_logger
 from core.config import settings
+from core.metrics import TOOL_SECONDS
 
 import logging
 
 log = get_logger(__name__)
 log.setLevel(settings.LOG_LEVEL)
 
-TOOL_REGISTRY = {
-    "jira.create": ("integrations.jira.jira_tools", "create_jira_ticket"),
-    "slack.post": ("integrations.slack.slack_tools", "post_slack_message"),
-    "email.read": ("integrations.email.email_tools", "read_email"),
-    "calendar.create": ("integrations.calendar.calendar_tools", "create_calendar_event"),
-}
+_pool = None
+_pool_lock = threading.Lock()
 
-def executor_node(state: AgentState):
-    step = state["plan"][state["current_step"]]
-    tool = step["tool"]
-    params = step.get("params", {})
+def _get_pool():
+    """Bounded thread pool shared by parallel plan executions."""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ThreadPoolExecutor(
+                    max_workers=settings.EXECUTOR_MAX_WORKERS,
+                    thread_name_prefix="executor"
+                )
+    return _pool
+
+def _tool(step):
+    """Tool name of a step, or None if the step is malformed."""
+    if isinstance(step, dict) and isinstance(step.get("tool"), str):
+        return step["tool"]
+    return None
+
+def _step_params(step):
+    return step.get("params", {}) if isinstance(step, dict) else {}
+
+def _prepare(step):
+    """Validate a step before any I/O; returns (spec, kwargs, error)."""
+    try:
+        spec, kwargs = TOOL_REGISTRY.prepare(step)
+        return spec, kwargs, None
+    except StepValidationError as e:
+        tool = _tool(step)
+        if tool is None or tool not in TOOL_REGISTRY:
+            # "Malformed step: ..." or "Tool not found: ..."
+            error = str(e)
+        else:
+            error = f"Parameter error for {tool}: {str(e)}. Got params: {_step_params(step)}"
+        log.error(error)
+        return None, None, error
+
+def _invalid(step, error):
+    return StepRecord.from_result(_tool(step) or "invalid", _step_params(step), error, status="error")
 
-    log.info(f"Executing tool: {tool}")
+def _run_tool(step):
+    """Run one step; returns its StepRecord. Malformed steps are recorded as errors."""
+    spec, kwargs, error = _prepare(step)
+    if error is not None:
+        return _invalid(step, error)
+    tool, params = step["tool"], _step_params(step)
 
-    tool_info = TOOL_REGISTRY.get(tool)
-    if tool_info is None:
-        result = f"Tool not found: {tool}"
+    started = time.perf_counter()
+    try:
+        with spec.slot(), TOOL_SECONDS.time(tool=tool, mode="single"):
+            result = spec.function(**kwargs)
+        return StepRecord.from_result(tool, params, result, time.perf_counter() - started)
+    except Exception as e:
+        result = f"Error executing {tool}: {str(e)}"
         log.error(result)
-    else:
-        tool_fn_module, tool_fn_name = tool_info
+    return StepRecord.from_result(tool, params, result, time.perf_counter() - started, "error")
+
+async def _arun_tool(step):
+    """
+    Run a step without blocking the event loop.
+
+    Tools with a native coroutine (ToolSpec.async_function) are awaited;
+    anything else is run in a worker thread.
+    """
+    spec, kwargs, error = _prepare(step)
+    if error is not None:
+        return _invalid(step, error)
+    tool, params = step["tool"], _step_params(step)
+
+    started = time.perf_counter()
+    try:
+        async with spec.aslot():
+            with TOOL_SECONDS.time(tool=tool, mode="single"):
+                if spec.async_function is not None:
+                    result = await spec.async_function(**kwargs)
+                else:
+                    result = await asyncio.to_thread(spec.function, **kwargs)
+        return StepRecord.from_result(tool, params, result, time.perf_counter() - started)
+    except Exception as e:
+        result = f"Error executing {tool}: {str(e)}"
+        log.error(result)
+    return StepRecord.from_result(tool, params, result, time.perf_counter() - started, "error")
+
+def _supports_batch(tool):
+    if not settings.BULK_TOOL_EXECUTION or tool not in TOOL_REGISTRY:
+        return False
+    return TOOL_REGISTRY.get(tool).batch_function is not None
+
+def _batch_tools():
+    return {tool for tool in TOOL_REGISTRY if _supports_batch(tool)}
+
+def _run_batch(tool, params_list):
+    """Run several steps of one tool through its bulk API; one StepRecord per step."""
+    results = [None] * len(params_list)
+    valid = []
+    for index, params in enumerate(params_list):
+        spec, kwargs, error = _prepare({"tool": tool, "params": params})
+        if error is not None:
+            results[index] = StepRecord.from_result(tool, params, error, status="error")
+        else:
+            valid.append((index, kwargs))
+
+    if valid:
+        log.info(f"Executing {len(valid)} {tool} steps in bulk")
+        spec = TOOL_REGISTRY.get(tool)
+        started = time.perf_counter()
         try:
-            # Normalize parameter names and channel for slack.post
-            if tool == "slack.post":
-                # Map "message" to "text" if needed
-                if "message" in params and "text" not in params:
-                    params["text"] = params.pop("message")
-                
-                # Normalize channel: remove # and default to agent_channal
-                channel = params.get("channel", "agent_channal")
-                channel = channel.replace("#", "")
-                # Override with agent_channal if general or empty
-                if channel == "general" or not channel:
-                    channel = "agent_channal"
-                params["channel"] = channel
-            
-            # Normalize parameter names for jira.create
-            elif tool == "jira.create":
-                # Map "project" to "project_key" if needed
-                if "project" in params and "project_key" not in params:
-                    params["project_key"] = params.pop("project")
-            
-            module = __import__(tool_fn_module, fromlist=[tool_fn_name])
-            tool_fn = getattr(module, tool_fn_name)
-            result = tool_fn(**params)
-        except TypeError as e:
-            result = f"Parameter error for {tool}: {str(e)}. Got params: {params}"
-            log.error(result)
+            # A bulk call takes one concurrency slot, like a single call
+            with spec.slot(), TOOL_SECONDS.time(tool=tool, mode="bulk"):
+                batch_results = spec.batch_function([kwargs for _, kwargs in valid])
+            duration = time.perf_counter() - started
+            for (index, _), result in zip(valid, batch_results):
+                results[index] = StepRecord.from_result(tool, params_list[index], result, duration)
         except Exception as e:
             result = f"Error executing {tool}: {str(e)}"
             log.error(result)
+            duration = time.perf_counter() - started
+            for index, _ in valid:
+                results[index] = StepRecord.from_result(tool, params_list[index], result, duration, "error")
+    return results
 
-    state["history"].append(f"{tool} → {result}")
+def _split_batches(plan, indices):
+    """Split step indices into bulk groups (same batchable tool) and single steps."""
+    groups = {}
+    singles = []
+    for index in indices:
+        tool = _tool(plan[index])
+        if tool is not None and _supports_batch(tool):
+            groups.setdefault(tool, []).append(index)
+        else:
+            singles.append(index)
 
+    batches = []
+    for group in groups.values():
+        if len(group) > 1:
+            batches.append(group)
+        else:
+            singles.extend(group)
+    return batches, sorted(singles)
+
+def _consecutive_batch(plan, start):
+    """Indices of the consecutive steps from start that share a batchable tool."""
+    tool = _tool(plan[start])
+    end = start + 1
+    if tool is not None and _supports_batch(tool):
+        while end < len(plan) and _tool(plan[end]) == tool:
+            end += 1
+    return list(range(start, end))
+
+def _next_state(state, record):
+    # history has an append reducer, so nodes return only their new records
     return {
-        "tool_result": result,
+        "tool_result": record.result,
         "current_step": state["current_step"] + 1,
-        "history": state["history"]
+        "history": [record]
     }
+
+def _merge_results(plan, results, next_step=None):
+    # Records in plan order so history is the same regardless of completion order
+    records = [results[index] for index in sorted(results)]
+
+    return {
+        "tool_result": records[-1].result if records else None,
+        "current_step": len(plan) if next_step is None else next_step,
+        "history": records
+    }
+
+def _params(plan, index):
+    return _step_params(plan[index])
+
+def _execute_parallel(state):
+    plan = state["plan"]
+    pool = _get_pool()
+    results = {}
+
+    for wave in build_waves(plan, state["current_step"], _batch_tools()):
+        log.info(f"Executing steps {wave} in parallel: {[_tool(plan[i]) for i in wave]}")
+        batches, singles = _split_batches(plan, wave)
+        futures = {
+            index: pool.submit(_run_tool, plan[index])
+            for index in singles
+        }
+        batch_futures = {
+            tuple(group): pool.submit(
+                _run_batch, _tool(plan[group[0]]), [_params(plan, i) for i in group]
+            )
+            for group in batches
+        }
+        for index, future in futures.items():
+            results[index] = future.result()
+        for group, future in batch_futures.items():
+            results.update(zip(group, future.result()))
+
+    return _merge_results(plan, results)
+
+async def _aexecute_parallel(state):
+    plan = state["plan"]
+    semaphore = asyncio.Semaphore(settings.EXECUTOR_MAX_WORKERS)
+    results = {}
+
+    async def run(index):
+        async with semaphore:
+            results[index] = await _arun_tool(plan[index])
+
+    async def run_batch(group):
+        async with semaphore:
+            outcome = await asyncio.to_thread(
+                _run_batch, _tool(plan[group[0]]), [_params(plan, i) for i in group]
+            )
+            results.update(zip(group, outcome))
+
+    for wave in build_waves(plan, state["current_step"], _batch_tools()):
+        log.info(f"Executing steps {wave} in parallel: {[_tool(plan[i]) for i in wave]}")
+        batches, singles = _split_batches(plan, wave)
+        await asyncio.gather(
+            *(run(index) for index in singles),
+            *(run_batch(group) for group in batches)
+        )
+
+    return _merge_results(plan, results)
+
+class StreamedSteps:
+    """
+    Runs plan steps while the planner is still generating the rest of the plan.
+
+    Each submitted step starts as soon as the steps it depends on have
+    finished: with PARALLEL_EXECUTION the scheduler's dependencies, otherwise
+    the previous step, which keeps the sequential order. Bulk tool APIs are
+    not used for streamed steps since later steps are not known yet.
+    """
+
+    def __init__(self, parallel=None):
+        self.parallel = settings.PARALLEL_EXECUTION if parallel is None else parallel
+        self.plan = []
+        self._tasks = []
+        self._semaphore = asyncio.Semaphore(settings.EXECUTOR_MAX_WORKERS)
+
+    def submit(self, step):
+        index = len(self.plan)
+        self.plan.append(step)
+        if self.parallel:
+            dependencies = step_dependencies(self.plan, index)
+        else:
+            dependencies = {index - 1} if index else set()
+        log.info(f"Starting streamed step {index}: {_tool(step)}")
+        self._tasks.append(asyncio.create_task(self._run(index, dependencies)))
+
+    async def _run(self, index, dependencies):
+        if dependencies:
+            await asyncio.gather(*(self._tasks[dep] for dep in dependencies))
+        async with self._semaphore:
+            return await _arun_tool(self.plan[index])
+
+    async def results(self):
+        """Wait for every submitted step; results are in plan order."""
+        return await asyncio.gather(*self._tasks)
+
+    def cancel(self):
+        for task in self._tasks:
+            task.cancel()
+
+    def update(self, plan, results):
+        """State update recording the streamed steps as executed steps of plan."""
+        return _merge_results(plan, dict(enumerate(results)), next_step=len(results))
+
+def executor_node(state: AgentState):
+    if settings.PARALLEL_EXECUTION:
+        return _execute_parallel(state)
+
+    plan = state["plan"]
+    group = _consecutive_batch(plan, state["current_step"])
+    if len(group) > 1:
+        outcome = _run_batch(_tool(plan[group[0]]), [_params(plan, i) for i in group])
+        return _merge_results(plan, dict(zip(group, outcome)), group[-1] + 1)
+
+    step = plan[state["current_step"]]
+    log.info(f"Executing tool: {_tool(step)}")
+    return _next_state(state, _run_tool(step))
+
+async def aexecutor_node(state: AgentState):
+    """Async variant of executor_node that never blocks the event loop."""
+    if settings.PARALLEL_EXECUTION:
+        return await _aexecute_parallel(state)
+
+    plan = state["plan"]
+    group = _consecutive_batch(plan, state["current_step"])
+    if len(group) > 1:
+        outcome = await asyncio.to_thread(
+            _run_batch, _tool(plan[group[0]]), [_params(plan, i) for i in group]
+        )
+        return _merge_results(plan, dict(zip(group, outcome)), group[-1] + 1)
+
+    step = plan[state["current_step"]]
+    log.info(f"Executing tool: {_tool(step)}")
+    return _next_state(state, await _arun_tool(step))
@@ -1,63 +1,146 @@
-import json
-from core.memory import get_memory_store
+import asyncio
+from core.memory import get_memory_store, memory_breaker
+from core.circuit_breaker import CircuitOpenError
 from core.llm import get_llm
-from agent.prompts import PLANNER_PROMPT
+from core.metrics import MEMORY_SECONDS
+from agent.prompt_builder import build_planner_prompt
+from agent.plan_cache import get_plan_cache
+from agent.plan_parser import IncrementalPlanParser, parse_plan_text
+from agent.nodes.executor import StreamedSteps
+from core.config import settings
+from core.logger import get_logger
 
-def planner_node(state):
-    llm = get_llm()
-    
+log = get_logger(__name__)
+
+def _load_memory_context(user_input):
+    """Page contents of the most relevant memories, or [] if memory is unavailable."""
     # Try to get memory, but handle if Pinecone is not available
     try:
-        memory = get_memory_store()
-        memories = memory.similarity_search(
-            state["user_input"], k=3
-        )
-        memory_context = "\n".join(
-            [m.page_content for m in memories]
-        )
+        with MEMORY_SECONDS.time(operation="search"):
+            memories = memory_breaker.call(
+                lambda: get_memory_store().similarity_search(user_input, k=3)
+            )
+        return [m.page_content for m in memories]
+    except CircuitOpenError:
+        log.info("Memory store circuit open, skipping memory lookup")
+        return []
     except Exception as e:
-        print(f"Memory store not available: {e}")
-        memory_context = "No previous context available"
+        log.warning(f"Memory store not available: {e}")
+        return []
 
-    # Use safer string formatting to avoid KeyError with curly braces
-    prompt = PLANNER_PROMPT.replace("{input}", state["user_input"]).replace("{memory}", memory_context)
+def _build_prompt(user_input, memory_context):
+    # Deduplicates and truncates memories to fit the planner's token budget
+    return build_planner_prompt(user_input, memory_context)
 
-    response = llm.invoke(prompt)
-    
-    # Try to parse JSON response
+def _parse_plan(content, user_input):
+    """Return (plan, parsed), where parsed is False if the default plan was used."""
+    content = content.strip()
+    log.debug(f"Raw LLM response: {content[:200]}...")
+
+    # Strict JSON first, then repair of common defects (fences, quotes,
+    # trailing commas, truncation) before falling back to the default plan
     try:
-        content = response.content.strip()
-        print(f"Raw LLM response: {content[:200]}...")
-        
-        # Remove markdown code blocks if present
-        if content.startswith("```json"):
-            content = content[7:]
-        if content.startswith("```"):
-            content = content[3:]
-        if content.endswith("```"):
-            content = content[:-3]
-        content = content.strip()
-        
-        plan = json.loads(content)
-        
-        # Validate plan structure
-        if not isinstance(plan, list):
-            print(f"Warning: Plan is not a list, got: {type(plan)}")
-            if isinstance(plan, dict) and "tool" in plan:
-                plan = [plan]
-            else:
-                plan = [{"tool": "slack.post", "params": {"text": state["user_input"]}}]
-        
-        print(f"Parsed plan: {plan}")
-    except json.JSONDecodeError as e:
-        print(f"Failed to parse LLM response as JSON: {e}")
-        print(f"Response content: {response.content}")
+        plan, repaired = parse_plan_text(content)
+        if repaired:
+            log.warning("Repaired malformed plan JSON")
+        log.debug(f"Parsed plan: {plan}")
+        return plan, True
+    except ValueError as e:
+        log.warning(f"Failed to parse LLM response as JSON, using the default plan: {e}")
+        log.debug(f"Response content: {content}")
         # Return a default plan
-        plan = [{"tool": "slack.post", "params": {"text": state["user_input"]}}]
+        return [{"tool": "slack.post", "params": {"text": user_input}}], False
+
+async def _astream_plan(llm, prompt, user_input):
+    """
+    Stream the planner response and start each step as soon as it is complete.
+
+    Returns:
+        tuple: (plan, parsed, update) where update records the steps already executed
+    """
+    parser = IncrementalPlanParser()
+    steps = StreamedSteps()
+    chunks = []
+    try:
+        async for chunk in llm.astream(prompt):
+            chunks.append(chunk.content)
+            for step in parser.feed(chunk.content):
+                steps.submit(step)
+        results = await steps.results()
+    except BaseException:
+        steps.cancel()
+        raise
+
+    plan, parsed = _parse_plan("".join(chunks), user_input)
+    streamed = parser.steps
+    if streamed and plan[:len(streamed)] != streamed:
+        # The executed steps are authoritative; keep any later steps from the full parse
+        log.warning("Full plan differs from the streamed steps")
+        plan = streamed + plan[len(streamed):] if parsed else list(streamed)
+        parsed = True
+    log.info(f"Executed {len(results)} of {len(plan)} steps while planning")
+
+    return plan, parsed, steps.update(plan, results)
+
+def _cache_plan(plan_cache, user_input, plan, parsed):
+    # Only cache real planner output, never the fallback plan
+    if plan_cache is not None and parsed:
+        plan_cache.set(user_input, plan)
+
+def _cached_plan(user_input):
+    """Return (plan_cache, cached plan or None); plan_cache is None if caching is off."""
+    plan_cache = get_plan_cache()
+    if plan_cache is None:
+        return None, None
+    return plan_cache, plan_cache.get(user_input)
 
+def _plan_update(plan):
     return {
         "plan": plan,
-        "current_step": 0,
-        "history": []
+        "current_step": 0
     }
 
+def planner_node(state):
+    plan_cache, plan = _cached_plan(state["user_input"])
+    if plan is not None:
+        log.info(f"Plan cache hit: {plan}")
+        return _plan_update(plan)
+
+    llm = get_llm()
+    memory_context = _load_memory_context(state["user_input"])
+    prompt = _build_prompt(state["user_input"], memory_context)
+
+    response = llm.invoke(prompt)
+    plan, parsed = _parse_plan(response.content, state["user_input"])
+    _cache_plan(plan_cache, state["user_input"], plan, parsed)
+
+    return _plan_update(plan)
+
+async def aplanner_node(state):
+    """Async variant of planner_node that never blocks the event loop."""
+    if settings.PLAN_CACHE_BACKEND == "memory" and settings.PLAN_CACHE_SIMILARITY_THRESHOLD <= 0:
+        # An in-memory exact lookup is a dict access, cheaper than a thread hop
+        plan_cache, plan = _cached_plan(state["user_input"])
+    else:
+        # SQLite reads (and opening the database on first use) and the
+        # semantic tier's embeddings call block
+        plan_cache, plan = await asyncio.to_thread(_cached_plan, state["user_input"])
+    if plan is not None:
+        log.info(f"Plan cache hit: {plan}")
+        return _plan_update(plan)
+
+    llm = get_llm()
+    # The vector store client is synchronous, so run the lookup in a worker thread
+    memory_context = await asyncio.to_thread(_load_memory_context, state["user_input"])
+    prompt = _build_prompt(state["user_input"], memory_context)
+
+    if settings.PLANNER_STREAMING:
+        plan, parsed, update = await _astream_plan(llm, prompt, state["user_input"])
+    else:
+        response = await llm.ainvoke(prompt)
+        plan, parsed = _parse_plan(response.content, state["user_input"])
+        update = _plan_update(plan)
+    if plan_cache is not None and parsed:
+        await asyncio.to_thread(_cache_plan, plan_cache, state["user_input"], plan, parsed)
+
+    return {**update, "plan": plan}
@@ -1,27 +1,127 @@
+import asyncio
 import logging
+import threading
 
 from core.llm import get_llm
-from core.memory import get_memory_store
-from agent.prompts import RESPONDER_PROMPT
+from core.memory import get_memory_store, memory_breaker
+from core.memory_writer import get_memory_writer
+from core.metrics import MEMORY_SECONDS
+from core.config import settings
+from agent.prompt_builder import build_responder_prompt
+from agent.response_cache import get_response_cache
+from agent.steps import StepRecord, memory_text
 from agent.state import AgentState
 from core.logger import get_logger
 
 log = get_logger(__name__)
 
-def responder_node(state: AgentState):
-    llm = get_llm()
-    
+# Final responses by how they were produced: "template", "cache" or "llm"
+_modes = {"template": 0, "cache": 0, "llm": 0}
+_modes_lock = threading.Lock()
+
+def _remember(history, timeout=None):
+    text = memory_text(history)
+    if settings.MEMORY_WRITE_BEHIND:
+        # Written in the background, off the request's critical path
+        get_memory_writer().submit(
+            text,
+            timeout=settings.MEMORY_WRITE_PUT_TIMEOUT if timeout is None else timeout
+        )
+        return
+
     # Try to use memory store, but handle if Pinecone is not available
     try:
-        memory = get_memory_store()
-        memory.add_texts([
-            f"User action: {state['history']}"
-        ])
+        with MEMORY_SECONDS.time(operation="write"):
+            memory_breaker.call(lambda: get_memory_store().add_texts([text]))
     except Exception as e:
         print(f"Memory store not available: {e}")
 
-    response = llm.invoke(
-        RESPONDER_PROMPT + "\n" + "\n".join(state["history"])
-    )
+def _build_prompt(state):
+    # Older history is summarized to fit the responder's token budget
+    return build_responder_prompt(state["user_input"], state["history"])
+
+def _template_response(history):
+    """
+    Final response built from the tool results, or None if they need the LLM.
+
+    Results are simple when each is a short single line that already says what
+    happened (e.g. "Slack message sent to agent_channal: hello"); structured
+    payloads and errors are left to the LLM.
+    """
+    if not settings.RESPONDER_TEMPLATE_ENABLED or not history:
+        return None
+    if len(history) > settings.RESPONDER_TEMPLATE_MAX_STEPS:
+        return None
+
+    lines = []
+    for record in history:
+        if not isinstance(record, StepRecord) or record.status != "ok" or record.truncated:
+            return None
+        if not isinstance(record.result, str):
+            return None
+        result = record.result.strip()
+        if not result or len(result) > settings.RESPONDER_TEMPLATE_MAX_RESULT_CHARS:
+            return None
+        if "\n" in result or "error" in result.lower() or "failed" in result.lower():
+            return None
+        lines.append(result)
+
+    if len(lines) == 1:
+        return f"Done. {lines[0]}"
+    return "Done:\n" + "\n".join(f"- {line}" for line in lines)
+
+def _lookup_response(state):
+    """Return (response, mode) without calling the LLM, or (None, None)."""
+    response = _template_response(state["history"])
+    if response is not None:
+        return response, "template"
+
+    response_cache = get_response_cache()
+    if response_cache is not None:
+        response = response_cache.get(state["user_input"], state["plan"], state["history"])
+        if response is not None:
+            return response, "cache"
+    return None, None
+
+def _finish(state, response, mode):
+    if mode == "llm":
+        response_cache = get_response_cache()
+        if response_cache is not None:
+            response_cache.set(state["user_input"], state["plan"], state["history"], response)
+    with _modes_lock:
+        _modes[mode] += 1
+    return {"final_response": response}
+
+def get_responder_stats():
+    """How final responses were produced, and the share that skipped the LLM."""
+    with _modes_lock:
+        modes = dict(_modes)
+    total = sum(modes.values())
+    return {
+        "responses": modes,
+        "llm_skip_rate": (modes["template"] + modes["cache"]) / total if total else 0.0,
+    }
+
+def responder_node(state: AgentState):
+    _remember(state["history"])
+
+    response, mode = _lookup_response(state)
+    if response is None:
+        response, mode = get_llm().invoke(_build_prompt(state)).content, "llm"
+
+    return _finish(state, response, mode)
+
+async def aresponder_node(state: AgentState):
+    """Async variant of responder_node that never blocks the event loop."""
+    if settings.MEMORY_WRITE_BEHIND:
+        # Never block the event loop on a full queue
+        _remember(state["history"], timeout=0)
+    else:
+        await asyncio.to_thread(_remember, state["history"])
+
+    response, mode = _lookup_response(state)
+    if response is None:
+        response = await get_llm().ainvoke(_build_prompt(state))
+        response, mode = response.content, "llm"
 
-    return {"final_response": response.content}
+    return _finish(state, response, mode)
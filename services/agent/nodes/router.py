@@ -0,0 +1,27 @@
+from agent.intent_router import get_intent_router
+from core.logger import get_logger
+
+log = get_logger(__name__)
+
+def router_node(state):
+    """Plan simple requests directly from the intent rules; anything else goes to the planner."""
+    router = get_intent_router()
+    if router is None:
+        return {}
+
+    plan, rule = router.route(state["user_input"])
+    if plan is None:
+        return {}
+
+    log.info(f"Intent fast path ({rule}): {plan}")
+    return {
+        "plan": plan,
+        "current_step": 0
+    }
+
+async def arouter_node(state):
+    # Rule matching is a few regexes, cheap enough to run on the event loop
+    return router_node(state)
+
+def route_after_router(state):
+    return "executor" if state.get("plan") else "planner"
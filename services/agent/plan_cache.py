@@ -0,0 +1,192 @@
+import copy
+import hashlib
+import logging
+import re
+import threading
+
+import numpy as np
+
+from core.cache import LRUCache, SQLiteCache
+from core.config import settings
+
+logger = logging.getLogger(__name__)
+
+_plan_cache = None
+_plan_cache_lock = threading.Lock()
+
+def normalize_input(user_input):
+    """Lowercase, collapse whitespace and drop trailing punctuation."""
+    text = re.sub(r"\s+", " ", user_input or "").strip().lower()
+    return text.rstrip(".!?")
+
+def _normalize(vector):
+    vector = np.asarray(vector, dtype=np.float32)
+    norm = np.linalg.norm(vector)
+    return vector / norm if norm else vector
+
+class PlanCache:
+    """
+    Cache of planner output keyed by the normalized user input.
+
+    The exact tier looks up the normalized input directly. When a similarity
+    threshold is set, a semantic tier compares the input embedding against the
+    embeddings of cached inputs and reuses the closest plan above the threshold.
+    Those embeddings are L2-normalized rows of one float32 matrix, so a lookup
+    is a single matrix-vector product; once it holds max_entries rows, the
+    oldest row is overwritten.
+
+    Args:
+        backend: LRUCache or SQLiteCache holding the plans
+        similarity_threshold (float): Cosine threshold for the semantic tier; 0 disables it
+        embed (callable): Function mapping text to an embedding vector
+    """
+
+    def __init__(self, backend, similarity_threshold=0.0, embed=None):
+        self.backend = backend
+        self.similarity_threshold = similarity_threshold
+        self.embed = embed
+        self.exact_hits = 0
+        self.semantic_hits = 0
+        self.misses = 0
+        # Embeddings of cached inputs; bounded like the backend
+        self._capacity = max(backend.max_entries, 1)
+        self._matrix = None
+        self._row_keys = [None] * self._capacity
+        self._rows = {}
+        self._next_row = 0
+        self._vectors_lock = threading.Lock()
+
+    @property
+    def semantic_enabled(self):
+        return self.similarity_threshold > 0 and self.embed is not None
+
+    @staticmethod
+    def _key(normalized):
+        return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
+    def get_exact(self, user_input):
+        plan = self.backend.get(self._key(normalize_input(user_input)))
+        if plan is not None:
+            self.exact_hits += 1
+            # Callers mutate step params, so never hand out the cached object
+            return copy.deepcopy(plan)
+        return None
+
+    def get_similar(self, user_input):
+        if not self.semantic_enabled:
+            return None
+
+        query = _normalize(self.embed(normalize_input(user_input)))
+        with self._vectors_lock:
+            if self._matrix is None or query.shape != self._matrix.shape[1:]:
+                return None
+            scores = self._matrix @ query
+            row = int(np.argmax(scores))
+            best_key, best_score = self._row_keys[row], float(scores[row])
+
+        if best_key is None or best_score < self.similarity_threshold:
+            return None
+
+        plan = self.backend.get(best_key)
+        if plan is None:
+            self._forget(best_key)
+            return None
+
+        self.semantic_hits += 1
+        logger.info(f"Semantic plan cache hit (similarity {best_score:.3f})")
+        return copy.deepcopy(plan)
+
+    def get(self, user_input):
+        plan = self.get_exact(user_input)
+        if plan is None:
+            plan = self.get_similar(user_input)
+        if plan is None:
+            self.misses += 1
+        return plan
+
+    def set(self, user_input, plan):
+        normalized = normalize_input(user_input)
+        key = self._key(normalized)
+        self.backend.set(key, copy.deepcopy(plan))
+        if self.semantic_enabled:
+            try:
+                self._remember(key, _normalize(self.embed(normalized)))
+            except Exception as e:
+                logger.warning(f"Failed to embed plan cache key: {e}")
+
+    def _remember(self, key, vector):
+        with self._vectors_lock:
+            if self._matrix is None:
+                self._matrix = np.zeros((self._capacity, len(vector)), dtype=np.float32)
+            elif vector.shape != self._matrix.shape[1:]:
+                raise ValueError(f"Embedding dimension {len(vector)} does not match {self._matrix.shape[1]}")
+
+            row = self._rows.get(key)
+            if row is None:
+                row = self._next_row
+                self._next_row = (row + 1) % self._capacity
+                self._rows.pop(self._row_keys[row], None)
+                self._row_keys[row] = key
+                self._rows[key] = row
+            self._matrix[row] = vector
+
+    def _forget(self, key):
+        with self._vectors_lock:
+            row = self._rows.pop(key, None)
+            if row is not None:
+                # A zero row scores 0, below any threshold
+                self._row_keys[row] = None
+                self._matrix[row] = 0.0
+
+    def clear(self):
+        self.backend.clear()
+        with self._vectors_lock:
+            self._matrix = None
+            self._row_keys = [None] * self._capacity
+            self._rows = {}
+            self._next_row = 0
+
+    def stats(self):
+        lookups = self.exact_hits + self.semantic_hits + self.misses
+        return {
+            "exact_hits": self.exact_hits,
+            "semantic_hits": self.semantic_hits,
+            "misses": self.misses,
+            "hit_rate": (self.exact_hits + self.semantic_hits) / lookups if lookups else 0.0,
+            "backend": self.backend.stats(),
+        }
+
+def _embed_query(text):
+    from core.embeddings import get_embeddings
+    return get_embeddings().embed_query(text)
+
+def get_plan_cache():
+    """Return the process-wide plan cache, or None if PLAN_CACHE_BACKEND is "none"."""
+    global _plan_cache
+
+    if settings.PLAN_CACHE_BACKEND == "none":
+        return None
+
+    if _plan_cache is None:
+        with _plan_cache_lock:
+            if _plan_cache is None:
+                if settings.PLAN_CACHE_BACKEND == "sqlite":
+                    backend = SQLiteCache(
+                        settings.PLAN_CACHE_PATH,
+                        table="plan_cache",
+                        max_entries=settings.PLAN_CACHE_MAX_ENTRIES,
+                        ttl_seconds=settings.PLAN_CACHE_TTL_SECONDS
+                    )
+                else:
+                    backend = LRUCache(
+                        max_entries=settings.PLAN_CACHE_MAX_ENTRIES,
+                        ttl_seconds=settings.PLAN_CACHE_TTL_SECONDS
+                    )
+                logger.info(f"Plan cache enabled with {settings.PLAN_CACHE_BACKEND} backend")
+                _plan_cache = PlanCache(
+                    backend,
+                    similarity_threshold=settings.PLAN_CACHE_SIMILARITY_THRESHOLD,
+                    embed=_embed_query
+                )
+
+    return _plan_cache
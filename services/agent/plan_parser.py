@@ -0,0 +1,223 @@
+import json
+import logging
+
+logger = logging.getLogger(__name__)
+
+_LITERALS = {"True": "true", "False": "false", "None": "null", "true": "true", "false": "false", "null": "null"}
+_CLOSERS = {"[": "]", "{": "}"}
+_SMART_QUOTES = str.maketrans({"“": '"', "”": '"', "‘": "'", "’": "'"})
+
+def _load_step(text):
+    """Parse one step object, repairing it if needed; None if it is not a step."""
+    try:
+        step = json.loads(text)
+    except json.JSONDecodeError:
+        try:
+            step = json.loads(repair_json(text))
+        except json.JSONDecodeError:
+            return None
+    if isinstance(step, dict) and isinstance(step.get("tool"), str):
+        return step
+    return None
+
+class IncrementalPlanParser:
+    """
+    Incremental parser for a JSON array of plan steps.
+
+    Feed it LLM output chunk by chunk; feed() returns the step objects that
+    were completed by that chunk, so they can be acted on before the rest of
+    the plan is generated. Text before the opening "[" (prose, markdown
+    fences) is skipped. Each character is scanned once.
+    """
+
+    def __init__(self):
+        self.buffer = ""
+        self.steps = []
+        self.done = False
+        self._pos = 0
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._object_start = None
+
+    def feed(self, chunk):
+        self.buffer += chunk
+        completed = []
+        buffer = self.buffer
+        while self._pos < len(buffer) and not self.done:
+            char = buffer[self._pos]
+            if self._depth == 0:
+                if char == "[":
+                    self._depth = 1
+            elif self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == "\\":
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+            elif char == '"':
+                self._in_string = True
+            elif char in "[{":
+                if self._depth == 1 and char == "{":
+                    self._object_start = self._pos
+                self._depth += 1
+            elif char in "]}":
+                self._depth -= 1
+                if self._depth == 1 and char == "}" and self._object_start is not None:
+                    step = _load_step(buffer[self._object_start:self._pos + 1])
+                    if step is not None:
+                        self.steps.append(step)
+                        completed.append(step)
+                    self._object_start = None
+                elif self._depth == 0:
+                    self.done = True
+            self._pos += 1
+        return completed
+
+def _strip_trailing_comma(out):
+    while out and out[-1].isspace():
+        out.pop()
+    if out and out[-1] == ",":
+        out.pop()
+
+def repair_json(text):
+    """
+    Best-effort fix of common LLM JSON defects.
+
+    Handles text around the JSON value, smart and single quotes, raw newlines
+    in strings, // and /* */ comments, Python literals (True/False/None),
+    unquoted keys, trailing commas and output cut off before the closing
+    brackets. The result may still be invalid; callers must parse it.
+    """
+    text = text.translate(_SMART_QUOTES)
+    starts = [index for index in (text.find("["), text.find("{")) if index >= 0]
+    if not starts:
+        return text
+
+    out = []
+    stack = []
+    i = min(starts)
+    n = len(text)
+    while i < n:
+        char = text[i]
+        if char in "\"'":
+            quote, j, chars = char, i + 1, []
+            while j < n and text[j] != quote:
+                if text[j] == "\\" and j + 1 < n:
+                    # \' is not a JSON escape
+                    chars.append("'" if text[j + 1] == "'" else text[j:j + 2])
+                    j += 2
+                    continue
+                chars.append({'"': '\\"', "\n": "\\n", "\t": "\\t"}.get(text[j], text[j]))
+                j += 1
+            out.append('"' + "".join(chars) + '"')
+            i = j + 1
+            continue
+        if char == "/" and text[i + 1:i + 2] == "/":
+            end = text.find("\n", i)
+            i = n if end < 0 else end
+            continue
+        if char == "/" and text[i + 1:i + 2] == "*":
+            end = text.find("*/", i + 2)
+            i = n if end < 0 else end + 2
+            continue
+        if char in "[{":
+            stack.append(char)
+            out.append(char)
+        elif char in "]}":
+            _strip_trailing_comma(out)
+            if stack:
+                out.append(_CLOSERS[stack.pop()])
+            if not stack:
+                # Anything after the top-level value is prose
+                break
+        elif char.isdigit() or char == "-":
+            j = i + 1
+            while j < n and (text[j].isdigit() or text[j] in ".eE+-"):
+                j += 1
+            out.append(text[i:j])
+            i = j
+            continue
+        elif char.isalpha() or char == "_":
+            j = i
+            while j < n and (text[j].isalnum() or text[j] == "_"):
+                j += 1
+            word = text[i:j]
+            rest = text[j:].lstrip()
+            if word in _LITERALS and not rest.startswith(":"):
+                out.append(_LITERALS[word])
+            else:
+                out.append(json.dumps(word))
+            i = j
+            continue
+        else:
+            out.append(char)
+        i += 1
+
+    while stack:
+        _strip_trailing_comma(out)
+        if out and out[-1] == ":":
+            out.append("null")
+        out.append(_CLOSERS[stack.pop()])
+    return "".join(out)
+
+def _strip_fences(content):
+    content = content.strip()
+    if content.startswith("```json"):
+        content = content[7:]
+    if content.startswith("```"):
+        content = content[3:]
+    if content.endswith("```"):
+        content = content[:-3]
+    return content.strip()
+
+def _steps(items):
+    # Bare strings or numbers are not steps; objects are left for the executor to validate
+    steps = [item for item in items if isinstance(item, dict)]
+    if len(steps) < len(items):
+        logger.warning(f"Dropped {len(items) - len(steps)} plan elements that are not step objects")
+    if items and not steps:
+        raise ValueError("Plan holds no step objects")
+    return steps
+
+def _as_plan(value):
+    if isinstance(value, list):
+        return _steps(value)
+    if isinstance(value, dict):
+        if "tool" in value:
+            return [value]
+        for key in ("plan", "steps"):
+            if isinstance(value.get(key), list):
+                return _steps(value[key])
+    raise ValueError(f"Plan is not a list of steps, got {type(value).__name__}")
+
+def parse_plan_text(content):
+    """
+    Parse planner output into a list of steps.
+
+    Tries, in order: strict JSON (after removing markdown fences), repaired
+    JSON, and salvaging the complete step objects of a truncated array.
+
+    Returns:
+        tuple: (plan, repaired) where repaired is True if strict parsing failed
+
+    Raises:
+        ValueError: If no plan could be recovered
+    """
+    try:
+        return _as_plan(json.loads(_strip_fences(content))), False
+    except (json.JSONDecodeError, ValueError):
+        pass
+
+    try:
+        return _as_plan(json.loads(repair_json(content))), True
+    except (json.JSONDecodeError, ValueError):
+        pass
+
+    parser = IncrementalPlanParser()
+    parser.feed(content)
+    if parser.steps:
+        logger.warning(f"Salvaged {len(parser.steps)} complete steps from malformed plan")
+        return parser.steps, True
+    raise ValueError("No plan steps could be parsed from the response")
@@ -0,0 +1,234 @@
+import hashlib
+import logging
+import re
+import threading
+from functools import lru_cache
+
+from agent.prompts import PLANNER_PROMPT, RESPONDER_PROMPT
+from agent.steps import TRUNCATION_MARKER, StepRecord
+from core.cache import LRUCache
+from core.config import settings
+from core.metrics import PROMPT_TOKENS, PROMPT_COMPRESSIONS
+
+logger = logging.getLogger(__name__)
+
+NO_MEMORY_CONTEXT = "No previous context available"
+
+_encoding = None
+_encoding_loaded = False
+_encoding_lock = threading.Lock()
+
+# Fold state of history prefixes, keyed by a hash chain over the entries, so
+# a longer history only folds the entries added since the last summary
+_summaries = LRUCache(max_entries=1024)
+
+def _get_encoding():
+    """tiktoken encoding for PROMPT_TOKENIZER_ENCODING, or None to use the estimate."""
+    global _encoding, _encoding_loaded
+    if not _encoding_loaded:
+        with _encoding_lock:
+            if not _encoding_loaded:
+                try:
+                    import tiktoken
+                    _encoding = tiktoken.get_encoding(settings.PROMPT_TOKENIZER_ENCODING)
+                except Exception as e:
+                    # tiktoken downloads encodings on first use; offline we estimate instead
+                    logger.warning(f"Tokenizer unavailable, estimating token counts: {e}")
+                _encoding_loaded = True
+    return _encoding
+
+def _count(text):
+    encoding = _get_encoding()
+    if encoding is None:
+        # Roughly 4 characters per token for English text
+        return (len(text) + 3) // 4
+    return len(encoding.encode(text, disallowed_special=()))
+
+@lru_cache(maxsize=settings.PROMPT_TOKEN_CACHE_SIZE)
+def count_tokens(text):
+    """Token count of text; cached because templates and snippets repeat across requests."""
+    return _count(text)
+
+def truncate_tokens(text, max_tokens):
+    """Cut text to at most max_tokens tokens, marking the cut."""
+    if count_tokens(text) <= max_tokens:
+        return text
+    keep = max(0, max_tokens - count_tokens(TRUNCATION_MARKER))
+    encoding = _get_encoding()
+    if encoding is None:
+        return text[:keep * 4] + TRUNCATION_MARKER
+    return encoding.decode(encoding.encode(text, disallowed_special=())[:keep]) + TRUNCATION_MARKER
+
+def _fill(template, **values):
+    # One pass, so placeholders inside the inserted values are left alone
+    # (and curly braces in them cannot break formatting)
+    return re.sub(r"\{(\w+)\}", lambda m: values.get(m.group(1), m.group(0)), template)
+
+def _normalize(text):
+    return re.sub(r"\s+", " ", text).strip().lower()
+
+def compress_memories(snippets, budget, max_snippet_tokens, stage="planner"):
+    """
+    Deduplicate, truncate and fit memory snippets into budget tokens.
+
+    Snippets are kept in order (most relevant first); exact duplicates after
+    whitespace/case normalization and snippets contained in an earlier one
+    are dropped, each snippet is cut to max_snippet_tokens, and snippets that
+    no longer fit are dropped.
+
+    Returns:
+        list: Snippets to include
+    """
+    kept = []
+    seen = []
+    used = 0
+    for snippet in snippets:
+        normalized = _normalize(snippet)
+        if not normalized or any(normalized in previous for previous in seen):
+            PROMPT_COMPRESSIONS.inc(stage=stage, section="memory", action="deduplicated")
+            continue
+        seen.append(normalized)
+
+        text = truncate_tokens(snippet.strip(), max_snippet_tokens)
+        if text != snippet.strip():
+            PROMPT_COMPRESSIONS.inc(stage=stage, section="memory", action="truncated")
+        # +1 for the newline joining snippets
+        tokens = count_tokens(text) + 1
+        if used + tokens > budget:
+            PROMPT_COMPRESSIONS.inc(stage=stage, section="memory", action="dropped")
+            continue
+        kept.append(text)
+        used += tokens
+    return kept
+
+def _fold_entry(state, entry):
+    if isinstance(entry, StepRecord):
+        tool, failed = entry.tool, entry.status == "error"
+    else:
+        tool, _, result = str(entry).partition(" → ")
+        failed = "error" in result[:80].lower()
+    count, errors = state.get(tool, (0, 0))
+    state[tool] = (count + 1, errors + int(failed))
+    return state
+
+def summarize_history(entries):
+    """
+    One-line extractive summary of history entries (step records).
+
+    Folding is incremental: the state for every prefix is cached under a hash
+    chain of its entries, so summarizing a history that grew by one step only
+    folds that step.
+    """
+    chain = []
+    key = ""
+    for entry in entries:
+        key = hashlib.sha1(f"{key}\x00{entry}".encode("utf-8")).hexdigest()
+        chain.append(key)
+
+    start, state = 0, {}
+    for index in range(len(chain) - 1, -1, -1):
+        cached = _summaries.get(chain[index])
+        if cached is not None:
+            start, state = index + 1, dict(cached)
+            break
+
+    for index in range(start, len(entries)):
+        state = _fold_entry(state, entries[index])
+        _summaries.set(chain[index], dict(state))
+
+    parts = []
+    for tool, (count, errors) in state.items():
+        part = f"{tool} ×{count}"
+        if errors:
+            part += f" ({errors} failed)"
+        parts.append(part)
+    return f"Earlier steps ({len(entries)}, summarized): " + ", ".join(parts)
+
+def fit_history(history, budget, max_entry_tokens, stage="responder"):
+    """
+    Fit history into budget tokens, newest entries first.
+
+    Recent entries are kept verbatim (each cut to max_entry_tokens); once the
+    budget runs out, the remaining older entries are replaced by a summary.
+
+    Returns:
+        list: Lines to include, in chronological order
+    """
+    recent = []
+    used = 0
+    older = len(history)
+    for index in range(len(history) - 1, -1, -1):
+        entry = history[index].to_prompt() if isinstance(history[index], StepRecord) else str(history[index])
+        text = truncate_tokens(entry, max_entry_tokens)
+        tokens = count_tokens(text) + 1
+        # Leave room for the summary line of anything older
+        reserve = 40 if index > 0 else 0
+        if used + tokens + reserve > budget:
+            break
+        if text != entry:
+            PROMPT_COMPRESSIONS.inc(stage=stage, section="history", action="truncated")
+        recent.append(text)
+        used += tokens
+        older = index
+
+    lines = []
+    if older:
+        summary = truncate_tokens(summarize_history(history[:older]), max(budget - used, 0))
+        if summary.strip():
+            lines.append(summary)
+        PROMPT_COMPRESSIONS.inc(older, stage=stage, section="history", action="summarized")
+    lines.extend(reversed(recent))
+    return lines
+
+def _report(stage, prompt, budget, sections):
+    # Whole prompts are unique per request, so they bypass the token cache
+    tokens = _count(prompt)
+    PROMPT_TOKENS.observe(tokens, stage=stage)
+    logger.debug(f"{stage} prompt: {tokens}/{budget} tokens {sections}")
+    if tokens > budget:
+        logger.warning(f"{stage} prompt is {tokens} tokens, over its {budget} token budget")
+    return tokens
+
+def build_planner_prompt(user_input, memories):
+    """
+    Planner prompt with memory context fitted to PLANNER_PROMPT_TOKEN_BUDGET.
+
+    Args:
+        user_input (str): The user's request
+        memories (list): Memory snippets, most relevant first
+
+    Returns:
+        str: The prompt
+    """
+    budget = settings.PLANNER_PROMPT_TOKEN_BUDGET
+    fixed = count_tokens(PLANNER_PROMPT) + _count(user_input)
+
+    snippets = compress_memories(
+        memories, budget - fixed, settings.PROMPT_MEMORY_SNIPPET_TOKENS, stage="planner"
+    )
+    memory_context = "\n".join(snippets) or NO_MEMORY_CONTEXT
+    prompt = _fill(PLANNER_PROMPT, input=user_input, memory=memory_context)
+
+    _report("planner", prompt, budget, {"fixed": fixed, "memories": len(snippets)})
+    return prompt
+
+def build_responder_prompt(user_input, history):
+    """
+    Responder prompt with the execution history fitted to RESPONDER_PROMPT_TOKEN_BUDGET.
+
+    Args:
+        user_input (str): The user's request
+        history (list): Step records in execution order
+
+    Returns:
+        str: The prompt
+    """
+    budget = settings.RESPONDER_PROMPT_TOKEN_BUDGET
+    template = _fill(RESPONDER_PROMPT, input=user_input or "")
+    fixed = _count(template) + 1
+
+    lines = fit_history(history, budget - fixed, settings.PROMPT_HISTORY_ENTRY_TOKENS, stage="responder")
+    prompt = template + "\n" + "\n".join(lines)
+
+    _report("responder", prompt, budget, {"fixed": fixed, "history_lines": len(lines)})
+    return prompt
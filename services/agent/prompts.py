@@ -20,6 +20,8 @@ Rules (VERY IMPORTANT):
 
 3. Each step must have: "tool" (string) and "params" (object)
 
+4. If a step needs the result of earlier steps, add "depends_on" with their 0-based indices
+
 
 
 Allowed tools and their parameters:
@@ -38,12 +40,20 @@ Example response:
 
 [{"tool": "slack.post", "params": {"channel": "agent_channal", "text": "Hello"}}]
 
+[{"tool": "email.read", "params": {"folder": "inbox"}}, {"tool": "jira.create", "params": {"project": "KAN", "summary": "Follow up", "description": "From email"}, "depends_on": [0]}]
+
 
 
 IMPORTANT: Always use channel "agent_channal" for Slack messages. Never use "#general".
 
 
 
+Context from previous actions:
+
+{memory}
+
+
+
 User request:
 
 {input}
@@ -0,0 +1,73 @@
+import hashlib
+import json
+import logging
+import threading
+
+from agent.steps import StepRecord
+from core.cache import LRUCache
+from core.config import settings
+
+logger = logging.getLogger(__name__)
+
+_response_cache = None
+_response_cache_lock = threading.Lock()
+
+class ResponseCache:
+    """
+    Cache of final responses keyed by the request, the plan and the tool results.
+
+    The responder prompt holds the user's request and the tool results, so
+    the same request answered by the same steps with the same results gets
+    the same summary and the responder LLM only needs to run once for them.
+    Steps are keyed by their full results, not the truncated rendering.
+
+    Args:
+        backend: LRUCache holding the responses
+    """
+
+    def __init__(self, backend):
+        self.backend = backend
+
+    @staticmethod
+    def _entry(entry):
+        if isinstance(entry, StepRecord):
+            return [entry.tool, entry.params, entry.status, entry.full_result]
+        return str(entry)
+
+    @classmethod
+    def _key(cls, user_input, plan, history):
+        payload = json.dumps(
+            [user_input, plan, [cls._entry(entry) for entry in history]],
+            sort_keys=True, default=str
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, user_input, plan, history):
+        return self.backend.get(self._key(user_input, plan, history))
+
+    def set(self, user_input, plan, history, response):
+        self.backend.set(self._key(user_input, plan, history), response)
+
+    def clear(self):
+        self.backend.clear()
+
+    def stats(self):
+        return self.backend.stats()
+
+def get_response_cache():
+    """Return the process-wide response cache, or None if RESPONSE_CACHE_MAX_ENTRIES is 0."""
+    global _response_cache
+
+    if settings.RESPONSE_CACHE_MAX_ENTRIES <= 0:
+        return None
+
+    if _response_cache is None:
+        with _response_cache_lock:
+            if _response_cache is None:
+                _response_cache = ResponseCache(LRUCache(
+                    max_entries=settings.RESPONSE_CACHE_MAX_ENTRIES,
+                    ttl_seconds=settings.RESPONSE_CACHE_TTL_SECONDS
+                ))
+                logger.info("Response cache enabled")
+
+    return _response_cache
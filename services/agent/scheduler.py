@@ -0,0 +1,71 @@
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Tools whose output later steps may consume (e.g. "read email, then create a
+# Jira ticket from it"). Steps after one of these wait for it to finish.
+SOURCE_TOOLS = {"email.read"}
+
+def _step(plan, index):
+    # Malformed steps are rejected by the executor; here they have no dependencies
+    step = plan[index]
+    return step if isinstance(step, dict) else {}
+
+def step_dependencies(plan, index, unordered_tools=()):
+    """
+    Return the indices of the earlier steps that plan[index] depends on.
+
+    The planner may declare dependencies explicitly with "depends_on": [indices].
+    Otherwise they are inferred: a step waits for every earlier source tool and
+    for the previous step using the same tool, so e.g. two Slack posts keep
+    their order. Tools in unordered_tools skip the same-tool ordering, e.g.
+    tools submitted through a bulk API that preserves request order itself.
+    """
+    step = _step(plan, index)
+
+    if "depends_on" in step:
+        declared = step["depends_on"]
+        if isinstance(declared, int):
+            declared = [declared]
+        dependencies = set()
+        for dep in declared or []:
+            if isinstance(dep, int) and 0 <= dep < index:
+                dependencies.add(dep)
+            else:
+                logger.warning(f"Ignoring invalid dependency {dep!r} for step {index}")
+        return dependencies
+
+    dependencies = set()
+    same_tool = None
+    for previous in range(index):
+        tool = _step(plan, previous).get("tool")
+        if tool in SOURCE_TOOLS:
+            dependencies.add(previous)
+        if tool == step.get("tool"):
+            same_tool = previous
+    if same_tool is not None and step.get("tool") not in unordered_tools:
+        dependencies.add(same_tool)
+    return dependencies
+
+def build_waves(plan, start=0, unordered_tools=()):
+    """
+    Group plan[start:] into waves of steps that can run concurrently.
+
+    Each wave only contains steps whose dependencies finished in an earlier
+    wave (or before start). Indices within a wave are sorted, so merging
+    results wave by wave in index order is deterministic.
+
+    Returns:
+        list: List of waves, each a list of step indices
+    """
+    level = {}
+    for index in range(start, len(plan)):
+        dependencies = [
+            dep for dep in step_dependencies(plan, index, unordered_tools) if dep >= start
+        ]
+        level[index] = max((level[dep] + 1 for dep in dependencies), default=0)
+
+    waves = {}
+    for index, wave in level.items():
+        waves.setdefault(wave, []).append(index)
+    return [sorted(waves[wave]) for wave in sorted(waves)]
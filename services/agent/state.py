@@ -1,6 +1,10 @@
 import logging
 
-from typing import TypedDict, List, Any
+import operator
+
+from typing import TypedDict, List, Any, Optional, Annotated
+
+from agent.steps import StepRecord
 
 
 class AgentState(TypedDict):
@@ -8,7 +12,12 @@ class AgentState(TypedDict):
     plan: List[dict]
     current_step: int
     tool_result: Any
-    history: List[str]
+    # Nodes return only the records they add; the reducer appends them
+    history: Annotated[List[StepRecord], operator.add]
+    final_response: str
+    # Checkpointed runs only: the run's id and, when resuming, the node to start at
+    run_id: Optional[str]
+    resume_from: Optional[str]
 
 
 log = logging.getLogger(__name__)
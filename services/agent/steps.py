@@ -0,0 +1,111 @@
+import uuid
+
+from core.cache import LRUCache
+from core.config import settings
+
+# Appended to truncated step results and prompt sections alike
+TRUNCATION_MARKER = " …"
+ERROR_PREFIXES = ("Error", "Tool not found", "Parameter error")
+
+# Full payloads of truncated results, so a caller holding a record can still
+# fetch them while they are recent; bounded so requests do not retain them
+_payloads = LRUCache(max_entries=max(settings.STEP_PAYLOAD_CACHE_ENTRIES, 1))
+
+def _status(result):
+    if isinstance(result, dict) and "error" in result:
+        return "error"
+    if isinstance(result, str) and result.startswith(ERROR_PREFIXES):
+        return "error"
+    return "ok"
+
+def get_payload(ref):
+    """Full result of a truncated step, or None once it was evicted."""
+    return _payloads.get(ref) if ref else None
+
+class StepRecord:
+    """
+    One executed plan step in the run history.
+
+    Results longer than STEP_RESULT_MAX_CHARS when rendered are kept as a
+    truncated string; the full payload is kept in a bounded in-process store
+    under result_ref. Prompt, memory and JSON forms are built on demand from
+    the fields rather than stored.
+
+    Args:
+        tool (str): Tool name
+        params (dict): Step params as planned
+        status (str): "ok" or "error"
+        duration (float): Tool call latency in seconds; bulk steps share their call's latency
+        result: The result, or its truncated rendering
+        truncated (bool): Whether result was cut
+        result_ref (str): Key of the full payload for get_payload(), if it was kept
+    """
+
+    __slots__ = ("tool", "params", "status", "duration", "result", "truncated", "result_ref")
+
+    def __init__(self, tool, params=None, status="ok", duration=0.0, result=None,
+                 truncated=False, result_ref=None):
+        self.tool = tool
+        self.params = params or {}
+        self.status = status
+        self.duration = duration
+        self.result = result
+        self.truncated = truncated
+        self.result_ref = result_ref
+
+    @classmethod
+    def from_result(cls, tool, params, result, duration=0.0, status=None):
+        """Record a tool result, truncating it if it is too large to keep."""
+        status = status or _status(result)
+        limit = settings.STEP_RESULT_MAX_CHARS
+        text = result if isinstance(result, str) else None
+        if text is None and isinstance(result, (dict, list, tuple)):
+            text = str(result)
+        if text is None or len(text) <= limit:
+            return cls(tool, params, status, duration, result)
+
+        result_ref = None
+        if settings.STEP_PAYLOAD_CACHE_ENTRIES > 0:
+            result_ref = uuid.uuid4().hex
+            _payloads.set(result_ref, result)
+        return cls(tool, params, status, duration, text[:limit], True, result_ref)
+
+    @property
+    def full_result(self):
+        """The untruncated result while it is still stored, otherwise the kept result."""
+        if self.truncated:
+            payload = get_payload(self.result_ref)
+            if payload is not None:
+                return payload
+        return self.result
+
+    def __str__(self):
+        suffix = TRUNCATION_MARKER if self.truncated else ""
+        return f"{self.tool} → {self.result}{suffix}"
+
+    def __repr__(self):
+        return f"StepRecord({self.tool!r}, status={self.status!r}, duration={self.duration:.3f})"
+
+    def to_prompt(self):
+        return str(self)
+
+    def to_memory(self):
+        return str(self)
+
+    def to_dict(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(**{name: data.get(name) for name in cls.__slots__ if name in data})
+
+def load_history(entries):
+    """History from its JSON form; plain "tool → result" strings are kept as they are."""
+    return [StepRecord.from_dict(entry) if isinstance(entry, dict) else entry for entry in entries]
+
+def history_text(history):
+    """History as "tool → result" lines, e.g. for API responses."""
+    return [str(entry) for entry in history]
+
+def memory_text(history):
+    return f"User action: {[entry.to_memory() if isinstance(entry, StepRecord) else entry for entry in history]}"
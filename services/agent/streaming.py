@@ -0,0 +1,54 @@
+import json
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+def format_sse(event, data):
+    """Format one Server-Sent Event frame."""
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+async def stream_run_events(graph, initial_state):
+    """
+    Run the graph and yield SSE frames as it progresses.
+
+    Events:
+        start        emitted immediately, before any node runs
+        plan         planner (or intent fast path) output
+        tool_result  one per executed plan step, in plan order
+        token        responder LLM output, token by token
+        final        the complete final response
+        done         total duration of the run
+        error        the run failed
+    """
+    started = time.perf_counter()
+    yield format_sse("start", {"user_input": initial_state["user_input"]})
+
+    history_seen = 0
+    try:
+        async for mode, chunk in graph.astream(initial_state, stream_mode=["updates", "messages"]):
+            if mode == "messages":
+                message, metadata = chunk
+                if metadata.get("langgraph_node") == "responder" and message.content:
+                    yield format_sse("token", {"content": message.content})
+                continue
+
+            for node, update in chunk.items():
+                if not update:
+                    continue
+                if node in ("router", "planner"):
+                    yield format_sse("plan", {"plan": update.get("plan", [])})
+                if node in ("planner", "executor"):
+                    # A streaming planner reports the steps it already executed;
+                    # updates carry only the records a node added
+                    for entry in update.get("history", []):
+                        yield format_sse("tool_result", {"step": history_seen, "result": str(entry)})
+                        history_seen += 1
+                elif node == "responder":
+                    yield format_sse("final", {"final_response": update.get("final_response")})
+    except Exception as e:
+        logger.error(f"Streaming run failed: {e}")
+        yield format_sse("error", {"message": str(e)})
+        return
+
+    yield format_sse("done", {"duration_ms": round((time.perf_counter() - started) * 1000, 1)})
@@ -0,0 +1,299 @@
+import asyncio
+import inspect
+import logging
+import threading
+from contextlib import asynccontextmanager, contextmanager
+
+from core.config import settings
+
+logger = logging.getLogger(__name__)
+
+class StepValidationError(ValueError):
+    """Raised when a plan step does not match its tool's parameter schema."""
+
+class Param:
+    """
+    Declared parameter of a tool.
+
+    Args:
+        type (type): Expected Python type; str values are coerced from scalars
+        required (bool): Whether the step must provide it
+    """
+
+    def __init__(self, type=str, required=False):
+        self.type = type
+        self.required = required
+
+    def validate(self, name, value):
+        if isinstance(value, self.type):
+            return value
+        if self.type is str and isinstance(value, (int, float, bool)):
+            return str(value)
+        raise StepValidationError(
+            f"Parameter '{name}' must be {self.type.__name__}, got {type(value).__name__}"
+        )
+
+class ToolSpec:
+    """
+    A registered tool: where its callable lives, its parameter schema, the
+    aliases accepted for parameter names and normalizers applied before the call.
+
+    Args:
+        name (str): Tool name used in plans, e.g. "slack.post"
+        module (str): Module path of the implementation
+        function (str): Function name; an async variant named "a<function>" is used if present
+        params (dict): Parameter name -> Param
+        aliases (dict): Alternative parameter name -> declared parameter name
+        normalizers (list): Callables taking and returning the params dict
+        batch_function (str): Optional function in the same module taking a list
+            of kwargs dicts and returning one result per item, in order
+    """
+
+    def __init__(self, name, module, function, params=None, aliases=None, normalizers=None,
+                 batch_function=None):
+        self.name = name
+        self.module = module
+        self.function_name = function
+        self.batch_function_name = batch_function
+        self.batch_function = None
+        self.params = params or {}
+        self.aliases = aliases or {}
+        self.normalizers = list(normalizers or [])
+        self.function = None
+        self.async_function = None
+        self.max_concurrency = None
+        self._slots = None
+        self._required = frozenset(n for n, p in self.params.items() if p.required)
+
+    @property
+    def resolved(self):
+        return self.function is not None
+
+    def resolve(self):
+        """Import the implementation and check the schema against its signature."""
+        module = __import__(self.module, fromlist=[self.function_name])
+        function = getattr(module, self.function_name)
+
+        signature = inspect.signature(function)
+        accepts_kwargs = any(p.kind is p.VAR_KEYWORD for p in signature.parameters.values())
+        unknown = [n for n in self.params if n not in signature.parameters and not accepts_kwargs]
+        if unknown:
+            raise TypeError(f"{self.name}: declared parameters {unknown} are not accepted by {self.function_name}")
+        undeclared = [
+            n for n, p in signature.parameters.items()
+            if p.default is p.empty and p.kind in (p.POSITIONAL_OR_KEYWORD, p.KEYWORD_ONLY)
+            and n not in self._required
+        ]
+        if undeclared:
+            raise TypeError(f"{self.name}: {self.function_name} requires undeclared parameters {undeclared}")
+
+        self.function = function
+        self.async_function = getattr(module, f"a{self.function_name}", None)
+        if self.batch_function_name:
+            self.batch_function = getattr(module, self.batch_function_name)
+        return self
+
+    def limit(self, max_concurrency):
+        """Cap how many calls of this tool run at once across the process; None removes the cap."""
+        self.max_concurrency = max_concurrency
+        self._slots = threading.BoundedSemaphore(max_concurrency) if max_concurrency else None
+        return self
+
+    @contextmanager
+    def slot(self):
+        """Hold one of the tool's concurrency slots for the duration of a call."""
+        slots = self._slots
+        if slots is None:
+            yield
+            return
+        slots.acquire()
+        try:
+            yield
+        finally:
+            slots.release()
+
+    @asynccontextmanager
+    async def aslot(self):
+        """
+        Async variant of slot(), sharing the same slots as sync callers.
+
+        Waits by polling on the event loop rather than blocking a worker
+        thread: waiters parked in the default executor could starve the slot
+        holder's own asyncio.to_thread call. A waiter cancelled while polling
+        holds no slot, so nothing leaks.
+        """
+        slots = self._slots
+        if slots is None:
+            yield
+            return
+        delay = 0.005
+        while not slots.acquire(blocking=False):
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, 0.05)
+        try:
+            yield
+        finally:
+            slots.release()
+
+    def prepare(self, params):
+        """
+        Return validated keyword arguments for the tool, without side effects.
+
+        Raises:
+            StepValidationError: If the parameters do not match the schema
+        """
+        if params is None:
+            params = {}
+        if not isinstance(params, dict):
+            raise StepValidationError(f"params must be an object, got {type(params).__name__}")
+
+        kwargs = {}
+        for name, value in params.items():
+            canonical = self.aliases.get(name, name)
+            # An explicit canonical name wins over an alias
+            if canonical != name and canonical in params:
+                continue
+            kwargs[canonical] = value
+
+        for normalize in self.normalizers:
+            kwargs = normalize(kwargs)
+
+        unknown = [name for name in kwargs if name not in self.params]
+        if unknown:
+            raise StepValidationError(f"Unknown parameters {unknown}; expected {sorted(self.params)}")
+        missing = [name for name in self._required if name not in kwargs]
+        if missing:
+            raise StepValidationError(f"Missing required parameters {sorted(missing)}")
+
+        return {name: self.params[name].validate(name, value) for name, value in kwargs.items()}
+
+class ToolRegistry:
+    """Tools available to the executor, keyed by tool name."""
+
+    def __init__(self):
+        self._tools = {}
+        self._lock = threading.Lock()
+
+    def register(self, spec, resolve=False):
+        if resolve:
+            spec.resolve()
+        with self._lock:
+            self._tools[spec.name] = spec
+        return spec
+
+    def get(self, name, default=None):
+        """Return the spec for a tool, resolving it on first use."""
+        spec = self._tools.get(name)
+        if spec is None:
+            return default
+        if not spec.resolved:
+            with self._lock:
+                if not spec.resolved:
+                    spec.resolve()
+        return spec
+
+    def resolve_all(self):
+        """Resolve and validate every registered tool, e.g. at startup."""
+        for name in list(self._tools):
+            self.get(name)
+        logger.info(f"Resolved {len(self._tools)} tools: {sorted(self._tools)}")
+        return sorted(self._tools)
+
+    def set_concurrency_limits(self, limits):
+        """Apply {tool name: max concurrent calls}; unknown tool names are logged and skipped."""
+        for name, max_concurrency in limits.items():
+            spec = self._tools.get(name)
+            if spec is None:
+                logger.warning(f"Ignoring concurrency limit for unknown tool {name}")
+                continue
+            spec.limit(max_concurrency)
+
+    def prepare(self, step):
+        """
+        Validate a plan step and return (spec, kwargs) without running it.
+
+        Raises:
+            StepValidationError: If the step is malformed or the tool is unknown
+        """
+        if not isinstance(step, dict) or not isinstance(step.get("tool"), str):
+            raise StepValidationError(f"Malformed step: {step!r}")
+        spec = self.get(step["tool"])
+        if spec is None:
+            raise StepValidationError(f"Tool not found: {step['tool']}")
+        return spec, spec.prepare(step.get("params", {}))
+
+    def __contains__(self, name):
+        return name in self._tools
+
+    def __iter__(self):
+        return iter(list(self._tools))
+
+    def __len__(self):
+        return len(self._tools)
+
+def _normalize_slack_channel(params):
+    # Normalize channel: remove # and default to agent_channal
+    channel = str(params.get("channel") or "agent_channal").replace("#", "")
+    # Override with agent_channal if general or empty
+    if channel == "general" or not channel:
+        channel = "agent_channal"
+    params["channel"] = channel
+    return params
+
+TOOL_REGISTRY = ToolRegistry()
+
+TOOL_REGISTRY.register(ToolSpec(
+    "jira.create", "integrations.jira.jira_tools", "create_jira_ticket",
+    params={
+        "summary": Param(str, required=True),
+        "description": Param(str, required=True),
+        "project_key": Param(str),
+    },
+    aliases={"project": "project_key", "title": "summary"},
+    batch_function="create_jira_tickets_bulk",
+))
+TOOL_REGISTRY.register(ToolSpec(
+    "slack.post", "integrations.slack.slack_tools", "post_slack_message",
+    params={
+        "channel": Param(str),
+        "text": Param(str),
+    },
+    aliases={"message": "text"},
+    normalizers=[_normalize_slack_channel],
+))
+TOOL_REGISTRY.register(ToolSpec(
+    "email.read", "integrations.email.email_tools", "read_email",
+    params={
+        "folder": Param(str),
+    },
+))
+TOOL_REGISTRY.register(ToolSpec(
+    "calendar.create", "integrations.calendar.calendar_tools", "create_calendar_event",
+    params={
+        "title": Param(str),
+        "start_time": Param(str),
+        "end_time": Param(str),
+    },
+))
+
+def parse_concurrency_limits(value):
+    """Parse "jira.create=2,slack.post=4" into {"jira.create": 2, "slack.post": 4}."""
+    limits = {}
+    for item in (value or "").split(","):
+        if not item.strip():
+            continue
+        name, _, limit = item.partition("=")
+        try:
+            limits[name.strip()] = int(limit)
+        except ValueError:
+            logger.warning(f"Ignoring invalid tool concurrency limit {item!r}")
+    return limits
+
+TOOL_REGISTRY.set_concurrency_limits(parse_concurrency_limits(settings.TOOL_CONCURRENCY_LIMITS))
+
+def register_tool(name, module, function, params=None, aliases=None, normalizers=None,
+                  batch_function=None):
+    """Register an additional tool without touching the executor."""
+    return TOOL_REGISTRY.register(
+        ToolSpec(name, module, function, params, aliases, normalizers, batch_function)
+    )
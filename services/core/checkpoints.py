@@ -0,0 +1,200 @@
+import json
+import logging
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+from core.config import settings
+
+log = logging.getLogger(__name__)
+
+_store = None
+_store_lock = threading.Lock()
+
+class RunActive(RuntimeError):
+    """Raised when starting a run that is already executing in this process."""
+
+class CheckpointStore:
+    """
+    Append-only log of graph state changes in a local SQLite file.
+
+    Each completed node appends one row holding only what it changed: its
+    state update, whose history holds just the entries the node appended.
+    Replaying the rows over the initial state rebuilds the state after the
+    last completed node.
+
+    Run statuses: running -> completed | failed. A run left "running" by a
+    process that died can be resumed like a failed one. Runs executing in
+    this process are tracked separately, so a run cannot be started twice
+    while it is live.
+    """
+
+    def __init__(self, path):
+        self.path = str(path)
+        Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._active = set()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        # In WAL mode commits are not fsynced; a checkpoint survives a process
+        # crash, only an OS crash can lose the last few
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS runs ("
+            "id TEXT PRIMARY KEY, status TEXT NOT NULL, user_input TEXT NOT NULL, "
+            "created_at REAL NOT NULL, updated_at REAL NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS checkpoints ("
+            "seq INTEGER PRIMARY KEY AUTOINCREMENT, run_id TEXT NOT NULL, node TEXT NOT NULL, "
+            "diff TEXT NOT NULL, created_at REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS checkpoints_run ON checkpoints (run_id, seq)")
+        self._conn.commit()
+
+    def start(self, run_id, user_input):
+        """
+        Record a run as executing; a run that already exists keeps its checkpoints.
+
+        Raises:
+            RunActive: If the run is already executing in this process
+        """
+        now = time.time()
+        with self._lock:
+            if run_id in self._active:
+                raise RunActive(f"Run {run_id} is already running")
+            self._active.add(run_id)
+            self._conn.execute(
+                "INSERT INTO runs (id, status, user_input, created_at, updated_at) "
+                "VALUES (?, 'running', ?, ?, ?) "
+                "ON CONFLICT(id) DO UPDATE SET status = 'running', updated_at = excluded.updated_at",
+                (run_id, user_input, now, now)
+            )
+            self._conn.commit()
+
+    def append(self, run_id, node, diff):
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO checkpoints (run_id, node, diff, created_at) VALUES (?, ?, ?, ?)",
+                (run_id, node, json.dumps(diff, default=_encode), time.time())
+            )
+            self._conn.commit()
+
+    def finish(self, run_id, status):
+        with self._lock:
+            self._active.discard(run_id)
+            self._conn.execute(
+                "UPDATE runs SET status = ?, updated_at = ? WHERE id = ?",
+                (status, time.time(), run_id)
+            )
+            self._conn.commit()
+
+    def get(self, run_id):
+        """Run metadata plus the node of its last checkpoint, or None."""
+        with self._lock:
+            run = self._conn.execute("SELECT * FROM runs WHERE id = ?", (run_id,)).fetchone()
+            if run is None:
+                return None
+            last = self._conn.execute(
+                "SELECT node, COUNT(*) OVER () AS steps FROM checkpoints "
+                "WHERE run_id = ? ORDER BY seq DESC LIMIT 1",
+                (run_id,)
+            ).fetchone()
+        return {
+            "run_id": run["id"],
+            "status": run["status"],
+            "user_input": run["user_input"],
+            "created_at": run["created_at"],
+            "updated_at": run["updated_at"],
+            "active": run["id"] in self._active,
+            "last_node": last["node"] if last else None,
+            "checkpoints": last["steps"] if last else 0,
+        }
+
+    def load(self, run_id, initial_state):
+        """
+        Replay the checkpoints of a run over initial_state.
+
+        Returns:
+            tuple: (state, last_node), last_node None if nothing was checkpointed
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT node, diff FROM checkpoints WHERE run_id = ? ORDER BY seq", (run_id,)
+            ).fetchall()
+
+        state = dict(initial_state)
+        state["history"] = list(state.get("history", []))
+        last_node = None
+        for row in rows:
+            diff = json.loads(row["diff"])
+            state.update(diff.get("update", {}))
+            if "history" in diff:
+                state["history"] = state["history"][:diff["history_start"]] + diff["history"]
+            last_node = row["node"]
+        return state, last_node
+
+    def prune(self, max_age_seconds):
+        """Delete runs (and their checkpoints) not updated for max_age_seconds."""
+        cutoff = time.time() - max_age_seconds
+        with self._lock:
+            self._conn.execute(
+                "DELETE FROM checkpoints WHERE run_id IN (SELECT id FROM runs WHERE updated_at < ?)",
+                (cutoff,)
+            )
+            count = self._conn.execute("DELETE FROM runs WHERE updated_at < ?", (cutoff,)).rowcount
+            self._conn.commit()
+        return count
+
+    def counts(self):
+        with self._lock:
+            rows = self._conn.execute("SELECT status, COUNT(*) FROM runs GROUP BY status").fetchall()
+        return {status: count for status, count in rows}
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+def _encode(value):
+    # Objects such as history step records serialize themselves
+    to_dict = getattr(value, "to_dict", None)
+    return to_dict() if callable(to_dict) else str(value)
+
+def checkpoint_diff(update, history_start):
+    """
+    The part of a node update to checkpoint.
+
+    history is appended to by a reducer, so the update's history holds only
+    the node's new entries; history_start (the length before the node ran)
+    makes replaying a diff twice harmless.
+    """
+    diff = {"update": {key: value for key, value in update.items() if key != "history"}}
+    if update.get("history"):
+        diff["history_start"] = history_start
+        diff["history"] = list(update["history"])
+    return diff
+
+def get_checkpoint_store():
+    """Return the process-wide checkpoint store, or None if CHECKPOINT_ENABLED is off."""
+    global _store
+
+    if not settings.CHECKPOINT_ENABLED:
+        return None
+
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = CheckpointStore(settings.CHECKPOINT_DB_PATH)
+                log.info(f"Checkpointing runs to {settings.CHECKPOINT_DB_PATH}")
+
+    return _store
+
+def close_checkpoint_store():
+    global _store
+
+    with _store_lock:
+        if _store is not None:
+            _store.close()
+            _store = None
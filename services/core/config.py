@@ -1,22 +1,17 @@
 
 import os
 from pathlib import Path
-import requests
 from typing import Optional
 
 # Find the project root directory (where .env is located)
 project_root = Path(__file__).parent.parent.parent
 env_path = project_root / '.env'
 
-# Check if .env file exists
-if not env_path.exists():
-    raise FileNotFoundError(f'.env file not found at {env_path}')
-
-# Load environment variables from .env file
-from dotenv import load_dotenv
-load_dotenv(dotenv_path=env_path)
-
-# Environment variables are loaded from .env file
+# The only place .env is loaded; every other module reads settings from here.
+# Without a .env file the process environment is used as-is (e.g. in containers).
+if env_path.exists():
+    from dotenv import load_dotenv
+    load_dotenv(dotenv_path=env_path)
 
 def check_connection_stability(url: str, timeout: int = 5) -> bool:
     """
@@ -29,6 +24,9 @@ def check_connection_stability(url: str, timeout: int = 5) -> bool:
     Returns:
         bool: True if connection is stable, False otherwise
     """
+    # Imported here so loading settings does not pull in requests
+    import requests
+
     try:
         response = requests.get(url, timeout=timeout)
         if response.status_code == 200:
@@ -44,6 +42,90 @@ class Settings:
     OPENROUTER_BASE_URL = os.getenv("OPENROUTER_BASE_URL", "https://openrouter.ai/api/v1")
     MODEL_NAME = os.getenv("OPENROUTER_MODEL")
 
+    # LLM client pool configuration
+    LLM_MAX_CONNECTIONS = int(os.getenv("LLM_MAX_CONNECTIONS", "20"))
+    LLM_MAX_KEEPALIVE_CONNECTIONS = int(os.getenv("LLM_MAX_KEEPALIVE_CONNECTIONS", "10"))
+    LLM_KEEPALIVE_EXPIRY = float(os.getenv("LLM_KEEPALIVE_EXPIRY", "60"))
+    LLM_TIMEOUT = float(os.getenv("LLM_TIMEOUT", "60"))
+
+    # Agent execution mode: "async" runs the graph with ainvoke, "sync" with invoke
+    AGENT_EXECUTION_MODE = os.getenv("AGENT_EXECUTION_MODE", "async")
+
+    # Run independent plan steps concurrently instead of one step per graph hop
+    PARALLEL_EXECUTION = os.getenv("PARALLEL_EXECUTION", "false").lower() == "true"
+    EXECUTOR_MAX_WORKERS = int(os.getenv("EXECUTOR_MAX_WORKERS", "4"))
+    # Submit groups of steps for tools with a bulk API (e.g. jira.create) in one call
+    BULK_TOOL_EXECUTION = os.getenv("BULK_TOOL_EXECUTION", "true").lower() == "true"
+    # Stream the planner response and start steps before the whole plan is generated (async runs)
+    PLANNER_STREAMING = os.getenv("PLANNER_STREAMING", "false").lower() == "true"
+    # Max concurrent calls per tool across requests and jobs, e.g. "jira.create=2,slack.post=4"
+    TOOL_CONCURRENCY_LIMITS = os.getenv("TOOL_CONCURRENCY_LIMITS", "")
+
+    # Request deduplication for /run and /execute
+    IDEMPOTENCY_TTL_SECONDS = float(os.getenv("IDEMPOTENCY_TTL_SECONDS", "300"))
+    IDEMPOTENCY_MAX_ENTRIES = int(os.getenv("IDEMPOTENCY_MAX_ENTRIES", "1024"))
+    # Derive a key from the request body when no Idempotency-Key header is sent
+    IDEMPOTENCY_AUTO_KEY = os.getenv("IDEMPOTENCY_AUTO_KEY", "false").lower() == "true"
+
+    # Local cache directory for on-disk caches and stores
+    CACHE_DIR = os.getenv("CACHE_DIR", str(project_root / ".cache"))
+
+    # Background jobs (/jobs): persistent SQLite queue drained by a local thread pool
+    JOB_QUEUE_ENABLED = os.getenv("JOB_QUEUE_ENABLED", "true").lower() == "true"
+    JOB_WORKERS = int(os.getenv("JOB_WORKERS", "2"))
+    JOB_DB_PATH = os.getenv("JOB_DB_PATH", str(Path(CACHE_DIR) / "jobs.db"))
+
+    # Rule-based fast path that plans simple single-tool requests without the planner LLM
+    INTENT_ROUTER_ENABLED = os.getenv("INTENT_ROUTER_ENABLED", "true").lower() == "true"
+    INTENT_ROUTER_THRESHOLD = float(os.getenv("INTENT_ROUTER_THRESHOLD", "0.9"))
+    # Optional JSON file with extra rules, tried before the built-in ones
+    INTENT_RULES_PATH = os.getenv("INTENT_RULES_PATH", "")
+
+    # Step results longer than this are truncated in history; the full payload
+    # stays retrievable from a bounded in-process store while it is recent
+    STEP_RESULT_MAX_CHARS = int(os.getenv("STEP_RESULT_MAX_CHARS", "2000"))
+    STEP_PAYLOAD_CACHE_ENTRIES = int(os.getenv("STEP_PAYLOAD_CACHE_ENTRIES", "256"))
+
+    # Checkpoint run state after every graph node so interrupted runs can be resumed
+    CHECKPOINT_ENABLED = os.getenv("CHECKPOINT_ENABLED", "true").lower() == "true"
+    CHECKPOINT_DB_PATH = os.getenv("CHECKPOINT_DB_PATH", str(Path(CACHE_DIR) / "checkpoints.db"))
+    # Runs not updated for this long are deleted at startup
+    CHECKPOINT_RETENTION_SECONDS = float(os.getenv("CHECKPOINT_RETENTION_SECONDS", "604800"))
+
+    # Planner plan cache: "memory", "sqlite" or "none"
+    PLAN_CACHE_BACKEND = os.getenv("PLAN_CACHE_BACKEND", "memory")
+    PLAN_CACHE_PATH = os.getenv("PLAN_CACHE_PATH", str(Path(CACHE_DIR) / "plan_cache.db"))
+    PLAN_CACHE_MAX_ENTRIES = int(os.getenv("PLAN_CACHE_MAX_ENTRIES", "512"))
+    PLAN_CACHE_TTL_SECONDS = float(os.getenv("PLAN_CACHE_TTL_SECONDS", "3600"))
+    # Cosine similarity for the embedding tier; 0 disables it
+    PLAN_CACHE_SIMILARITY_THRESHOLD = float(os.getenv("PLAN_CACHE_SIMILARITY_THRESHOLD", "0"))
+
+    # Responder: build the final response from simple tool results without the LLM
+    RESPONDER_TEMPLATE_ENABLED = os.getenv("RESPONDER_TEMPLATE_ENABLED", "true").lower() == "true"
+    RESPONDER_TEMPLATE_MAX_STEPS = int(os.getenv("RESPONDER_TEMPLATE_MAX_STEPS", "3"))
+    RESPONDER_TEMPLATE_MAX_RESULT_CHARS = int(os.getenv("RESPONDER_TEMPLATE_MAX_RESULT_CHARS", "200"))
+    # Responses keyed by plan and tool results; 0 entries disables the cache
+    RESPONSE_CACHE_MAX_ENTRIES = int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES", "512"))
+    RESPONSE_CACHE_TTL_SECONDS = float(os.getenv("RESPONSE_CACHE_TTL_SECONDS", "600"))
+
+    # Prompt token budgets (whole prompt, in tokens of PROMPT_TOKENIZER_ENCODING)
+    PLANNER_PROMPT_TOKEN_BUDGET = int(os.getenv("PLANNER_PROMPT_TOKEN_BUDGET", "2000"))
+    RESPONDER_PROMPT_TOKEN_BUDGET = int(os.getenv("RESPONDER_PROMPT_TOKEN_BUDGET", "2000"))
+    PROMPT_MEMORY_SNIPPET_TOKENS = int(os.getenv("PROMPT_MEMORY_SNIPPET_TOKENS", "200"))
+    PROMPT_HISTORY_ENTRY_TOKENS = int(os.getenv("PROMPT_HISTORY_ENTRY_TOKENS", "250"))
+    PROMPT_TOKENIZER_ENCODING = os.getenv("PROMPT_TOKENIZER_ENCODING", "cl100k_base")
+    PROMPT_TOKEN_CACHE_SIZE = int(os.getenv("PROMPT_TOKEN_CACHE_SIZE", "4096"))
+
+    # Embedding model, cache and micro-batching
+    # Separate from MODEL_NAME, which is the chat model
+    EMBEDDING_MODEL = os.getenv("EMBEDDING_MODEL", "text-embedding-3-large")
+    EMBEDDING_CACHE_MAX_ENTRIES = int(os.getenv("EMBEDDING_CACHE_MAX_ENTRIES", "4096"))
+    EMBEDDING_CACHE_PERSIST = os.getenv("EMBEDDING_CACHE_PERSIST", "true").lower() == "true"
+    EMBEDDING_CACHE_PATH = os.getenv("EMBEDDING_CACHE_PATH", str(Path(CACHE_DIR) / "embeddings.db"))
+    EMBEDDING_CACHE_MAX_DISK_ENTRIES = int(os.getenv("EMBEDDING_CACHE_MAX_DISK_ENTRIES", "50000"))
+    EMBEDDING_BATCH_SIZE = int(os.getenv("EMBEDDING_BATCH_SIZE", "64"))
+    EMBEDDING_BATCH_WAIT_MS = float(os.getenv("EMBEDDING_BATCH_WAIT_MS", "5"))
+
     # Langsmith API configuration
     LANGSMITH_API_KEY = os.getenv("LANGSMITH_API_KEY")
     LANGSMITH_PROJECT = os.getenv("LANGSMITH_PROJECT")
@@ -54,11 +136,55 @@ class Settings:
     PINECONE_HOST = os.getenv("PINECONE_HOST", "https://indexix-lh6msbk.svc.aped-4627-b74a.pinecone.io")
     PINECONE_REGION = os.getenv("PINECONE_REGION", "us-east-1")
 
+    # Vector memory backend: "pinecone" or "local"
+    MEMORY_BACKEND = os.getenv("MEMORY_BACKEND", "pinecone")
+    LOCAL_MEMORY_PATH = os.getenv("LOCAL_MEMORY_PATH", str(Path(CACHE_DIR) / "memory"))
+    # Vector count at which the local store switches to an IVF index; 0 disables it
+    LOCAL_MEMORY_IVF_THRESHOLD = int(os.getenv("LOCAL_MEMORY_IVF_THRESHOLD", "20000"))
+    LOCAL_MEMORY_NPROBE = int(os.getenv("LOCAL_MEMORY_NPROBE", "8"))
+
+    # Circuit breaker around memory store calls
+    MEMORY_BREAKER_FAILURE_THRESHOLD = int(os.getenv("MEMORY_BREAKER_FAILURE_THRESHOLD", "3"))
+    MEMORY_BREAKER_RESET_SECONDS = float(os.getenv("MEMORY_BREAKER_RESET_SECONDS", "30"))
+
+    # Write-behind batching of memory writes from the responder
+    MEMORY_WRITE_BEHIND = os.getenv("MEMORY_WRITE_BEHIND", "true").lower() == "true"
+    MEMORY_WRITE_BATCH_SIZE = int(os.getenv("MEMORY_WRITE_BATCH_SIZE", "32"))
+    MEMORY_WRITE_FLUSH_INTERVAL = float(os.getenv("MEMORY_WRITE_FLUSH_INTERVAL", "1.0"))
+    MEMORY_WRITE_QUEUE_SIZE = int(os.getenv("MEMORY_WRITE_QUEUE_SIZE", "1000"))
+    MEMORY_WRITE_PUT_TIMEOUT = float(os.getenv("MEMORY_WRITE_PUT_TIMEOUT", "0.1"))
+
+    # Jira configuration
+    JIRA_BASE_URL = os.getenv("JIRA_BASE_URL")
+    JIRA_EMAIL = os.getenv("JIRA_EMAIL")
+    JIRA_API_TOKEN = os.getenv("JIRA_API_TOKEN")
+    # Jira accepts at most 50 issues per bulk create request
+    JIRA_BULK_CHUNK_SIZE = int(os.getenv("JIRA_BULK_CHUNK_SIZE", "50"))
+
+    # Shared HTTP layer for REST integrations
+    HTTP_TIMEOUT = float(os.getenv("HTTP_TIMEOUT", "30"))
+    HTTP_MAX_RETRIES = int(os.getenv("HTTP_MAX_RETRIES", "3"))
+    HTTP_BACKOFF_BASE = float(os.getenv("HTTP_BACKOFF_BASE", "0.5"))
+    HTTP_BACKOFF_MAX = float(os.getenv("HTTP_BACKOFF_MAX", "30"))
+    HTTP_POOL_MAXSIZE = int(os.getenv("HTTP_POOL_MAXSIZE", "10"))
+    HTTP_PER_HOST_CONCURRENCY = int(os.getenv("HTTP_PER_HOST_CONCURRENCY", "8"))
+
     # Slack configuration
     SLACK_DEFAULT_CHANNEL = os.getenv("SLACK_DEFAULT_CHANNEL", "agent_channal")
+    SLACK_BOT_TOKEN = os.getenv("SLACK_BOT_TOKEN")
+    SLACK_API_BASE_URL = os.getenv("SLACK_API_BASE_URL", "https://slack.com/api/")
+    # Outbound queue: per-channel rate limiting and optional coalescing (0 ms disables it)
+    SLACK_DISPATCHER_ENABLED = os.getenv("SLACK_DISPATCHER_ENABLED", "true").lower() == "true"
+    SLACK_COALESCE_WINDOW_MS = float(os.getenv("SLACK_COALESCE_WINDOW_MS", "0"))
+    SLACK_MIN_POST_INTERVAL = float(os.getenv("SLACK_MIN_POST_INTERVAL", "1.0"))
+    SLACK_MAX_QUEUE_PER_CHANNEL = int(os.getenv("SLACK_MAX_QUEUE_PER_CHANNEL", "100"))
+    # Channels posted to concurrently; each channel still has at most one post in flight
+    SLACK_POST_WORKERS = int(os.getenv("SLACK_POST_WORKERS", "4"))
+    SLACK_SEND_TIMEOUT = float(os.getenv("SLACK_SEND_TIMEOUT", "60"))
 
     # Logger configuration
     LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
+    LOG_FORMAT = os.getenv("LOG_FORMAT", "[%(asctime)s] [%(levelname)s] [%(name)s] %(message)s")
     
     @staticmethod
     def verify_connections() -> dict:
@@ -1,15 +1,211 @@
-import os
+import hashlib
 import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future
 
+from langchain_core.embeddings import Embeddings
 from langchain_openai import OpenAIEmbeddings
+from core.cache import LRUCache, SQLiteCache
 from core.config import settings
 
 log = logging.getLogger(__name__)
 
-def get_embeddings():
+_embeddings = None
+_embeddings_lock = threading.Lock()
+
+class EmbeddingBatcher:
+    """
+    Coalesce concurrent embedding requests into single batched API calls.
+
+    Callers block in submit() while a background thread drains the queue,
+    waiting up to max_wait_ms for more requests before calling embed_documents
+    once for the whole batch.
+
+    Args:
+        embed_documents (callable): Batched embedding function
+        max_batch_size (int): Maximum number of texts per API call
+        max_wait_ms (float): How long to wait for more requests before flushing
+    """
+
+    def __init__(self, embed_documents, max_batch_size=64, max_wait_ms=5):
+        self.embed_documents = embed_documents
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self.batches = 0
+        self.texts = 0
+        self.max_batch_seen = 0
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name="embedding-batcher", daemon=True)
+        self._thread.start()
+
+    def submit(self, texts):
+        future = Future()
+        self._queue.put((list(texts), future))
+        return future.result()
+
+    def _collect(self):
+        pending = [self._queue.get()]
+        size = len(pending[0][0])
+        deadline = time.monotonic() + self.max_wait
+        while size < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                item = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            pending.append(item)
+            size += len(item[0])
+        return pending
+
+    def _run(self):
+        while True:
+            pending = self._collect()
+            texts = [text for item_texts, _ in pending for text in item_texts]
+            try:
+                vectors = []
+                for start in range(0, len(texts), self.max_batch_size):
+                    vectors.extend(self.embed_documents(texts[start:start + self.max_batch_size]))
+                    self.batches += 1
+            except Exception as e:
+                for _, future in pending:
+                    future.set_exception(e)
+                continue
+
+            self.texts += len(texts)
+            self.max_batch_seen = max(self.max_batch_seen, len(texts))
+            offset = 0
+            for item_texts, future in pending:
+                future.set_result(vectors[offset:offset + len(item_texts)])
+                offset += len(item_texts)
+
+    def stats(self):
+        return {
+            "batches": self.batches,
+            "texts": self.texts,
+            "avg_batch_size": self.texts / self.batches if self.batches else 0.0,
+            "max_batch_size": self.max_batch_seen,
+        }
+
+class CachedEmbeddings(Embeddings):
+    """
+    Embeddings wrapper that caches vectors by content hash.
+
+    Lookups go to a bounded in-memory LRU first, then to an optional persistent
+    store; only the remaining texts are sent (deduplicated) to the batcher.
+
+    Args:
+        embeddings (Embeddings): Underlying embeddings client
+        model (str): Model name, part of the cache key
+        memory_cache (LRUCache): In-memory tier
+        persistent_cache (SQLiteCache): Optional on-disk tier
+        batcher (EmbeddingBatcher): Optional micro-batcher for cache misses
+    """
+
+    def __init__(self, embeddings, model, memory_cache, persistent_cache=None, batcher=None):
+        self.embeddings = embeddings
+        self.model = model
+        self.memory_cache = memory_cache
+        self.persistent_cache = persistent_cache
+        self.batcher = batcher
+        self.hits = 0
+        self.misses = 0
+
+    def _key(self, text):
+        return hashlib.sha256(f"{self.model}\0{text}".encode("utf-8")).hexdigest()
+
+    def _lookup(self, key):
+        vector = self.memory_cache.get(key)
+        if vector is None and self.persistent_cache is not None:
+            vector = self.persistent_cache.get(key)
+            if vector is not None:
+                self.memory_cache.set(key, vector)
+        return vector
+
+    def _store(self, key, vector):
+        self.memory_cache.set(key, vector)
+        if self.persistent_cache is not None:
+            self.persistent_cache.set(key, vector)
+
+    def embed_documents(self, texts):
+        keys = [self._key(text) for text in texts]
+        vectors = [self._lookup(key) for key in keys]
+
+        missing = {}
+        for text, key, vector in zip(texts, keys, vectors):
+            if vector is None:
+                missing.setdefault(key, text)
+
+        self.hits += len(texts) - sum(1 for vector in vectors if vector is None)
+        self.misses += len(missing)
+
+        if missing:
+            missing_texts = list(missing.values())
+            if self.batcher is not None:
+                computed = self.batcher.submit(missing_texts)
+            else:
+                computed = self.embeddings.embed_documents(missing_texts)
+            computed = dict(zip(missing.keys(), computed))
+            for key, vector in computed.items():
+                self._store(key, vector)
+            vectors = [computed[key] if vector is None else vector for key, vector in zip(keys, vectors)]
+
+        return vectors
+
+    def embed_query(self, text):
+        return self.embed_documents([text])[0]
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "batcher": self.batcher.stats() if self.batcher else None,
+        }
+
+def _create_embeddings():
+    model = settings.EMBEDDING_MODEL
     log.info("Creating OpenAI embeddings")
-    return OpenAIEmbeddings(
+    embeddings = OpenAIEmbeddings(
         openai_api_key=settings.OPENROUTER_API_KEY,
         openai_api_base=settings.OPENROUTER_BASE_URL,
-        model=os.getenv("MODEL_NAME", "text-embedding-3-large")
+        model=model
+    )
+
+    persistent_cache = None
+    if settings.EMBEDDING_CACHE_PERSIST:
+        persistent_cache = SQLiteCache(
+            settings.EMBEDDING_CACHE_PATH,
+            table="embeddings",
+            max_entries=settings.EMBEDDING_CACHE_MAX_DISK_ENTRIES
+        )
+
+    return CachedEmbeddings(
+        embeddings,
+        model,
+        memory_cache=LRUCache(max_entries=settings.EMBEDDING_CACHE_MAX_ENTRIES),
+        persistent_cache=persistent_cache,
+        batcher=EmbeddingBatcher(
+            embeddings.embed_documents,
+            max_batch_size=settings.EMBEDDING_BATCH_SIZE,
+            max_wait_ms=settings.EMBEDDING_BATCH_WAIT_MS
+        )
     )
+
+def get_embeddings():
+    """Return the process-wide cached embeddings client."""
+    global _embeddings
+    if _embeddings is None:
+        with _embeddings_lock:
+            if _embeddings is None:
+                _embeddings = _create_embeddings()
+    return _embeddings
+
+def get_embeddings_stats():
+    """Cache hit rate and batching of the embeddings client, or None if not created yet."""
+    embeddings = _embeddings
+    return embeddings.stats() if embeddings is not None else None
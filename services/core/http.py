@@ -0,0 +1,188 @@
+import logging
+import random
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from urllib.parse import urljoin, urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import NewConnectionError
+
+from core.config import settings
+
+log = logging.getLogger(__name__)
+
+# Statuses retried for idempotent methods
+RETRY_STATUSES = frozenset({429, 502, 503, 504})
+# Statuses retried for non-idempotent methods (POST, PATCH): the server
+# refused the request without acting on it. A 502/504 or a read timeout may
+# come after the upstream already created the resource, so those are not retried.
+UNSAFE_RETRY_STATUSES = frozenset({429, 503})
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE", "TRACE"})
+
+_clients = {}
+_clients_lock = threading.Lock()
+_host_limits = {}
+_host_limits_lock = threading.Lock()
+
+def _host_semaphore(url, limit):
+    host = urlsplit(url).netloc
+    with _host_limits_lock:
+        semaphore = _host_limits.get(host)
+        if semaphore is None:
+            semaphore = threading.BoundedSemaphore(limit)
+            _host_limits[host] = semaphore
+        return semaphore
+
+def parse_retry_after(value):
+    """Return the delay in seconds from a Retry-After header (seconds or HTTP date)."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+def _not_sent(error):
+    """True if the request never reached the server (connect timeout or refused connection)."""
+    if isinstance(error, requests.ConnectTimeout):
+        return True
+    if not isinstance(error, requests.ConnectionError):
+        return False
+    reason = getattr(error.args[0], "reason", None) if error.args else None
+    return isinstance(reason, NewConnectionError)
+
+class HTTPClient:
+    """
+    Pooled, retrying HTTP client for REST integrations.
+
+    Wraps one keep-alive requests.Session. Failed requests are retried with
+    exponential backoff and full jitter, honoring Retry-After. Idempotent
+    methods are retried on 429/502/503/504, timeouts and connection errors.
+    Other methods (POST, PATCH) are only retried when the request cannot have
+    had an effect: 429/503, a connect timeout or a refused connection. Pass
+    idempotent=True to request() to retry them like idempotent methods, e.g.
+    when the API deduplicates by an idempotency key. Concurrent requests to
+    the same host are capped by a process-wide semaphore.
+
+    Args:
+        base_url (str): Prefix for relative URLs
+        auth: requests auth object, set once on the session
+        headers (dict): Default headers
+        timeout (float): Per-request timeout in seconds
+        max_retries (int): Retries after the first attempt
+        backoff_base (float): Base delay in seconds for exponential backoff
+        backoff_max (float): Upper bound for any single delay
+        pool_maxsize (int): Connections kept alive per host
+        per_host_concurrency (int): Maximum in-flight requests per host
+    """
+
+    def __init__(self, base_url=None, auth=None, headers=None, timeout=30,
+                 max_retries=3, backoff_base=0.5, backoff_max=30.0,
+                 pool_maxsize=10, per_host_concurrency=8):
+        self.base_url = base_url.rstrip("/") + "/" if base_url else None
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.per_host_concurrency = per_host_concurrency
+        self.retries = 0
+
+        self.session = requests.Session()
+        self.session.auth = auth
+        self.session.headers.update(headers or {})
+        adapter = HTTPAdapter(pool_connections=pool_maxsize, pool_maxsize=pool_maxsize, max_retries=0)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def _url(self, url):
+        if self.base_url and not urlsplit(url).scheme:
+            return urljoin(self.base_url, url.lstrip("/"))
+        return url
+
+    def _backoff(self, attempt):
+        # Full jitter: uniform in [0, base * 2^attempt], capped
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+
+    def request(self, method, url, idempotent=None, **kwargs):
+        url = self._url(url)
+        kwargs.setdefault("timeout", self.timeout)
+        semaphore = _host_semaphore(url, self.per_host_concurrency)
+        if idempotent is None:
+            idempotent = method.upper() in IDEMPOTENT_METHODS
+        retry_statuses = RETRY_STATUSES if idempotent else UNSAFE_RETRY_STATUSES
+
+        attempt = 0
+        while True:
+            try:
+                with semaphore:
+                    response = self.session.request(method, url, **kwargs)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                if attempt >= self.max_retries or not (idempotent or _not_sent(e)):
+                    raise
+                delay = self._backoff(attempt)
+                log.warning(f"{method} {url} failed ({e}), retrying in {delay:.2f}s")
+            else:
+                if response.status_code not in retry_statuses or attempt >= self.max_retries:
+                    return response
+                retry_after = parse_retry_after(response.headers.get("Retry-After"))
+                delay = min(self.backoff_max, retry_after) if retry_after is not None else self._backoff(attempt)
+                log.warning(f"{method} {url} returned {response.status_code}, retrying in {delay:.2f}s")
+                response.close()
+
+            attempt += 1
+            self.retries += 1
+            time.sleep(delay)
+
+    def get(self, url, **kwargs):
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return self.request("POST", url, **kwargs)
+
+    def close(self):
+        self.session.close()
+
+def get_http_client(name, **kwargs):
+    """
+    Return the shared HTTPClient registered under name, creating it on first use.
+
+    kwargs are passed to HTTPClient on creation; unspecified options come from
+    the HTTP_* settings.
+    """
+    client = _clients.get(name)
+    if client is not None:
+        return client
+
+    with _clients_lock:
+        client = _clients.get(name)
+        if client is None:
+            options = {
+                "timeout": settings.HTTP_TIMEOUT,
+                "max_retries": settings.HTTP_MAX_RETRIES,
+                "backoff_base": settings.HTTP_BACKOFF_BASE,
+                "backoff_max": settings.HTTP_BACKOFF_MAX,
+                "pool_maxsize": settings.HTTP_POOL_MAXSIZE,
+                "per_host_concurrency": settings.HTTP_PER_HOST_CONCURRENCY,
+            }
+            options.update(kwargs)
+            client = HTTPClient(**options)
+            _clients[name] = client
+            log.info(f"Created HTTP client '{name}'")
+        return client
+
+def close_http_clients():
+    with _clients_lock:
+        clients = list(_clients.values())
+        _clients.clear()
+    for client in clients:
+        client.close()
@@ -0,0 +1,128 @@
+import asyncio
+import hashlib
+import json
+import logging
+
+from core.cache import LRUCache
+from core.config import settings
+
+log = logging.getLogger(__name__)
+
+_store = None
+
+class IdempotencyKeyReused(ValueError):
+    """Raised when an idempotency key is reused with a different request body."""
+
+def request_fingerprint(payload):
+    """Hash of the canonical JSON body, used to detect a key reused for another request."""
+    body = json.dumps(payload, sort_keys=True, default=str)
+    return hashlib.sha256(body.encode("utf-8")).hexdigest()
+
+def request_key(scope, payload, idempotency_key=None):
+    """
+    Build the deduplication key for a request.
+
+    An explicit Idempotency-Key header wins; otherwise, when
+    IDEMPOTENCY_AUTO_KEY is enabled, the key is a hash of the canonical JSON
+    body. Returns None when the request should not be deduplicated.
+    """
+    if idempotency_key:
+        return f"{scope}:key:{idempotency_key}"
+    if not settings.IDEMPOTENCY_AUTO_KEY:
+        return None
+    return f"{scope}:body:{request_fingerprint(payload)}"
+
+class IdempotencyStore:
+    """
+    Single-flight execution with a TTL cache of completed results.
+
+    Concurrent calls with the same key share one execution; calls after it
+    completes get the cached result until it expires. Only results accepted
+    by should_cache are kept, so failed runs can be retried. A call whose
+    fingerprint differs from the one the key was first used with is rejected.
+
+    Must be used from a single event loop (the FastAPI loop).
+
+    Args:
+        ttl_seconds (float): How long completed results are replayed
+        max_entries (int): Maximum number of cached results
+    """
+
+    EXECUTED = "executed"
+    JOINED = "joined"
+    REPLAYED = "replayed"
+
+    def __init__(self, ttl_seconds=300, max_entries=1024):
+        self._results = LRUCache(max_entries=max_entries, ttl_seconds=ttl_seconds)
+        self._inflight = {}
+        self.executed = 0
+        self.joined = 0
+        self.replayed = 0
+
+    @staticmethod
+    def _check(key, fingerprint, expected):
+        if fingerprint is not None and expected is not None and fingerprint != expected:
+            raise IdempotencyKeyReused("Idempotency key was already used with a different request body")
+
+    async def run(self, key, func, should_cache=None, fingerprint=None):
+        """
+        Run func() once per key.
+
+        Returns:
+            tuple: (result, outcome) where outcome is "executed", "joined" or "replayed"
+
+        Raises:
+            IdempotencyKeyReused: If key was used with a different fingerprint
+        """
+        if key is None:
+            self.executed += 1
+            return await func(), self.EXECUTED
+
+        cached = self._results.get(key)
+        if cached is not None:
+            self._check(key, fingerprint, cached[0])
+            self.replayed += 1
+            return cached[1], self.REPLAYED
+
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            self._check(key, fingerprint, inflight[0])
+            self.joined += 1
+            # shield so a disconnecting duplicate does not cancel the shared run
+            return await asyncio.shield(inflight[1]), self.JOINED
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = (fingerprint, future)
+        self.executed += 1
+        try:
+            result = await func()
+        except BaseException as e:
+            future.set_exception(e)
+            # Mark retrieved so a run without duplicates does not warn
+            future.exception()
+            raise
+        else:
+            if should_cache is None or should_cache(result):
+                self._results.set(key, (fingerprint, result))
+            future.set_result(result)
+            return result, self.EXECUTED
+        finally:
+            self._inflight.pop(key, None)
+
+    def stats(self):
+        return {
+            "executed": self.executed,
+            "joined": self.joined,
+            "replayed": self.replayed,
+            "in_flight": len(self._inflight),
+            "cached": len(self._results),
+        }
+
+def get_idempotency_store():
+    global _store
+    if _store is None:
+        _store = IdempotencyStore(
+            ttl_seconds=settings.IDEMPOTENCY_TTL_SECONDS,
+            max_entries=settings.IDEMPOTENCY_MAX_ENTRIES
+        )
+    return _store
@@ -0,0 +1,225 @@
+import json
+import logging
+import sqlite3
+import threading
+import time
+import uuid
+from pathlib import Path
+
+log = logging.getLogger(__name__)
+
+_queue = None
+_queue_lock = threading.Lock()
+
+class JobCancelled(Exception):
+    """Raised by a job handler when the job was cancelled while running."""
+
+class JobStore:
+    """
+    Persistent job table in a local SQLite file.
+
+    Statuses: pending -> running -> succeeded | failed | cancelled.
+    """
+
+    def __init__(self, path):
+        self.path = str(path)
+        Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS jobs ("
+            "id TEXT PRIMARY KEY, status TEXT NOT NULL, priority INTEGER NOT NULL, "
+            "payload TEXT NOT NULL, result TEXT, error TEXT, cancel_requested INTEGER DEFAULT 0, "
+            "created_at REAL NOT NULL, started_at REAL, finished_at REAL)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS jobs_pending ON jobs (status, priority DESC, created_at)"
+        )
+        self._conn.commit()
+
+    def add(self, payload, priority=0):
+        job_id = uuid.uuid4().hex
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO jobs (id, status, priority, payload, created_at) VALUES (?, 'pending', ?, ?, ?)",
+                (job_id, priority, json.dumps(payload), time.time())
+            )
+            self._conn.commit()
+        return job_id
+
+    def claim(self):
+        """Atomically mark the highest-priority pending job as running and return it."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT * FROM jobs WHERE status = 'pending' ORDER BY priority DESC, created_at LIMIT 1"
+            ).fetchone()
+            if row is None:
+                return None
+            self._conn.execute(
+                "UPDATE jobs SET status = 'running', started_at = ? WHERE id = ?",
+                (time.time(), row["id"])
+            )
+            self._conn.commit()
+        return self._to_dict(row, status="running")
+
+    def finish(self, job_id, status, result=None, error=None):
+        with self._lock:
+            self._conn.execute(
+                "UPDATE jobs SET status = ?, result = ?, error = ?, finished_at = ? WHERE id = ?",
+                (status, json.dumps(result, default=str) if result is not None else None,
+                 error, time.time(), job_id)
+            )
+            self._conn.commit()
+
+    def cancel(self, job_id):
+        """Cancel a pending job or flag a running one; returns the new status or None."""
+        with self._lock:
+            row = self._conn.execute("SELECT status FROM jobs WHERE id = ?", (job_id,)).fetchone()
+            if row is None:
+                return None
+            if row["status"] == "pending":
+                self._conn.execute(
+                    "UPDATE jobs SET status = 'cancelled', finished_at = ? WHERE id = ?",
+                    (time.time(), job_id)
+                )
+                self._conn.commit()
+                return "cancelled"
+            if row["status"] == "running":
+                self._conn.execute("UPDATE jobs SET cancel_requested = 1 WHERE id = ?", (job_id,))
+                self._conn.commit()
+                return "cancelling"
+            return row["status"]
+
+    def cancel_requested(self, job_id):
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT cancel_requested FROM jobs WHERE id = ?", (job_id,)
+            ).fetchone()
+        return bool(row and row["cancel_requested"])
+
+    def get(self, job_id):
+        with self._lock:
+            row = self._conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return self._to_dict(row) if row else None
+
+    def requeue_running(self):
+        """Put jobs left running by a previous process back in the queue."""
+        with self._lock:
+            count = self._conn.execute(
+                "UPDATE jobs SET status = 'pending', started_at = NULL WHERE status = 'running'"
+            ).rowcount
+            self._conn.commit()
+        return count
+
+    def counts(self):
+        with self._lock:
+            rows = self._conn.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall()
+        return {status: count for status, count in rows}
+
+    @staticmethod
+    def _to_dict(row, **overrides):
+        job = dict(row)
+        job.update(overrides)
+        job["payload"] = json.loads(job["payload"])
+        job["result"] = json.loads(job["result"]) if job.get("result") else None
+        job["cancel_requested"] = bool(job.get("cancel_requested"))
+        return job
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+class JobQueue:
+    """
+    Local worker pool draining a JobStore.
+
+    Each worker thread claims the highest-priority pending job and runs
+    handler(payload, is_cancelled). The handler should call is_cancelled()
+    between units of work and raise JobCancelled when it returns True.
+
+    Args:
+        store (JobStore): Persistent job table
+        handler (callable): Runs one job payload and returns its result
+        workers (int): Number of worker threads
+        poll_interval (float): Seconds between polls when idle
+    """
+
+    def __init__(self, store, handler, workers=2, poll_interval=1.0):
+        self.store = store
+        self.handler = handler
+        self.workers = workers
+        self.poll_interval = poll_interval
+        self._wakeup = threading.Condition()
+        self._stopped = False
+        self._threads = []
+
+    def start(self):
+        requeued = self.store.requeue_running()
+        if requeued:
+            log.info(f"Re-queued {requeued} interrupted jobs")
+        for number in range(self.workers):
+            thread = threading.Thread(target=self._work, name=f"job-worker-{number}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        return self
+
+    def submit(self, payload, priority=0):
+        job_id = self.store.add(payload, priority)
+        with self._wakeup:
+            self._wakeup.notify()
+        return job_id
+
+    def cancel(self, job_id):
+        return self.store.cancel(job_id)
+
+    def _work(self):
+        while not self._stopped:
+            job = self.store.claim()
+            if job is None:
+                with self._wakeup:
+                    self._wakeup.wait(self.poll_interval)
+                continue
+
+            job_id = job["id"]
+            log.info(f"Running job {job_id}")
+            try:
+                result = self.handler(job["payload"], lambda: self.store.cancel_requested(job_id))
+                self.store.finish(job_id, "succeeded", result=result)
+            except JobCancelled:
+                self.store.finish(job_id, "cancelled")
+                log.info(f"Job {job_id} cancelled")
+            except Exception as e:
+                self.store.finish(job_id, "failed", error=str(e))
+                log.error(f"Job {job_id} failed: {e}")
+
+    def stop(self, timeout=30):
+        """Stop claiming new jobs and wait for running ones to finish."""
+        self._stopped = True
+        with self._wakeup:
+            self._wakeup.notify_all()
+        for thread in self._threads:
+            thread.join(timeout)
+
+    def stats(self):
+        return {"workers": self.workers, "jobs": self.store.counts()}
+
+def start_job_queue(handler, path, workers=2):
+    """Create and start the process-wide job queue."""
+    global _queue
+    with _queue_lock:
+        if _queue is None:
+            _queue = JobQueue(JobStore(path), handler, workers=workers).start()
+    return _queue
+
+def get_job_queue():
+    return _queue
+
+def stop_job_queue():
+    global _queue
+    with _queue_lock:
+        queue, _queue = _queue, None
+    if queue is not None:
+        queue.stop()
+        queue.store.close()
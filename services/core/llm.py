@@ -1,15 +1,138 @@
-import os
-from dotenv import load_dotenv
-load_dotenv()
+import logging
+import threading
+import time
 
+import httpx
+from langchain_core.callbacks import BaseCallbackHandler
 from langchain_openai import ChatOpenAI
 from core.config import settings
+from core.metrics import LLM_SECONDS, LLM_TOKENS
 
-def get_llm():
-    model_name = os.getenv("OPENROUTER_MODEL")
+log = logging.getLogger(__name__)
+
+# Process-wide ChatOpenAI clients keyed by (model, temperature). Each client
+# owns pooled sync/async HTTP clients so connections and TLS sessions are
+# reused across requests instead of being rebuilt per node call.
+_clients = {}
+_reuse_counts = {}
+_clients_lock = threading.Lock()
+
+def _http_limits():
+    return httpx.Limits(
+        max_connections=settings.LLM_MAX_CONNECTIONS,
+        max_keepalive_connections=settings.LLM_MAX_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry=settings.LLM_KEEPALIVE_EXPIRY
+    )
+
+class LLMMetricsCallback(BaseCallbackHandler):
+    """
+    Records latency and token usage of every call made through a pooled client.
+
+    The graph node making the call is taken from LangGraph's run metadata.
+    Runs inline so async calls are not handed to a thread pool.
+    """
+
+    run_inline = True
+
+    def __init__(self, model_name):
+        self.model_name = model_name
+        self._started = {}
+
+    def on_chat_model_start(self, serialized, messages, *, run_id, metadata=None, **kwargs):
+        node = (metadata or {}).get("langgraph_node", "none")
+        self._started[run_id] = (time.perf_counter(), node)
+
+    def on_llm_end(self, response, *, run_id, **kwargs):
+        started, node = self._started.pop(run_id, (None, "none"))
+        if started is not None:
+            LLM_SECONDS.observe(time.perf_counter() - started, model=self.model_name, node=node, status="ok")
+
+        usage = None
+        for generations in response.generations:
+            for generation in generations:
+                usage = getattr(getattr(generation, "message", None), "usage_metadata", None) or usage
+        if not usage:
+            token_usage = (response.llm_output or {}).get("token_usage") or {}
+            usage = {
+                "input_tokens": token_usage.get("prompt_tokens", 0),
+                "output_tokens": token_usage.get("completion_tokens", 0),
+            } if token_usage else None
+        if usage:
+            LLM_TOKENS.inc(usage.get("input_tokens", 0), model=self.model_name, node=node, type="input")
+            LLM_TOKENS.inc(usage.get("output_tokens", 0), model=self.model_name, node=node, type="output")
+
+    def on_llm_error(self, error, *, run_id, **kwargs):
+        started, node = self._started.pop(run_id, (None, "none"))
+        if started is not None:
+            LLM_SECONDS.observe(time.perf_counter() - started, model=self.model_name, node=node, status="error")
+
+def _create_llm(model_name, temperature):
+    log.info(f"Creating LLM client for model={model_name} temperature={temperature}")
+    timeout = httpx.Timeout(settings.LLM_TIMEOUT)
     return ChatOpenAI(
-        openai_api_key=os.getenv("OPENROUTER_API_KEY"),
-        openai_api_base=os.getenv("OPENROUTER_BASE_URL", "https://openrouter.ai/api/v1"),
+        openai_api_key=settings.OPENROUTER_API_KEY,
+        openai_api_base=settings.OPENROUTER_BASE_URL,
         model=model_name,
-        temperature=0
+        temperature=temperature,
+        timeout=settings.LLM_TIMEOUT,
+        http_client=httpx.Client(limits=_http_limits(), timeout=timeout),
+        http_async_client=httpx.AsyncClient(limits=_http_limits(), timeout=timeout),
+        callbacks=[LLMMetricsCallback(model_name)]
     )
+
+def get_llm(model_name=None, temperature=0):
+    """
+    Get a shared LLM client for the given model and temperature.
+
+    Args:
+        model_name (str): Model to use (defaults to settings.MODEL_NAME)
+        temperature (float): Sampling temperature
+
+    Returns:
+        ChatOpenAI: Pooled client, created on first use
+    """
+    key = (model_name or settings.MODEL_NAME, float(temperature))
+
+    with _clients_lock:
+        llm = _clients.get(key)
+        if llm is None:
+            llm = _create_llm(*key)
+            _clients[key] = llm
+            _reuse_counts[key] = 0
+        else:
+            _reuse_counts[key] += 1
+            log.debug(f"Reusing LLM client {key} (reuse count: {_reuse_counts[key]})")
+
+    return llm
+
+def warm_up_llm_pool(model_names=None, temperature=0):
+    """Create the pooled clients ahead of the first request."""
+    for model_name in model_names or [settings.MODEL_NAME]:
+        get_llm(model_name, temperature)
+    return get_llm_pool_stats()
+
+def get_llm_pool_stats():
+    """Return per-client reuse counts keyed by "model@temperature"."""
+    with _clients_lock:
+        return {
+            f"{model}@{temperature}": count
+            for (model, temperature), count in _reuse_counts.items()
+        }
+
+def log_llm_pool_stats():
+    for client, count in get_llm_pool_stats().items():
+        log.info(f"LLM client {client} reused {count} times")
+
+async def close_llm_pool():
+    """Close pooled HTTP connections, e.g. on application shutdown."""
+    with _clients_lock:
+        clients = list(_clients.values())
+        _clients.clear()
+        _reuse_counts.clear()
+
+    for llm in clients:
+        try:
+            llm.http_client.close()
+            await llm.http_async_client.aclose()
+        except Exception as e:
+            log.warning(f"Failed to close LLM HTTP client: {e}")
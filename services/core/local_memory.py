@@ -0,0 +1,299 @@
+import json
+import logging
+import threading
+import uuid
+from pathlib import Path
+
+import numpy as np
+from langchain_core.documents import Document
+from langchain_core.vectorstores import VectorStore
+
+log = logging.getLogger(__name__)
+
+_stores = {}
+_stores_lock = threading.Lock()
+
+class LocalVectorStore(VectorStore):
+    """
+    In-process vector store backed by a memory-mapped float32 matrix.
+
+    Layout of the store directory:
+        vectors.f32   row-major (capacity, dimension) float32 matrix, L2-normalized rows
+        texts.jsonl   one {"id", "text", "metadata"} record per row
+        meta.json     {"count", "dimension", "capacity"}
+
+    meta.json is written last, so its count is the number of committed rows;
+    rows of an append interrupted before that are discarded on load.
+
+    Search is a vectorized cosine top-k over the matrix. Once the store holds
+    ivf_threshold vectors, an IVF index (k-means coarse centroids) is built and
+    only the nprobe closest clusters are scanned. The index is built outside
+    the store lock; searches keep using the previous index until it is swapped in.
+
+    Args:
+        embedding (Embeddings): Embeddings used for texts and queries
+        path (str): Store directory
+        ivf_threshold (int): Vector count at which the IVF index is used; 0 disables it
+        nprobe (int): Number of IVF clusters scanned per query
+    """
+
+    def __init__(self, embedding, path, ivf_threshold=20000, nprobe=8):
+        self.embedding = embedding
+        self.path = Path(path)
+        self.ivf_threshold = ivf_threshold
+        self.nprobe = nprobe
+        self._lock = threading.RLock()
+        self._vectors = None
+        self._records = []
+        self._count = 0
+        self._dimension = None
+        self._capacity = 0
+        self._centroids = None
+        self._lists = None
+        self._indexed_count = 0
+        self._building = False
+
+        self.path.mkdir(parents=True, exist_ok=True)
+        self._load()
+
+    @property
+    def embeddings(self):
+        return self.embedding
+
+    @property
+    def _vectors_path(self):
+        return self.path / "vectors.f32"
+
+    @property
+    def _texts_path(self):
+        return self.path / "texts.jsonl"
+
+    @property
+    def _meta_path(self):
+        return self.path / "meta.json"
+
+    def _load(self):
+        if not self._meta_path.exists():
+            return
+
+        meta = json.loads(self._meta_path.read_text())
+        self._count = meta["count"]
+        self._dimension = meta["dimension"]
+        self._capacity = meta["capacity"]
+        if self._dimension:
+            self._vectors = np.memmap(
+                self._vectors_path, dtype=np.float32, mode="r+",
+                shape=(self._capacity, self._dimension)
+            )
+
+        self._records = self._load_records()
+        log.info(f"Loaded local memory store with {self._count} vectors from {self.path}")
+
+    def _load_records(self):
+        """Read the committed text records, truncating texts.jsonl to them."""
+        records = []
+        committed = 0
+        if self._texts_path.exists():
+            with self._texts_path.open("rb") as f:
+                for line in f:
+                    # A line without its newline is a torn write
+                    if len(records) == self._count or not line.endswith(b"\n"):
+                        break
+                    records.append(json.loads(line))
+                    committed += len(line)
+
+        if self._texts_path.exists() and self._texts_path.stat().st_size > committed:
+            log.warning(f"Discarding text records of an interrupted append in {self._texts_path}")
+            with self._texts_path.open("r+b") as f:
+                f.truncate(committed)
+        if len(records) < self._count:
+            log.warning(f"{self._texts_path} holds {len(records)} of {self._count} records; dropping the rest")
+            self._count = len(records)
+            self._save_meta()
+        return records
+
+    def _save_meta(self):
+        self._meta_path.write_text(json.dumps({
+            "count": self._count,
+            "dimension": self._dimension,
+            "capacity": self._capacity,
+        }))
+
+    def _ensure_capacity(self, needed):
+        if needed <= self._capacity:
+            return
+
+        capacity = max(needed, self._capacity * 2, 1024)
+        if self._vectors is not None:
+            self._vectors.flush()
+            del self._vectors
+        with self._vectors_path.open("ab") as f:
+            f.truncate(capacity * self._dimension * 4)
+        self._capacity = capacity
+        self._vectors = np.memmap(
+            self._vectors_path, dtype=np.float32, mode="r+",
+            shape=(self._capacity, self._dimension)
+        )
+
+    @staticmethod
+    def _normalize(vectors):
+        vectors = np.asarray(vectors, dtype=np.float32)
+        norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return vectors / norms
+
+    def add_embeddings(self, texts, embeddings, metadatas=None, ids=None):
+        """Append precomputed embeddings; returns the ids of the new rows."""
+        texts = list(texts)
+        if not texts:
+            return []
+        vectors = self._normalize(embeddings)
+        metadatas = metadatas or [{} for _ in texts]
+        ids = ids or [str(uuid.uuid4()) for _ in texts]
+
+        with self._lock:
+            if self._dimension is None:
+                self._dimension = vectors.shape[1]
+            elif vectors.shape[1] != self._dimension:
+                raise ValueError(
+                    f"Embedding dimension {vectors.shape[1]} does not match store dimension {self._dimension}"
+                )
+
+            start = self._count
+            self._ensure_capacity(start + len(texts))
+            self._vectors[start:start + len(texts)] = vectors
+            self._vectors.flush()
+
+            records = [
+                {"id": id_, "text": text, "metadata": metadata}
+                for id_, text, metadata in zip(ids, texts, metadatas)
+            ]
+            with self._texts_path.open("a", encoding="utf-8") as f:
+                for record in records:
+                    f.write(json.dumps(record) + "\n")
+            self._records.extend(records)
+            self._count += len(texts)
+            self._save_meta()
+
+        return ids
+
+    def add_texts(self, texts, metadatas=None, ids=None, **kwargs):
+        texts = list(texts)
+        return self.add_embeddings(texts, self.embedding.embed_documents(texts), metadatas, ids)
+
+    def _build_index(self, matrix):
+        """Cluster matrix rows into sqrt(n) lists with a few k-means rounds; returns (centroids, lists)."""
+        matrix = np.asarray(matrix)
+        count = len(matrix)
+        nlist = max(1, int(np.sqrt(count)))
+        rng = np.random.default_rng(0)
+        centroids = matrix[rng.choice(count, nlist, replace=False)].copy()
+
+        for _ in range(10):
+            assignments = np.argmax(matrix @ centroids.T, axis=1)
+            for cluster in range(nlist):
+                members = matrix[assignments == cluster]
+                if len(members):
+                    centroids[cluster] = members.mean(axis=0)
+            centroids = self._normalize(centroids)
+
+        assignments = np.argmax(matrix @ centroids.T, axis=1)
+        log.info(f"Built IVF index with {nlist} lists over {count} vectors")
+        return centroids, [np.flatnonzero(assignments == cluster) for cluster in range(nlist)]
+
+    def _refresh_index(self):
+        """Build the IVF index if it is due, without holding the lock while clustering."""
+        with self._lock:
+            if not self.ivf_threshold or self._count < self.ivf_threshold or self._building:
+                return
+            # Rebuild once the store has grown by half since the last build
+            if self._centroids is not None and self._count <= self._indexed_count * 1.5:
+                return
+            self._building = True
+            count = self._count
+            # Committed rows are never rewritten and the file only grows, so
+            # this view stays valid while other threads append
+            matrix = self._vectors[:count]
+
+        try:
+            centroids, lists = self._build_index(matrix)
+        except BaseException:
+            with self._lock:
+                self._building = False
+            raise
+
+        with self._lock:
+            self._centroids, self._lists, self._indexed_count = centroids, lists, count
+            self._building = False
+
+    def _candidates(self, query):
+        # Until the first index is built, searches scan every row
+        if not self.ivf_threshold or self._count < self.ivf_threshold or self._centroids is None:
+            return None
+
+        probes = np.argsort(-(self._centroids @ query))[:self.nprobe]
+        candidates = [self._lists[cluster] for cluster in probes]
+        # Rows appended after the last build are always scanned
+        candidates.append(np.arange(self._indexed_count, self._count))
+        return np.concatenate(candidates)
+
+    def search_vector(self, embedding, k=4):
+        """Return [(row, score)] for the k most similar stored vectors."""
+        query = self._normalize(embedding)
+        self._refresh_index()
+        with self._lock:
+            if not self._count:
+                return []
+
+            candidates = self._candidates(query)
+            if candidates is None:
+                scores = self._vectors[:self._count] @ query
+                rows = np.arange(self._count)
+            else:
+                scores = self._vectors[candidates] @ query
+                rows = candidates
+
+            k = min(k, len(rows))
+            if k <= 0:
+                return []
+            top = np.argpartition(-scores, k - 1)[:k]
+            top = top[np.argsort(-scores[top])]
+            return [(int(rows[i]), float(scores[i])) for i in top]
+
+    def similarity_search_by_vector_with_score(self, embedding, k=4):
+        results = []
+        for row, score in self.search_vector(embedding, k):
+            record = self._records[row]
+            results.append((
+                Document(page_content=record["text"], metadata=record["metadata"], id=record["id"]),
+                score
+            ))
+        return results
+
+    def similarity_search_by_vector(self, embedding, k=4, **kwargs):
+        return [doc for doc, _ in self.similarity_search_by_vector_with_score(embedding, k)]
+
+    def similarity_search_with_score(self, query, k=4, **kwargs):
+        return self.similarity_search_by_vector_with_score(self.embedding.embed_query(query), k)
+
+    def similarity_search(self, query, k=4, **kwargs):
+        return [doc for doc, _ in self.similarity_search_with_score(query, k)]
+
+    def _select_relevance_score_fn(self):
+        return lambda score: (score + 1) / 2
+
+    @classmethod
+    def from_texts(cls, texts, embedding, metadatas=None, ids=None, path=None, **kwargs):
+        store = cls(embedding, path, **kwargs)
+        store.add_texts(texts, metadatas=metadatas, ids=ids)
+        return store
+
+def get_local_store(embedding, path, ivf_threshold=20000, nprobe=8):
+    """Return the shared LocalVectorStore for a directory, opening it on first use."""
+    key = str(Path(path).resolve())
+    with _stores_lock:
+        store = _stores.get(key)
+        if store is None:
+            store = LocalVectorStore(embedding, path, ivf_threshold=ivf_threshold, nprobe=nprobe)
+            _stores[key] = store
+        return store
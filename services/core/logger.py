@@ -1,13 +1,9 @@
 import logging
-import os
 
-from dotenv import load_dotenv
+from core.config import settings
 
-load_dotenv()
-
-# Load environment variables
-LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
-LOG_FORMAT = "[%(asctime)s] [%(levelname)s] [%(name)s] %(message)s"
+LOG_LEVEL = settings.LOG_LEVEL
+LOG_FORMAT = settings.LOG_FORMAT
 
 def get_logger(name: str):
     logger = logging.getLogger(name)
@@ -1,34 +1,83 @@
-import os
-import logging
-from dotenv import load_dotenv
-from pathlib import Path
-
-# Load environment variables from project root
-project_root = Path(__file__).parent.parent.parent
-env_path = project_root / '.env'
-if env_path.exists():
-    load_dotenv(dotenv_path=env_path)
-
-log = logging.getLogger(__name__)
-log.setLevel(os.getenv("LOG_LEVEL", "INFO"))
-handler = logging.StreamHandler()
-formatter = logging.Formatter(os.getenv("LOG_FORMAT", "[%(asctime)s] [%(levelname)s] [%(name)s] %(message)s"))
-handler.setFormatter(formatter)
-log.addHandler(handler)
-
-from pinecone import Pinecone
-from langchain_pinecone import PineconeVectorStore
-from .embeddings import get_embeddings
+import threading
+
 from .config import settings
+from .circuit_breaker import CircuitBreaker
+from .logger import get_logger
 
-def get_memory_store():
-    """Get Pinecone memory store with proper SDK v3+ initialization"""
-    embeddings = get_embeddings()
-    
-    # Initialize PineconeVectorStore with index name
+log = get_logger(__name__)
+
+# Memory backends selectable through settings.MEMORY_BACKEND, resolved lazily
+# so a backend's SDK (and the embeddings client) is only imported when used.
+MEMORY_BACKENDS = {
+    "pinecone": ("core.memory", "create_pinecone_store"),
+    "local": ("core.memory", "create_local_store"),
+}
+
+_store = None
+_store_lock = threading.Lock()
+
+# Shared by every memory read and write; once open, callers skip the memory
+# store immediately instead of waiting on a timeout per request.
+memory_breaker = CircuitBreaker(
+    "memory",
+    failure_threshold=settings.MEMORY_BREAKER_FAILURE_THRESHOLD,
+    reset_timeout=settings.MEMORY_BREAKER_RESET_SECONDS
+)
+
+def create_pinecone_store(embeddings):
+    from langchain_pinecone import PineconeVectorStore
+    from .pinecone_client import init_pinecone
+
+    # Reuse the verified index handle (and its HTTP connection pool)
     # This uses the new langchain-pinecone package which handles SDK v3+ properly
     return PineconeVectorStore(
-        index_name=settings.PINECONE_INDEX_NAME,
+        index=init_pinecone(),
         embedding=embeddings,
         text_key="text"
     )
+
+def create_local_store(embeddings):
+    from .local_memory import get_local_store
+
+    return get_local_store(
+        embeddings,
+        settings.LOCAL_MEMORY_PATH,
+        ivf_threshold=settings.LOCAL_MEMORY_IVF_THRESHOLD,
+        nprobe=settings.LOCAL_MEMORY_NPROBE
+    )
+
+def get_memory_store():
+    """Get the process-wide vector memory store for the backend configured in settings"""
+    global _store
+    if _store is not None:
+        return _store
+
+    with _store_lock:
+        if _store is None:
+            backend = MEMORY_BACKENDS.get(settings.MEMORY_BACKEND)
+            if backend is None:
+                raise ValueError(f"Unknown memory backend: {settings.MEMORY_BACKEND}")
+
+            from .embeddings import get_embeddings
+
+            module_name, factory_name = backend
+            module = __import__(module_name, fromlist=[factory_name])
+            _store = getattr(module, factory_name)(get_embeddings())
+            log.info(f"Memory store ready ({settings.MEMORY_BACKEND} backend)")
+
+    return _store
+
+def verify_memory_store():
+    """
+    Initialize the memory store once at startup (for Pinecone this verifies
+    or creates the index). Failures count towards memory_breaker.
+
+    Returns:
+        bool: True if the store is ready
+    """
+    try:
+        memory_breaker.call(get_memory_store)
+        return True
+    except Exception as e:
+        log.error(f"Memory store verification failed: {e}")
+        return False
@@ -0,0 +1,167 @@
+import logging
+import queue
+import threading
+import time
+
+from core.config import settings
+from core.metrics import MEMORY_SECONDS
+
+log = logging.getLogger(__name__)
+
+_writer = None
+_writer_lock = threading.Lock()
+
+_FLUSH = object()
+_STOP = object()
+
+class MemoryWriteBehind:
+    """
+    Background write-behind queue for vector memory writes.
+
+    Texts are buffered in a bounded queue and written by a worker thread in
+    batches, flushed when batch_size texts are pending or flush_interval
+    seconds have passed. Each flush is one add_texts call, i.e. one bulk
+    embedding request and one bulk upsert.
+
+    Args:
+        get_store (callable): Returns the vector store to write to
+        batch_size (int): Maximum number of texts per flush
+        flush_interval (float): Maximum seconds a text waits before being flushed
+        max_queue (int): Queue bound; submit blocks (then drops) when full
+        breaker (CircuitBreaker): Optional breaker guarding the store
+    """
+
+    def __init__(self, get_store, batch_size=32, flush_interval=1.0, max_queue=1000, breaker=None):
+        self.get_store = get_store
+        self.breaker = breaker
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.flushed = 0
+        self.failed = 0
+        self.dropped = 0
+        self.batches = 0
+        self.last_flush_seconds = 0.0
+        self.total_flush_seconds = 0.0
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._thread = threading.Thread(target=self._run, name="memory-writer", daemon=True)
+        self._thread.start()
+
+    def submit(self, text, metadata=None, timeout=0.1):
+        """
+        Queue a text for writing.
+
+        Blocks up to timeout seconds when the queue is full (backpressure), then
+        drops the text.
+
+        Returns:
+            bool: True if the text was queued
+        """
+        try:
+            if timeout:
+                self._queue.put((text, metadata or {}), timeout=timeout)
+            else:
+                self._queue.put_nowait((text, metadata or {}))
+            return True
+        except queue.Full:
+            self.dropped += 1
+            log.warning(f"Memory write queue full, dropping text ({self.dropped} dropped so far)")
+            return False
+
+    def _write(self, batch):
+        if not batch:
+            return
+        started = time.perf_counter()
+        try:
+            texts = [text for text, _ in batch]
+            metadatas = [metadata for _, metadata in batch]
+            with MEMORY_SECONDS.time(operation="write_batch"):
+                if self.breaker is not None:
+                    self.breaker.call(lambda: self.get_store().add_texts(texts, metadatas=metadatas))
+                else:
+                    self.get_store().add_texts(texts, metadatas=metadatas)
+            self.flushed += len(batch)
+        except Exception as e:
+            self.failed += len(batch)
+            log.error(f"Failed to write {len(batch)} texts to memory store: {e}")
+        self.last_flush_seconds = time.perf_counter() - started
+        self.total_flush_seconds += self.last_flush_seconds
+        self.batches += 1
+        log.debug(f"Flushed {len(batch)} texts to memory in {self.last_flush_seconds * 1000:.1f} ms")
+
+    def _run(self):
+        batch = []
+        deadline = None
+        while True:
+            timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                item = None
+
+            if item is None or item is _FLUSH or item is _STOP:
+                self._write(batch)
+                batch, deadline = [], None
+                if item is _FLUSH or item is _STOP:
+                    self._queue.task_done()
+                if item is _STOP:
+                    return
+                continue
+
+            batch.append(item)
+            self._queue.task_done()
+            if deadline is None:
+                deadline = time.monotonic() + self.flush_interval
+            if len(batch) >= self.batch_size:
+                self._write(batch)
+                batch, deadline = [], None
+
+    def flush(self):
+        """Write everything queued so far and wait for it to finish."""
+        self._queue.put(_FLUSH)
+        self._queue.join()
+
+    def close(self, timeout=10):
+        """Flush pending texts and stop the worker thread."""
+        self._queue.put(_STOP)
+        self._thread.join(timeout)
+
+    def stats(self):
+        return {
+            "queue_depth": self._queue.qsize(),
+            "flushed": self.flushed,
+            "failed": self.failed,
+            "dropped": self.dropped,
+            "batches": self.batches,
+            "last_flush_ms": self.last_flush_seconds * 1000,
+            "avg_flush_ms": self.total_flush_seconds / self.batches * 1000 if self.batches else 0.0,
+        }
+
+def get_memory_writer():
+    """Return the process-wide memory writer, starting it on first use."""
+    global _writer
+    if _writer is None:
+        with _writer_lock:
+            if _writer is None:
+                from core.memory import get_memory_store, memory_breaker
+                _writer = MemoryWriteBehind(
+                    get_memory_store,
+                    breaker=memory_breaker,
+                    batch_size=settings.MEMORY_WRITE_BATCH_SIZE,
+                    flush_interval=settings.MEMORY_WRITE_FLUSH_INTERVAL,
+                    max_queue=settings.MEMORY_WRITE_QUEUE_SIZE
+                )
+    return _writer
+
+def get_memory_writer_stats():
+    """Queue depth and flush latency of the memory writer, or None if not started."""
+    writer = _writer
+    return writer.stats() if writer is not None else None
+
+def close_memory_writer():
+    """Flush and stop the memory writer if it was started."""
+    global _writer
+    with _writer_lock:
+        writer, _writer = _writer, None
+    if writer is not None:
+        writer.close()
+        log.info(f"Memory writer stopped: {writer.stats()}")
@@ -0,0 +1,249 @@
+import bisect
+import logging
+import math
+import threading
+import time
+from contextlib import contextmanager
+
+log = logging.getLogger(__name__)
+
+# Latency buckets in seconds, from a cache hit to a slow LLM call
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def _format_labels(names, values, extra=None):
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(f'{extra[0]}="{extra[1]}"')
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+def _format_value(value):
+    if value == math.inf:
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+class _Metric:
+    type = None
+
+    def __init__(self, name, help, labelnames=()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def _key(self, labels):
+        try:
+            return tuple(labels[name] for name in self.labelnames)
+        except KeyError as e:
+            raise ValueError(f"{self.name}: missing label {e}") from None
+
+    def clear(self):
+        with self._lock:
+            self._values.clear()
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.type}"]
+        with self._lock:
+            items = list(self._values.items())
+        for key, value in items:
+            lines.extend(self._render_sample(key, value))
+        return lines
+
+    def _render_sample(self, key, value):
+        return [f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"]
+
+class Counter(_Metric):
+    """Monotonically increasing count, e.g. tokens used."""
+
+    type = "counter"
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+class Gauge(_Metric):
+    """Value that can go up and down, e.g. a queue depth."""
+
+    type = "gauge"
+
+    def set(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+class Histogram(_Metric):
+    """
+    Distribution of observed values in fixed buckets.
+
+    An observation is one bisect and three increments under a lock, so it is
+    cheap enough for every node, tool and LLM call. Buckets are stored
+    non-cumulatively and summed when rendered.
+
+    If "status" is one of the label names, time() fills it in with "ok" or
+    "error" depending on whether the block raised.
+    """
+
+    type = "histogram"
+
+    def __init__(self, name, help, labelnames=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, help, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._values.get(key)
+            if series is None:
+                series = self._values[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    @contextmanager
+    def time(self, **labels):
+        started = time.perf_counter()
+        status = "ok"
+        try:
+            yield
+        except BaseException:
+            status = "error"
+            raise
+        finally:
+            if "status" in self.labelnames:
+                labels.setdefault("status", status)
+            self.observe(time.perf_counter() - started, **labels)
+
+    def _render_sample(self, key, value):
+        counts, total, count = value
+        labels = _format_labels(self.labelnames, key)
+        lines = []
+        cumulative = 0
+        for bound, bucket_count in zip(self.buckets + (math.inf,), counts):
+            cumulative += bucket_count
+            bucket_labels = _format_labels(self.labelnames, key, ("le", _format_value(bound)))
+            lines.append(f"{self.name}_bucket{bucket_labels} {cumulative}")
+        lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+        lines.append(f"{self.name}_count{labels} {count}")
+        return lines
+
+class MetricsRegistry:
+    """
+    Metrics exposed on /metrics.
+
+    Besides metrics updated on the hot path, collectors are called at scrape
+    time; each returns (name, help, [(labels, value), ...]) tuples rendered as
+    gauges. They export the stats() counters the components already keep.
+    """
+
+    def __init__(self):
+        self._metrics = {}
+        self._collectors = []
+        self._lock = threading.Lock()
+
+    def register(self, metric):
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError(f"Metric already registered: {metric.name}")
+            self._metrics[metric.name] = metric
+        return metric
+
+    def register_collector(self, collector):
+        with self._lock:
+            self._collectors.append(collector)
+        return collector
+
+    def counter(self, name, help, labelnames=()):
+        return self.register(Counter(name, help, labelnames))
+
+    def gauge(self, name, help, labelnames=()):
+        return self.register(Gauge(name, help, labelnames))
+
+    def histogram(self, name, help, labelnames=(), buckets=DEFAULT_BUCKETS):
+        return self.register(Histogram(name, help, labelnames, buckets))
+
+    def render(self):
+        """Return every metric in the Prometheus text exposition format."""
+        lines = []
+        for metric in list(self._metrics.values()):
+            lines.extend(metric.render())
+
+        for collector in list(self._collectors):
+            try:
+                families = list(collector())
+            except Exception as e:
+                log.warning(f"Metrics collector {getattr(collector, '__name__', collector)} failed: {e}")
+                continue
+            for name, help, samples in families:
+                lines.append(f"# HELP {name} {help}")
+                lines.append(f"# TYPE {name} gauge")
+                for labels, value in samples:
+                    label_text = _format_labels(labels.keys(), labels.values())
+                    lines.append(f"{name}{label_text} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+def stats_families(prefix, stats, labels=None):
+    """
+    Turn a stats() dict into gauge families named {prefix}_{key}.
+
+    Nested dicts are flattened into the name, except for keys listed in labels,
+    whose dicts become one family with a label per entry, e.g.
+    {"jobs": "status"} turns {"jobs": {"pending": 2}} into
+    {prefix}_jobs{status="pending"} 2. Non-numeric values are skipped.
+    """
+    labels = labels or {}
+    families = []
+    for key, value in (stats or {}).items():
+        name = f"{prefix}_{key}"
+        if key in labels and isinstance(value, dict):
+            samples = [
+                ({labels[key]: entry}, number) for entry, number in value.items()
+                if isinstance(number, (int, float))
+            ]
+            families.append((name, f"{key} by {labels[key]}", samples))
+        elif isinstance(value, dict):
+            families.extend(stats_families(name, value, labels))
+        elif isinstance(value, (int, float)):
+            families.append((name, key.replace("_", " "), [({}, int(value) if isinstance(value, bool) else value)]))
+    return families
+
+def stats_collector(prefix, get_stats, labels=None):
+    """Collector exporting get_stats() through stats_families; None stats export nothing."""
+    def collect():
+        return stats_families(prefix, get_stats(), labels)
+    collect.__name__ = f"{prefix}_collector"
+    return collect
+
+REGISTRY = MetricsRegistry()
+
+NODE_SECONDS = REGISTRY.histogram(
+    "agent_node_duration_seconds", "Graph node latency", ("node", "status")
+)
+TOOL_SECONDS = REGISTRY.histogram(
+    "agent_tool_duration_seconds", "Tool call latency; bulk calls are timed once", ("tool", "mode", "status")
+)
+LLM_SECONDS = REGISTRY.histogram(
+    "agent_llm_duration_seconds", "LLM call latency", ("model", "node", "status")
+)
+LLM_TOKENS = REGISTRY.counter(
+    "agent_llm_tokens_total", "LLM tokens used", ("model", "node", "type")
+)
+MEMORY_SECONDS = REGISTRY.histogram(
+    "agent_memory_duration_seconds", "Vector memory operation latency", ("operation", "status")
+)
+
+PROMPT_TOKENS = REGISTRY.histogram(
+    "agent_prompt_tokens", "Prompt size in tokens after budgeting", ("stage",),
+    buckets=(64, 128, 256, 512, 1024, 2048, 4096, 8192, 16384)
+)
+PROMPT_COMPRESSIONS = REGISTRY.counter(
+    "agent_prompt_compressions_total", "Prompt entries deduplicated, truncated, summarized or dropped",
+    ("stage", "section", "action")
+)
+
+def render_metrics():
+    return REGISTRY.render()
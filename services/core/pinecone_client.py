@@ -1,35 +1,57 @@
-import os
 import logging
-from dotenv import load_dotenv
+import threading
 from core.config import settings
-from pinecone import Pinecone
-
-load_dotenv()
 
 log = logging.getLogger(__name__)
-log.setLevel(os.getenv("LOG_LEVEL", "INFO"))
+log.setLevel(settings.LOG_LEVEL)
+
+# One client and index handle per process so HTTP connections are reused
+_client = None
+_index = None
+_lock = threading.RLock()
+
+def get_pinecone():
+    """Return the shared Pinecone client."""
+    global _client
+    if _client is None:
+        with _lock:
+            if _client is None:
+                # Imported on first use so the SDK only loads with the Pinecone backend
+                from pinecone import Pinecone
+                _client = Pinecone(api_key=settings.PINECONE_API_KEY)
+    return _client
 
 def init_pinecone():
-    log.info("Initializing Pinecone")
-    
-    # Use settings from config
-    pc = Pinecone(api_key=settings.PINECONE_API_KEY)
-    
-    index_name = settings.PINECONE_INDEX_NAME
-    
-    # Check if index exists
-    existing_indexes = [index.name for index in pc.list_indexes()]
-    if index_name not in existing_indexes:
-        log.info(f"Creating Pinecone index: {index_name}")
-        pc.create_index(
-            name=index_name,
-            dimension=1536,
-            metric="cosine",
-            spec={"serverless": {"cloud": "aws", "region": settings.PINECONE_REGION}}
-        )
-    
-    log.info(f"Returning Pinecone index: {index_name}")
-    # Use index name only for SDK v3+
-    return pc.Index(index_name)
+    """
+    Verify (and create if missing) the configured index, then return its handle.
+
+    The check runs once per process; later calls return the cached index.
+    """
+    global _index
+    if _index is not None:
+        return _index
+
+    with _lock:
+        if _index is not None:
+            return _index
+
+        log.info("Initializing Pinecone")
+        pc = get_pinecone()
+
+        index_name = settings.PINECONE_INDEX_NAME
 
+        # Check if index exists
+        existing_indexes = [index.name for index in pc.list_indexes()]
+        if index_name not in existing_indexes:
+            log.info(f"Creating Pinecone index: {index_name}")
+            pc.create_index(
+                name=index_name,
+                dimension=1536,
+                metric="cosine",
+                spec={"serverless": {"cloud": "aws", "region": settings.PINECONE_REGION}}
+            )
 
+        log.info(f"Returning Pinecone index: {index_name}")
+        # Use index name only for SDK v3+
+        _index = pc.Index(index_name)
+        return _index
@@ -4,6 +4,6 @@ from core.logger import get_logger
 
 log = get_logger(__name__)
 
-def create_calendar_event(title="Meeting"):
-    log.info(f"Creating calendar event: {title}")
+def create_calendar_event(title="Meeting", start_time=None, end_time=None):
+    log.info(f"Creating calendar event: {title} ({start_time} - {end_time})")
     return f"Calendar event created: {title}"
@@ -2,6 +2,6 @@ import logging
 
 log = logging.getLogger(__name__)
 
-def read_email():
-    log.info("Reading latest email")
+def read_email(folder="inbox"):
+    log.info(f"Reading latest email from {folder}")
     return "Read latest email"
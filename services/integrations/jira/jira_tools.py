@@ -1,10 +1,31 @@
 import logging
 import requests
 from requests.auth import HTTPBasicAuth
-import os
+
+from core.config import settings
+from core.http import get_http_client
 
 log = logging.getLogger(__name__)
 
+def _missing_settings():
+    return [name for name, value in {
+        'JIRA_BASE_URL': settings.JIRA_BASE_URL,
+        'JIRA_EMAIL': settings.JIRA_EMAIL,
+        'JIRA_API_TOKEN': settings.JIRA_API_TOKEN
+    }.items() if not value]
+
+def _get_client():
+    # One pooled session per process; auth and headers are set once
+    return get_http_client(
+        "jira",
+        base_url=settings.JIRA_BASE_URL,
+        auth=HTTPBasicAuth(settings.JIRA_EMAIL, settings.JIRA_API_TOKEN),
+        headers={
+            "Accept": "application/json",
+            "Content-Type": "application/json"
+        }
+    )
+
 def create_jira_ticket(summary, description, project_key="PROJ"):
     """
     Create a Jira ticket with the given summary and description.
@@ -17,42 +38,18 @@ def create_jira_ticket(summary, description, project_key="PROJ"):
     Returns:
         dict: Response from Jira API or error information
     """
-    # Validate required environment variables
-    jira_base_url = os.getenv('JIRA_BASE_URL')
-    jira_email = os.getenv('JIRA_EMAIL')
-    jira_api_token = os.getenv('JIRA_API_TOKEN')
-    
-    if not all([jira_base_url, jira_email, jira_api_token]):
-        missing_vars = [var for var, value in {
-            'JIRA_BASE_URL': jira_base_url,
-            'JIRA_EMAIL': jira_email,
-            'JIRA_API_TOKEN': jira_api_token
-        }.items() if not value]
+    # Validate required settings
+    missing_vars = _missing_settings()
+    if missing_vars:
         error_msg = f"Missing required environment variables: {', '.join(missing_vars)}"
         log.error(error_msg)
         return {"error": error_msg}
     
-    url = f"{jira_base_url}/rest/api/3/issue"
-    
-    auth = HTTPBasicAuth(jira_email, jira_api_token)
-    
-    headers = {
-        "Accept": "application/json",
-        "Content-Type": "application/json"
-    }
-    
-    payload = {
-        "fields": {
-            "project": {"key": project_key},
-            "summary": summary,
-            "description": description,
-            "issuetype": {"name": "Task"}
-        }
-    }
+    payload = _issue_payload(summary, description, project_key)
     
     try:
         log.info(f"Creating Jira ticket: {summary} in project {project_key}")
-        response = requests.post(url, json=payload, headers=headers, auth=auth, timeout=30)
+        response = _get_client().post("/rest/api/3/issue", json=payload)
         
         if response.status_code == 201:
             result = response.json()
@@ -71,3 +68,83 @@ def create_jira_ticket(summary, description, project_key="PROJ"):
         error_msg = f"Unexpected error: {str(e)}"
         log.error(error_msg)
         return {"error": error_msg}
+
+def _issue_payload(summary, description, project_key="PROJ"):
+    return {
+        "fields": {
+            "project": {"key": project_key},
+            "summary": summary,
+            "description": description,
+            "issuetype": {"name": "Task"}
+        }
+    }
+
+def _bulk_chunk(chunk):
+    """Create one chunk of issues; returns one result per issue, in order."""
+    response = _get_client().post(
+        "/rest/api/3/issue/bulk",
+        json={"issueUpdates": [_issue_payload(**issue) for issue in chunk]}
+    )
+
+    succeeded = response.status_code in (200, 201)
+    try:
+        body = response.json()
+    except ValueError:
+        body = None
+    # Jira answers 400 when every element failed, still with per-element errors
+    if not succeeded and not (isinstance(body, dict) and body.get("errors")):
+        error_msg = f"Failed to create Jira tickets in bulk. Status: {response.status_code}, Response: {response.text}"
+        log.error(error_msg)
+        return [{"error": error_msg} for _ in chunk]
+    if not succeeded:
+        log.error(f"Failed to create {len(body['errors'])} of {len(chunk)} Jira tickets in bulk. Status: {response.status_code}")
+
+    results = [None] * len(chunk)
+    for error in body.get("errors", []):
+        index = error.get("failedElementNumber")
+        if isinstance(index, int) and 0 <= index < len(chunk):
+            details = error.get("elementErrors", {})
+            results[index] = {
+                "error": f"Failed to create Jira ticket. Status: {error.get('status')}, Response: {details}"
+            }
+
+    # Created issues are listed in request order, skipping failed elements
+    created = iter(body.get("issues", []))
+    for index, result in enumerate(results):
+        if result is None:
+            results[index] = next(created, {"error": "Jira bulk response did not include this issue"})
+    return results
+
+def create_jira_tickets_bulk(issues):
+    """
+    Create several Jira tickets through the bulk issue-create endpoint.
+
+    Args:
+        issues (list): Keyword arguments for create_jira_ticket, one dict per ticket
+
+    Returns:
+        list: One result per issue, in the same order: the created issue
+            ({"id", "key", "self"}) or {"error": ...}
+    """
+    missing_vars = _missing_settings()
+    if missing_vars:
+        error_msg = f"Missing required environment variables: {', '.join(missing_vars)}"
+        log.error(error_msg)
+        return [{"error": error_msg} for _ in issues]
+
+    results = []
+    chunk_size = settings.JIRA_BULK_CHUNK_SIZE
+    for start in range(0, len(issues), chunk_size):
+        chunk = issues[start:start + chunk_size]
+        try:
+            log.info(f"Creating {len(chunk)} Jira tickets in bulk")
+            results.extend(_bulk_chunk(chunk))
+        except requests.exceptions.RequestException as e:
+            error_msg = f"Request failed: {str(e)}"
+            log.error(error_msg)
+            results.extend({"error": error_msg} for _ in chunk)
+        except Exception as e:
+            error_msg = f"Unexpected error: {str(e)}"
+            log.error(error_msg)
+            results.extend({"error": error_msg} for _ in chunk)
+    return results
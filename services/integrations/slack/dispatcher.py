@@ -0,0 +1,219 @@
+import logging
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from slack_sdk.errors import SlackApiError
+
+log = logging.getLogger(__name__)
+
+class SlackQueueFull(RuntimeError):
+    """Raised (through the returned future) when a channel queue is full."""
+
+class _Channel:
+    def __init__(self):
+        self.pending = deque()
+        self.next_allowed = 0.0
+        self.in_flight = False
+
+class SlackDispatcher:
+    """
+    Outbound Slack queue with per-channel rate limiting and optional coalescing.
+
+    Messages are queued per channel. One scheduler thread picks the channels
+    that are due and hands their posts to a pool of post_workers threads, with
+    at most one post in flight per channel, so a slow or hanging post only
+    holds up its own channel (up to post_workers channels can be slow at once).
+    Each channel is posted to at most once per min_interval seconds (Slack
+    allows about one chat.postMessage per second per channel). A 429 response pauses
+    the channel for Retry-After seconds and the messages are retried. With a
+    coalesce window, messages queued for the same channel within the window are
+    merged into one post, separated by newlines.
+
+    Args:
+        client: slack_sdk WebClient
+        coalesce_window (float): Seconds to wait for more messages to merge; 0 disables merging
+        min_interval (float): Minimum seconds between posts to the same channel
+        max_queue_per_channel (int): Pending messages allowed per channel
+        max_coalesce (int): Maximum messages merged into one post
+        post_workers (int): Threads posting to different channels concurrently
+    """
+
+    def __init__(self, client, coalesce_window=0.0, min_interval=1.0,
+                 max_queue_per_channel=100, max_coalesce=20, post_workers=4):
+        self.client = client
+        self.coalesce_window = coalesce_window
+        self.min_interval = min_interval
+        self.max_queue_per_channel = max_queue_per_channel
+        self.max_coalesce = max_coalesce
+        self.sent = 0
+        self.posts = 0
+        self.coalesced = 0
+        self.throttled = 0
+        self.throttled_seconds = 0.0
+        self.rejected = 0
+        self.failed = 0
+        self._channels = {}
+        self._condition = threading.Condition()
+        self._stopped = False
+        self._pool = ThreadPoolExecutor(max_workers=max(post_workers, 1), thread_name_prefix="slack-post")
+        self._thread = threading.Thread(target=self._run, name="slack-dispatcher", daemon=True)
+        self._thread.start()
+
+    def submit(self, channel, text):
+        """
+        Queue a message.
+
+        Returns:
+            Future: Resolves to the chat.postMessage response of the post that
+                carried the message, or raises SlackApiError/SlackQueueFull.
+                Cancelling it while the message is still queued drops the message.
+        """
+        future = Future()
+        with self._condition:
+            state = self._channels.setdefault(channel, _Channel())
+            if len(state.pending) >= self.max_queue_per_channel:
+                self.rejected += 1
+                future.set_exception(SlackQueueFull(f"Slack queue for {channel} is full"))
+                return future
+            state.pending.append((time.monotonic(), text, future))
+            self._condition.notify()
+        return future
+
+    def _due(self, now):
+        """Return (channel, wait): a channel ready to post, or how long to wait."""
+        wait = None
+        for channel, state in self._channels.items():
+            # A channel with a post in flight is rescheduled when the post finishes
+            if not state.pending or state.in_flight:
+                continue
+            ready_at = max(state.next_allowed, state.pending[0][0] + self.coalesce_window)
+            if ready_at <= now:
+                return channel, 0.0
+            wait = ready_at - now if wait is None else min(wait, ready_at - now)
+        return None, wait
+
+    def _take(self, channel):
+        state = self._channels[channel]
+        count = self.max_coalesce if self.coalesce_window > 0 else 1
+        batch = []
+        while state.pending and len(batch) < count:
+            item = state.pending.popleft()
+            # Callers cancel the future when they give up waiting; those messages
+            # are dropped, and the rest can no longer be cancelled once taken
+            # (messages re-queued after a 429 are already running)
+            if item[2].running() or item[2].set_running_or_notify_cancel():
+                batch.append(item)
+        return batch
+
+    def _run(self):
+        while True:
+            batch = []
+            try:
+                with self._condition:
+                    while True:
+                        if self._stopped and not any(
+                            s.pending or s.in_flight for s in self._channels.values()
+                        ):
+                            return
+                        channel, wait = self._due(time.monotonic())
+                        if channel is not None:
+                            batch = self._take(channel)
+                            if batch:
+                                self._channels[channel].in_flight = True
+                            break
+                        self._condition.wait(wait)
+                if batch:
+                    self._pool.submit(self._dispatch, channel, batch)
+            except Exception as e:
+                # The scheduler is the only consumer; it must survive any bug
+                log.exception(f"Slack dispatcher error: {e}")
+                self._resolve(batch, exception=e)
+                if batch:
+                    self._release(channel)
+
+    def _dispatch(self, channel, batch):
+        try:
+            self._post(channel, batch)
+        except Exception as e:
+            log.exception(f"Slack dispatcher error: {e}")
+            self._resolve(batch, exception=e)
+        finally:
+            self._release(channel)
+
+    def _release(self, channel):
+        with self._condition:
+            self._channels[channel].in_flight = False
+            self._condition.notify()
+
+    @staticmethod
+    def _resolve(batch, result=None, exception=None):
+        for item in batch:
+            future = item[2]
+            if future.done():
+                continue
+            if exception is not None:
+                future.set_exception(exception)
+            else:
+                future.set_result(result)
+
+    def _post(self, channel, batch):
+        text = "\n".join(item[1] for item in batch)
+        try:
+            response = self.client.chat_postMessage(channel=channel, text=text)
+        except SlackApiError as e:
+            if e.response.status_code == 429:
+                retry_after = float(e.response.headers.get("Retry-After", 1))
+                log.warning(f"Slack rate limited on {channel}, retrying in {retry_after}s")
+                with self._condition:
+                    self.throttled += 1
+                    self.throttled_seconds += retry_after
+                    state = self._channels[channel]
+                    state.pending.extendleft(reversed(batch))
+                    state.next_allowed = time.monotonic() + retry_after
+                return
+            self._fail(batch, e)
+            return
+        except Exception as e:
+            self._fail(batch, e)
+            return
+        finally:
+            with self._condition:
+                state = self._channels[channel]
+                state.next_allowed = max(state.next_allowed, time.monotonic() + self.min_interval)
+
+        with self._condition:
+            self.posts += 1
+            self.sent += len(batch)
+            self.coalesced += len(batch) - 1
+        self._resolve(batch, result=response)
+
+    def _fail(self, batch, exception):
+        with self._condition:
+            self.failed += len(batch)
+        self._resolve(batch, exception=exception)
+
+    def close(self, timeout=10):
+        """Post everything still queued, then stop the workers."""
+        with self._condition:
+            self._stopped = True
+            self._condition.notify()
+        self._thread.join(timeout)
+        self._pool.shutdown(wait=False)
+
+    def stats(self):
+        with self._condition:
+            depth = {channel: len(state.pending) for channel, state in self._channels.items()}
+            return {
+                "queue_depth": sum(depth.values()),
+                "queue_depth_by_channel": depth,
+                "in_flight": sum(1 for state in self._channels.values() if state.in_flight),
+                "messages_sent": self.sent,
+                "posts": self.posts,
+                "coalesced": self.coalesced,
+                "throttled": self.throttled,
+                "throttled_seconds": self.throttled_seconds,
+                "rejected": self.rejected,
+                "failed": self.failed,
+            }
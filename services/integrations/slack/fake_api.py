@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Local fake of the Slack Web API for tests and offline runs.
+
+Implements chat.postMessage and auth.test. Point the agent at it with
+SLACK_API_BASE_URL=http://127.0.0.1:<port>/api/ and any SLACK_BOT_TOKEN.
+
+    python services/integrations/slack/fake_api.py --port 8900 --rate-limit-every 5
+"""
+
+import argparse
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs
+
+class FakeSlackAPI:
+    """
+    In-process fake Slack API server.
+
+    Args:
+        host (str): Interface to bind
+        port (int): Port to bind; 0 picks a free port
+        rate_limit_every (int): Answer every Nth chat.postMessage with 429; 0 disables it
+        retry_after (int): Retry-After seconds sent with 429 responses
+        latency (float): Seconds to sleep before answering
+        channel_latency (dict): Extra seconds to sleep before answering posts to a channel
+    """
+
+    def __init__(self, host="127.0.0.1", port=0, rate_limit_every=0, retry_after=1, latency=0.0,
+                 channel_latency=None):
+        self.rate_limit_every = rate_limit_every
+        self.retry_after = retry_after
+        self.latency = latency
+        self.channel_latency = dict(channel_latency or {})
+        self.messages = []
+        self.requests = 0
+        self.rate_limited = 0
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), self._handler())
+        self._thread = None
+
+    @property
+    def base_url(self):
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/api/"
+
+    def _handler(self):
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def _reply(self, status, body, headers=None):
+                data = json.dumps(body).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(data)
+
+            def _params(self):
+                raw = self.rfile.read(int(self.headers.get("Content-Length", 0))).decode("utf-8")
+                if self.headers.get("Content-Type", "").startswith("application/json"):
+                    return json.loads(raw or "{}")
+                return {key: values[0] for key, values in parse_qs(raw).items()}
+
+            def do_POST(self):
+                params = self._params()
+                delay = fake.latency + fake.channel_latency.get(params.get("channel"), 0.0)
+                if delay:
+                    time.sleep(delay)
+
+                if self.path.endswith("/auth.test"):
+                    return self._reply(200, {"ok": True, "user_id": "UFAKE", "team_id": "TFAKE"})
+                if not self.path.endswith("/chat.postMessage"):
+                    return self._reply(404, {"ok": False, "error": "unknown_method"})
+
+                with fake._lock:
+                    fake.requests += 1
+                    if fake.rate_limit_every and fake.requests % fake.rate_limit_every == 0:
+                        fake.rate_limited += 1
+                        return self._reply(
+                            429, {"ok": False, "error": "ratelimited"},
+                            {"Retry-After": str(fake.retry_after)}
+                        )
+                    if not params.get("channel"):
+                        return self._reply(200, {"ok": False, "error": "channel_not_found"})
+                    ts = f"{time.time():.6f}"
+                    fake.messages.append({"channel": params["channel"], "text": params.get("text", ""), "ts": ts})
+
+                self._reply(200, {"ok": True, "channel": params["channel"], "ts": ts})
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8900)
+    parser.add_argument("--rate-limit-every", type=int, default=0)
+    parser.add_argument("--retry-after", type=int, default=1)
+    parser.add_argument("--latency", type=float, default=0.0)
+    args = parser.parse_args()
+
+    fake = FakeSlackAPI(args.host, args.port, args.rate_limit_every, args.retry_after, args.latency)
+    print(f"Fake Slack API listening on {fake.base_url}")
+    try:
+        fake._server.serve_forever()
+    except KeyboardInterrupt:
+        fake.stop()
+
+if __name__ == "__main__":
+    main()
@@ -1,41 +1,147 @@
-import os
+import asyncio
+import concurrent.futures
 import logging
-from dotenv import load_dotenv
-from slack_sdk import WebClient
-from slack_sdk.errors import SlackApiError
-from pathlib import Path
+import threading
 
+from core.config import settings
 
-# Load environment variables from project root
-project_root = Path(__file__).parent.parent.parent.parent
-env_path = project_root / '.env'
-if env_path.exists():
-    load_dotenv(dotenv_path=env_path)
 
 log = logging.getLogger(__name__)
 
-# Initialize Slack client with bot token
-slack_token = os.getenv("SLACK_BOT_TOKEN")
-if not slack_token:
-    # Try loading directly from env file
-    load_dotenv('.env')
-    slack_token = os.getenv("SLACK_BOT_TOKEN")
+# Slack bot token
+slack_token = settings.SLACK_BOT_TOKEN
 
-client = WebClient(token=slack_token) if slack_token else None
+# Clients and the outbound dispatcher (and slack_sdk itself) are loaded on first use
+_client = None
+_async_client = None
+_dispatcher = None
+_lock = threading.Lock()
+
+
+def _get_client():
+    global _client
+    if _client is None and slack_token:
+        with _lock:
+            if _client is None:
+                from slack_sdk import WebClient
+                _client = WebClient(token=slack_token, base_url=settings.SLACK_API_BASE_URL)
+    return _client
+
+
+def _get_async_client():
+    global _async_client
+    if _async_client is None and slack_token:
+        # Imported lazily because the async client pulls in aiohttp
+        from slack_sdk.web.async_client import AsyncWebClient
+        _async_client = AsyncWebClient(token=slack_token, base_url=settings.SLACK_API_BASE_URL)
+    return _async_client
+
+
+def get_dispatcher():
+    """Return the shared outbound Slack dispatcher, starting it on first use."""
+    global _dispatcher
+    if _dispatcher is None:
+        client = _get_client()
+        with _lock:
+            if _dispatcher is None:
+                from integrations.slack.dispatcher import SlackDispatcher
+                _dispatcher = SlackDispatcher(
+                    client,
+                    coalesce_window=settings.SLACK_COALESCE_WINDOW_MS / 1000,
+                    min_interval=settings.SLACK_MIN_POST_INTERVAL,
+                    max_queue_per_channel=settings.SLACK_MAX_QUEUE_PER_CHANNEL,
+                    post_workers=settings.SLACK_POST_WORKERS
+                )
+    return _dispatcher
+
+
+def get_dispatcher_stats():
+    """Queue and throttle metrics of the dispatcher, or None if not started."""
+    dispatcher = _dispatcher
+    return dispatcher.stats() if dispatcher is not None else None
+
+
+def close_dispatcher():
+    """Post queued messages and stop the dispatcher if it was started."""
+    global _dispatcher
+    with _lock:
+        dispatcher, _dispatcher = _dispatcher, None
+    if dispatcher is not None:
+        dispatcher.close()
+
+
+def _wait_for_post(future):
+    """Wait for a queued post; on timeout drop the message if it was not sent yet."""
+    try:
+        return future.result(timeout=settings.SLACK_SEND_TIMEOUT)
+    except concurrent.futures.TimeoutError:
+        if future.cancel():
+            raise TimeoutError("timed out waiting in the Slack queue; the message was not sent")
+        # Already being posted: report what actually happened to it
+        return future.result()
+
+
+async def _await_post(future):
+    """Async variant of _wait_for_post; a cancelled caller also drops a queued message."""
+    posted = asyncio.wrap_future(future)
+    try:
+        # shield() so a timeout does not cancel a message that is already being posted
+        return await asyncio.wait_for(asyncio.shield(posted), timeout=settings.SLACK_SEND_TIMEOUT)
+    except asyncio.TimeoutError:
+        if future.cancel():
+            raise TimeoutError("timed out waiting in the Slack queue; the message was not sent")
+        return await posted
+    except asyncio.CancelledError:
+        future.cancel()
+        raise
 
 
 def post_slack_message(channel="#general", text=""):
     """Post a message to a Slack channel"""
-    if not client:
+    if not slack_token:
+        log.error("Slack bot token not configured")
+        return "Error: Slack bot token not configured"
+
+    from slack_sdk.errors import SlackApiError
+
+    try:
+        log.info(f"Posting Slack message to {channel}")
+        if settings.SLACK_DISPATCHER_ENABLED:
+            response = _wait_for_post(get_dispatcher().submit(channel, text))
+        else:
+            response = _get_client().chat_postMessage(
+                channel=channel,
+                text=text
+            )
+        log.info(f"Message sent successfully: {response['ts']}")
+        return f"Slack message sent to {channel}: {text}"
+    except SlackApiError as e:
+        error_msg = f"Slack API error: {e.response['error']}"
+        log.error(error_msg)
+        return error_msg
+    except Exception as e:
+        error_msg = f"Error sending Slack message: {str(e)}"
+        log.error(error_msg)
+        return error_msg
+
+
+async def apost_slack_message(channel="#general", text=""):
+    """Post a message to a Slack channel without blocking the event loop"""
+    if not slack_token:
         log.error("Slack bot token not configured")
         return "Error: Slack bot token not configured"
-    
+
+    from slack_sdk.errors import SlackApiError
+
     try:
         log.info(f"Posting Slack message to {channel}")
-        response = client.chat_postMessage(
-            channel=channel,
-            text=text
-        )
+        if settings.SLACK_DISPATCHER_ENABLED:
+            response = await _await_post(get_dispatcher().submit(channel, text))
+        else:
+            response = await _get_async_client().chat_postMessage(
+                channel=channel,
+                text=text
+            )
         log.info(f"Message sent successfully: {response['ts']}")
         return f"Slack message sent to {channel}: {text}"
     except SlackApiError as e:
@@ -14,7 +14,6 @@ sys.path.insert(0, str(services_path))
 from core.logger import get_logger
 from core.config import settings
 from core.langsmith import setup_langsmith
-from core.llm import get_llm
 
 def main():
     """Main entry point for core service"""
@@ -32,6 +31,8 @@ def main():
     
     # Test LLM connection
     try:
+        # Imported here: the LangChain/OpenAI stack dominates import time
+        from core.llm import get_llm
         llm = get_llm()
         logger.info(f"LLM initialized with model: {settings.MODEL_NAME}")
         
@@ -0,0 +1,7 @@
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# Same import layout as main.py: services modules are imported as core.x, agent.x, integrations.x
+sys.path[:0] = [str(ROOT), str(ROOT / "services")]
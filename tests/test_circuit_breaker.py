@@ -0,0 +1,24 @@
+from core.circuit_breaker import CircuitBreaker
+from core.metrics import stats_families
+
+
+def state_samples(breaker):
+    families = {name: samples for name, _, samples in stats_families("circuit", breaker.stats())}
+    return families["circuit_state_code"]
+
+
+def test_state_is_exported_as_a_number():
+    breaker = CircuitBreaker("test", failure_threshold=1, reset_timeout=0.0)
+    assert state_samples(breaker) == [({}, 0)]
+
+    breaker.reset_timeout = 60.0
+    breaker.record_failure()
+    assert breaker.stats()["state"] == "open"
+    assert state_samples(breaker) == [({}, 2)]
+
+    breaker.reset_timeout = 0.0
+    assert breaker.stats()["state"] == "half_open"
+    assert state_samples(breaker) == [({}, 1)]
+
+    breaker.record_success()
+    assert state_samples(breaker) == [({}, 0)]
@@ -0,0 +1,144 @@
+"""HTTPClient retry behaviour against a local stub HTTP server."""
+
+import json
+import socket
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+
+from core.http import HTTPClient, parse_retry_after
+
+
+class StubServer:
+    """Answers each request with the next scripted (status, delay) and counts requests."""
+
+    def __init__(self, script):
+        self.script = list(script)
+        self.requests = []
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def url(self):
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def _handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def _answer(self):
+                self.rfile.read(int(self.headers.get("Content-Length", 0)))
+                with stub._lock:
+                    stub.requests.append((self.command, self.path))
+                    status, delay = stub.script.pop(0) if stub.script else (200, 0)
+                if delay:
+                    time.sleep(delay)
+                body = json.dumps({"status": status}).encode("utf-8")
+                try:
+                    self.send_response(status)
+                    self.send_header("Content-Type", "application/json")
+                    self.send_header("Content-Length", str(len(body)))
+                    if status in (429, 503):
+                        self.send_header("Retry-After", "0")
+                    self.end_headers()
+                    self.wfile.write(body)
+                except (BrokenPipeError, ConnectionResetError):
+                    pass
+
+            do_GET = _answer
+            do_POST = _answer
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._server.shutdown()
+        self._server.server_close()
+
+
+def _client(base_url, **kwargs):
+    kwargs.setdefault("max_retries", 3)
+    return HTTPClient(base_url, backoff_base=0.01, backoff_max=0.05, **kwargs)
+
+
+@pytest.mark.parametrize("status", [429, 502, 503, 504])
+def test_get_retries_retryable_statuses(status):
+    with StubServer([(status, 0), (200, 0)]) as stub:
+        response = _client(stub.url).get("/item")
+    assert response.status_code == 200
+    assert len(stub.requests) == 2
+
+
+@pytest.mark.parametrize("status", [429, 503])
+def test_post_retries_when_request_was_refused(status):
+    with StubServer([(status, 0), (201, 0)]) as stub:
+        response = _client(stub.url).post("/issue", json={"a": 1})
+    assert response.status_code == 201
+    assert len(stub.requests) == 2
+
+
+@pytest.mark.parametrize("status", [500, 502, 504])
+def test_post_is_not_retried_after_it_may_have_been_processed(status):
+    with StubServer([(status, 0), (201, 0)]) as stub:
+        response = _client(stub.url).post("/issue", json={"a": 1})
+    assert response.status_code == status
+    assert len(stub.requests) == 1
+
+
+def test_post_retried_on_gateway_error_when_marked_idempotent():
+    with StubServer([(504, 0), (201, 0)]) as stub:
+        response = _client(stub.url).request("POST", "/issue", idempotent=True, json={"a": 1})
+    assert response.status_code == 201
+    assert len(stub.requests) == 2
+
+
+def test_post_is_not_retried_on_read_timeout():
+    with StubServer([(201, 0.5), (201, 0)]) as stub:
+        client = _client(stub.url, timeout=0.1)
+        with pytest.raises(requests.ReadTimeout):
+            client.post("/issue", json={"a": 1})
+        time.sleep(0.5)
+    assert len(stub.requests) == 1
+
+
+def test_get_is_retried_on_read_timeout():
+    with StubServer([(200, 0.5), (200, 0)]) as stub:
+        response = _client(stub.url, timeout=0.2).get("/item")
+    assert response.status_code == 200
+    assert len(stub.requests) == 2
+
+
+def test_post_is_retried_when_connection_is_refused():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    # Nothing listens on the port, so the request is never sent
+    client = _client(f"http://127.0.0.1:{port}", max_retries=2)
+    with pytest.raises(requests.ConnectionError):
+        client.post("/issue", json={"a": 1})
+    assert client.retries == 2
+
+
+def test_gives_up_after_max_retries():
+    with StubServer([(503, 0)] * 5) as stub:
+        response = _client(stub.url, max_retries=2).get("/item")
+    assert response.status_code == 503
+    assert len(stub.requests) == 3
+
+
+def test_parse_retry_after():
+    assert parse_retry_after("2") == 2.0
+    assert parse_retry_after(None) is None
+    assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0
+    assert parse_retry_after("soon") is None
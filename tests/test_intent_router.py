@@ -0,0 +1,32 @@
+import pytest
+
+from agent.intent_router import IntentRouter, load_rules
+
+
+@pytest.fixture
+def router():
+    return IntentRouter(load_rules())
+
+
+@pytest.mark.parametrize("text", [
+    "send to slack the summary of my latest email",
+    "create a jira ticket for login bug and assign it to Bob",
+    "schedule a meeting called standup tomorrow at 10am",
+    "read my emails and then post them to slack",
+])
+def test_requests_needing_more_than_the_rule_go_to_the_planner(router, text):
+    assert router.route(text) == (None, None)
+
+
+@pytest.mark.parametrize("text, tool, params", [
+    ("post to slack: deploy finished", "slack.post", {"channel": "agent_channal", "text": "deploy finished"}),
+    ("create a jira ticket for login page crash", "jira.create",
+     {"project": "KAN", "summary": "login page crash", "description": "login page crash"}),
+    ("schedule a meeting called design review", "calendar.create", {"title": "design review"}),
+    ("read my emails", "email.read", {"folder": "inbox"}),
+])
+def test_simple_requests_take_the_fast_path(router, text, tool, params):
+    plan, rule = router.route(text)
+
+    assert plan == [{"tool": tool, "params": params}]
+    assert rule is not None
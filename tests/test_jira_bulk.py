@@ -0,0 +1,77 @@
+import pytest
+
+from integrations.jira import jira_tools
+
+
+class FakeResponse:
+    def __init__(self, status_code, body=None, text=""):
+        self.status_code = status_code
+        self._body = body
+        self.text = text
+
+    def json(self):
+        if self._body is None:
+            raise ValueError("No JSON object could be decoded")
+        return self._body
+
+
+class FakeClient:
+    def __init__(self, response):
+        self.response = response
+
+    def post(self, path, json=None):
+        return self.response
+
+
+ISSUES = [
+    {"summary": "First", "description": "a", "project_key": "NOPE"},
+    {"summary": "Second", "description": "b", "project_key": "NOPE"},
+]
+
+
+@pytest.fixture
+def respond(monkeypatch):
+    monkeypatch.setattr(jira_tools, "_missing_settings", lambda: [])
+
+    def respond(response):
+        monkeypatch.setattr(jira_tools, "_get_client", lambda: FakeClient(response))
+    return respond
+
+
+def test_all_failed_bulk_keeps_each_element_error(respond):
+    respond(FakeResponse(400, {
+        "issues": [],
+        "errors": [
+            {"status": 400, "failedElementNumber": 0, "elementErrors": {"errors": {"project": "Project NOPE not found"}}},
+            {"status": 400, "failedElementNumber": 1, "elementErrors": {"errors": {"summary": "Summary too long"}}},
+        ],
+    }))
+
+    first, second = jira_tools.create_jira_tickets_bulk(ISSUES)
+
+    assert "Project NOPE not found" in first["error"]
+    assert "Summary too long" in second["error"]
+
+
+def test_partial_bulk_maps_created_issues_to_their_elements(respond):
+    respond(FakeResponse(201, {
+        "issues": [{"id": "2", "key": "KAN-2", "self": "https://jira/2"}],
+        "errors": [{"status": 400, "failedElementNumber": 0, "elementErrors": {"errors": {"project": "bad"}}}],
+    }))
+
+    first, second = jira_tools.create_jira_tickets_bulk(ISSUES)
+
+    assert "bad" in first["error"]
+    assert second["key"] == "KAN-2"
+
+
+@pytest.mark.parametrize("response", [
+    FakeResponse(500, text="Internal Server Error"),
+    FakeResponse(400, {"errorMessages": ["Bad request"]}, text='{"errorMessages": ["Bad request"]}'),
+])
+def test_bulk_failure_without_element_errors_fails_every_issue(respond, response):
+    respond(response)
+
+    results = jira_tools.create_jira_tickets_bulk(ISSUES)
+
+    assert [result["error"].startswith("Failed to create Jira tickets in bulk") for result in results] == [True, True]
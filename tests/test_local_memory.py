@@ -0,0 +1,59 @@
+import json
+import threading
+
+import numpy as np
+
+from core.local_memory import LocalVectorStore
+
+
+class FakeEmbeddings:
+    def embed_documents(self, texts):
+        return [self.embed_query(text) for text in texts]
+
+    def embed_query(self, text):
+        rng = np.random.default_rng(abs(hash(text)) % 2**32)
+        return rng.standard_normal(8).tolist()
+
+
+def test_load_discards_records_of_an_interrupted_append(tmp_path):
+    store = LocalVectorStore(FakeEmbeddings(), tmp_path)
+    store.add_texts(["first", "second"])
+    # An append that died after writing its texts but before saving meta.json
+    with (tmp_path / "texts.jsonl").open("a", encoding="utf-8") as f:
+        f.write(json.dumps({"id": "x", "text": "lost", "metadata": {}}) + "\n")
+        f.write('{"id": "y", "te')
+
+    reopened = LocalVectorStore(FakeEmbeddings(), tmp_path)
+    reopened.add_texts(["third"])
+
+    again = LocalVectorStore(FakeEmbeddings(), tmp_path)
+    assert [record["text"] for record in again._records] == ["first", "second", "third"]
+    assert again.similarity_search("third", k=1)[0].page_content == "third"
+
+
+def test_ivf_index_is_built_without_holding_the_lock(tmp_path, monkeypatch):
+    store = LocalVectorStore(FakeEmbeddings(), tmp_path, ivf_threshold=64, nprobe=64)
+    texts = [f"text {i}" for i in range(100)]
+    store.add_texts(texts)
+
+    build_index = store._build_index
+    lock_free = []
+
+    def build(matrix):
+        # Another thread can take the store lock while the index is being built
+        def take_lock():
+            acquired = store._lock.acquire(timeout=1)
+            if acquired:
+                store._lock.release()
+            lock_free.append(acquired)
+
+        thread = threading.Thread(target=take_lock)
+        thread.start()
+        thread.join()
+        return build_index(matrix)
+
+    monkeypatch.setattr(store, "_build_index", build)
+
+    assert store.similarity_search("text 42", k=1)[0].page_content == "text 42"
+    assert lock_free == [True]
+    assert store._indexed_count == 100
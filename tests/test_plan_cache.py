@@ -0,0 +1,46 @@
+import numpy as np
+
+from agent.plan_cache import PlanCache
+from core.cache import LRUCache
+
+
+VECTORS = {
+    "post the standup notes": [1.0, 0.0, 0.0],
+    "please post the standup notes": [0.98, 0.2, 0.0],
+    "read my email": [0.0, 1.0, 0.0],
+    "create a jira ticket": [0.0, 0.0, 1.0],
+}
+PLAN = [{"tool": "slack.post", "params": {"text": "notes"}}]
+
+
+def cache(max_entries=8):
+    return PlanCache(LRUCache(max_entries=max_entries), similarity_threshold=0.9, embed=lambda text: VECTORS[text])
+
+
+def test_similar_input_reuses_the_cached_plan():
+    plans = cache()
+    plans.set("post the standup notes", PLAN)
+    plans.set("read my email", [{"tool": "email.read", "params": {}}])
+
+    assert plans.get("please post the standup notes") == PLAN
+    assert plans.get("create a jira ticket") is None
+    assert plans.stats()["semantic_hits"] == 1
+
+
+def test_oldest_embedding_is_replaced_when_full():
+    plans = cache(max_entries=2)
+    plans.set("post the standup notes", PLAN)
+    plans.set("read my email", [])
+    plans.set("create a jira ticket", [])
+
+    assert plans.get_similar("please post the standup notes") is None
+    assert np.count_nonzero(plans._matrix.any(axis=1)) == 2
+
+
+def test_evicted_plan_forgets_its_embedding():
+    plans = cache()
+    plans.set("post the standup notes", PLAN)
+    plans.backend.clear()
+
+    assert plans.get_similar("please post the standup notes") is None
+    assert plans._rows == {}
@@ -0,0 +1,50 @@
+import asyncio
+
+import pytest
+
+from agent.nodes.executor import StreamedSteps, aexecutor_node, executor_node
+from agent.plan_parser import parse_plan_text
+from core.config import settings
+
+
+MALFORMED = [{"name": "slack.post"}, "slack.post", {"tool": "no.such.tool"}]
+
+
+def test_parser_drops_elements_that_are_not_steps():
+    plan, repaired = parse_plan_text('["slack.post", {"tool": "email.read", "params": {}}]')
+
+    assert plan == [{"tool": "email.read", "params": {}}]
+    assert not repaired
+
+
+def test_parser_rejects_plan_without_steps():
+    with pytest.raises(ValueError):
+        parse_plan_text('["slack.post", 3]')
+
+
+@pytest.mark.parametrize("parallel", [False, True])
+def test_malformed_steps_are_recorded_as_errors(monkeypatch, parallel):
+    monkeypatch.setattr(settings, "PARALLEL_EXECUTION", parallel)
+    for node in (executor_node, lambda state: asyncio.run(aexecutor_node(state))):
+        records = []
+        for index in range(len(MALFORMED)):
+            update = node({"plan": MALFORMED, "current_step": index, "history": []})
+            records.extend(update["history"])
+            if parallel:
+                break
+
+        assert [record.status for record in records] == ["error"] * 3
+        assert [record.tool for record in records] == ["invalid", "invalid", "no.such.tool"]
+        assert records[2].result == "Tool not found: no.such.tool"
+
+
+def test_streamed_malformed_steps_are_recorded_as_errors():
+    async def run():
+        steps = StreamedSteps()
+        for step in MALFORMED:
+            steps.submit(step)
+        return await steps.results()
+
+    records = asyncio.run(run())
+
+    assert [record.status for record in records] == ["error"] * 3
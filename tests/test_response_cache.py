@@ -0,0 +1,28 @@
+from agent.response_cache import ResponseCache
+from agent.steps import StepRecord
+from core.cache import LRUCache
+
+
+PLAN = [{"tool": "email.read", "params": {"folder": "inbox"}}]
+
+
+def history(result):
+    return [StepRecord.from_result("email.read", {"folder": "inbox"}, result)]
+
+
+def test_response_is_keyed_by_the_request():
+    cache = ResponseCache(LRUCache(max_entries=8))
+    cache.set("summarize my latest email", PLAN, history("Subject: hi"), "It says hi")
+
+    assert cache.get("summarize my latest email", PLAN, history("Subject: hi")) == "It says hi"
+    assert cache.get("translate my latest email to French", PLAN, history("Subject: hi")) is None
+
+
+def test_truncated_results_are_keyed_by_their_full_payload():
+    cache = ResponseCache(LRUCache(max_entries=8))
+    first, second = "x" * 5000 + "a", "x" * 5000 + "b"
+    assert history(first)[0].truncated
+    cache.set("read my email", PLAN, history(first), "first")
+
+    assert cache.get("read my email", PLAN, history(second)) is None
+    assert cache.get("read my email", PLAN, history(first)) == "first"
@@ -0,0 +1,136 @@
+"""SlackDispatcher against the local fake Slack API (no network, no token)."""
+
+import asyncio
+import time
+
+import pytest
+from slack_sdk import WebClient
+
+from integrations.slack import slack_tools
+from integrations.slack.dispatcher import SlackDispatcher
+from integrations.slack.fake_api import FakeSlackAPI
+
+
+@pytest.fixture
+def fake_slack():
+    with FakeSlackAPI() as fake:
+        yield fake
+
+
+def _dispatcher(fake, **kwargs):
+    client = WebClient(token="xoxb-test", base_url=fake.base_url)
+    kwargs.setdefault("min_interval", 0.0)
+    return SlackDispatcher(client, **kwargs)
+
+
+def test_posts_message(fake_slack):
+    dispatcher = _dispatcher(fake_slack)
+    try:
+        response = dispatcher.submit("agent_channal", "hello").result(timeout=5)
+    finally:
+        dispatcher.close()
+
+    assert response["ok"]
+    assert [m["text"] for m in fake_slack.messages] == ["hello"]
+    assert dispatcher.stats()["messages_sent"] == 1
+
+
+def test_coalesces_messages_within_window(fake_slack):
+    dispatcher = _dispatcher(fake_slack, coalesce_window=0.2)
+    try:
+        futures = [dispatcher.submit("agent_channal", text) for text in ("a", "b", "c")]
+        for future in futures:
+            future.result(timeout=5)
+    finally:
+        dispatcher.close()
+
+    assert [m["text"] for m in fake_slack.messages] == ["a\nb\nc"]
+    assert dispatcher.stats()["coalesced"] == 2
+
+
+def test_retries_after_rate_limit(fake_slack):
+    fake_slack.rate_limit_every = 1
+    fake_slack.retry_after = 0
+    dispatcher = _dispatcher(fake_slack)
+    try:
+        future = dispatcher.submit("agent_channal", "hello")
+        time.sleep(0.2)
+        fake_slack.rate_limit_every = 0
+        future.result(timeout=5)
+    finally:
+        dispatcher.close()
+
+    assert fake_slack.rate_limited >= 1
+    assert [m["text"] for m in fake_slack.messages] == ["hello"]
+
+
+def test_cancelled_message_is_not_posted_and_worker_survives(fake_slack):
+    dispatcher = _dispatcher(fake_slack, min_interval=0.5)
+    try:
+        first = dispatcher.submit("agent_channal", "first")
+        queued = dispatcher.submit("agent_channal", "dropped")
+        assert queued.cancel()
+        first.result(timeout=5)
+        last = dispatcher.submit("agent_channal", "last")
+        last.result(timeout=5)
+        assert dispatcher._thread.is_alive()
+    finally:
+        dispatcher.close()
+
+    assert [m["text"] for m in fake_slack.messages] == ["first", "last"]
+
+
+def test_async_timeout_drops_queued_message(fake_slack, monkeypatch):
+    dispatcher = _dispatcher(fake_slack, min_interval=1.0)
+    monkeypatch.setattr(slack_tools.settings, "SLACK_SEND_TIMEOUT", 0.2)
+
+    async def run():
+        await slack_tools._await_post(dispatcher.submit("agent_channal", "first"))
+        with pytest.raises(TimeoutError):
+            # Waits behind the 1 s channel interval, longer than the timeout
+            await slack_tools._await_post(dispatcher.submit("agent_channal", "late"))
+
+    try:
+        asyncio.run(run())
+        dispatcher.submit("agent_channal", "after").result(timeout=5)
+        assert dispatcher._thread.is_alive()
+    finally:
+        dispatcher.close()
+
+    assert [m["text"] for m in fake_slack.messages] == ["first", "after"]
+
+
+def test_sync_timeout_reports_outcome_of_message_being_posted(fake_slack, monkeypatch):
+    fake_slack.latency = 0.5
+    dispatcher = _dispatcher(fake_slack)
+    monkeypatch.setattr(slack_tools.settings, "SLACK_SEND_TIMEOUT", 0.1)
+    try:
+        # Taken by the worker before the timeout, so it is not dropped and the
+        # caller gets the real response
+        response = slack_tools._wait_for_post(dispatcher.submit("agent_channal", "slow"))
+    finally:
+        dispatcher.close()
+
+    assert response["ok"]
+    assert [m["text"] for m in fake_slack.messages] == ["slow"]
+
+
+def test_slow_channel_does_not_hold_up_other_channels(fake_slack):
+    fake_slack.channel_latency = {"slow": 1.0}
+    dispatcher = _dispatcher(fake_slack, post_workers=2)
+    try:
+        slow = [dispatcher.submit("slow", text) for text in ("s1", "s2")]
+        time.sleep(0.1)
+        started = time.monotonic()
+        for text in ("a", "b", "c"):
+            dispatcher.submit("fast", text).result(timeout=5)
+        fast_elapsed = time.monotonic() - started
+        assert not slow[0].done()
+        for future in slow:
+            future.result(timeout=5)
+    finally:
+        dispatcher.close()
+
+    assert fast_elapsed < 0.5
+    # Posts to one channel stay sequential and in order
+    assert [m["text"] for m in fake_slack.messages if m["channel"] == "slow"] == ["s1", "s2"]